@@ -0,0 +1,213 @@
+"""
+Per-symbol candle ring buffers for the prediction service
+Keeps the recent raw candles and the model window's feature rows so clients only push new candles
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+import threading
+import time
+
+import numpy as np
+
+from trading_model.utils.feature_kernel import RAW_COLUMNS
+
+# Candles kept before the model window so its rolling features are warmed up
+# (longest window is 20 bars on top of a 1-bar return)
+FEATURE_WARMUP = 25
+
+
+class SymbolBuffer:
+    """
+    Fixed-capacity ring buffer of raw candles for one symbol, plus the feature
+    rows of the latest model window
+
+    Every row is written twice (at pos and pos + capacity) so the most recent
+    `capacity` rows are always available as a contiguous view without copying.
+    """
+
+    def __init__(self, capacity: int, n_raw: int):
+        self.capacity = capacity
+        self.raw = np.zeros((2 * capacity, n_raw), dtype=np.float64)
+        self.features: Optional[np.ndarray] = None  # last lookback feature rows
+        self.timestamps = np.full(2 * capacity, np.nan, dtype=np.float64)
+        self.pos = 0      # next write position in [0, capacity)
+        self.count = 0    # number of valid rows
+        self.version = 0  # incremented on every change
+        self.last_access = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        features = self.features.nbytes if self.features is not None else 0
+        return self.raw.nbytes + self.timestamps.nbytes + features
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        ts = self.timestamps[self.pos - 1 + self.capacity]
+        return None if np.isnan(ts) else float(ts)
+
+    def tail(self, array: np.ndarray, n: int) -> np.ndarray:
+        """Contiguous view of the last n rows of one of the buffers"""
+        n = min(n, self.count)
+        end = self.pos + self.capacity
+        return array[end - n:end]
+
+    def push(self, raw_row: np.ndarray, timestamp: Optional[float]) -> None:
+        """Append one raw row"""
+        for offset in (self.pos, self.pos + self.capacity):
+            self.raw[offset] = raw_row
+            self.timestamps[offset] = np.nan if timestamp is None else timestamp
+        self.pos = (self.pos + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def pop(self) -> None:
+        """Drop the most recent row (used to replace a candle that was re-sent)"""
+        if self.count == 0:
+            return
+        self.pos = (self.pos - 1) % self.capacity
+        self.count -= 1
+
+
+class CandleBufferStore:
+    """
+    Ring buffers for all symbols with idle eviction and a memory cap
+
+    New candles are appended with `append`, which recomputes the features of
+    the model window over all stored candles (lookback + FEATURE_WARMUP at
+    most), so a prediction can run directly on the stored window. Features
+    depend on their whole input (forward fill, the zero-volume check), so this
+    gives exactly the sequence /predict builds from the same stored candles.
+    """
+
+    def __init__(
+        self,
+        lookback: int,
+        feature_fn: Callable[[np.ndarray], np.ndarray],
+        idle_seconds: float = 6 * 3600,
+        max_memory_mb: float = 256
+    ):
+        """
+        Args:
+            lookback: Window length used by the model
+            feature_fn: Maps raw candles (T, len(RAW_COLUMNS)) to feature rows (T, features)
+            idle_seconds: Symbols not touched for this long are evicted
+            max_memory_mb: Least recently used symbols are evicted above this size
+        """
+        self.lookback = lookback
+        self.feature_fn = feature_fn
+        self.capacity = lookback + FEATURE_WARMUP
+        self.idle_seconds = idle_seconds
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+
+        self._buffers: "OrderedDict[str, SymbolBuffer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _get_or_create(self, symbol: str) -> SymbolBuffer:
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                buffer = SymbolBuffer(self.capacity, len(RAW_COLUMNS))
+                self._buffers[symbol] = buffer
+            self._buffers.move_to_end(symbol)
+            buffer.last_access = time.monotonic()
+            return buffer
+
+    def get(self, symbol: str) -> Optional[SymbolBuffer]:
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is not None:
+                self._buffers.move_to_end(symbol)
+                buffer.last_access = time.monotonic()
+            return buffer
+
+    def remove(self, symbol: str) -> bool:
+        with self._lock:
+            return self._buffers.pop(symbol, None) is not None
+
+    def append(self, symbol: str, raw_rows: np.ndarray, timestamps: List[Optional[float]]) -> Dict:
+        """
+        Append closed candles for a symbol and recompute the window's features
+
+        A candle whose timestamp equals the last stored one replaces it (the
+        client re-sent an updated candle); older timestamps are ignored.
+
+        Args:
+            symbol: Trading symbol
+            raw_rows: Array of shape (n, len(RAW_COLUMNS)), oldest first
+            timestamps: One timestamp (or None) per row
+
+        Returns:
+            Dict with the number of accepted rows (including replacements) and the stored row count
+        """
+        buffer = self._get_or_create(symbol)
+
+        with buffer.lock:
+            appended = 0
+            for row, ts in zip(raw_rows, timestamps):
+                last_ts = buffer.last_timestamp
+                if ts is not None and last_ts is not None:
+                    if ts < last_ts:
+                        continue
+                    if ts == last_ts:
+                        buffer.pop()
+                buffer.push(row, ts)
+                appended += 1
+
+            if appended > 0:
+                history = buffer.tail(buffer.raw, buffer.count)
+                buffer.features = self.feature_fn(history)[-self.lookback:]
+                buffer.version += 1
+
+            stored = buffer.count
+
+        self.evict()
+
+        return {'appended': appended, 'stored': stored}
+
+    def window(self, symbol: str):
+        """
+        Latest lookback feature rows and the last two raw candles of a symbol
+
+        Returns:
+            (features, raw_tail, version) copies, or None if the symbol is unknown
+            or does not have lookback candles yet
+        """
+        buffer = self.get(symbol)
+        if buffer is None:
+            return None
+
+        with buffer.lock:
+            if buffer.count < self.lookback:
+                return None
+            features = buffer.features.copy()
+            raw_tail = buffer.tail(buffer.raw, 2).copy()
+            return features, raw_tail, buffer.version
+
+    def evict(self) -> None:
+        """Drop idle symbols, then least recently used ones while over the memory cap"""
+        now = time.monotonic()
+        with self._lock:
+            for symbol in [s for s, b in self._buffers.items() if now - b.last_access > self.idle_seconds]:
+                del self._buffers[symbol]
+                self.evictions += 1
+
+            total = sum(b.nbytes for b in self._buffers.values())
+            while self._buffers and total > self.max_bytes:
+                _, buffer = self._buffers.popitem(last=False)
+                total -= buffer.nbytes
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'symbols': len(self._buffers),
+                'capacity': self.capacity,
+                'memory_mb': sum(b.nbytes for b in self._buffers.values()) / (1024 * 1024),
+                'max_memory_mb': self.max_bytes / (1024 * 1024),
+                'idle_seconds': self.idle_seconds,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,130 @@
+"""
+Prediction result cache for the prediction service
+Caches the latest prediction per symbol and deduplicates identical concurrent requests
+"""
+
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Tuple
+import asyncio
+import hashlib
+import time
+
+import numpy as np
+
+
+def fingerprint(raw: np.ndarray) -> str:
+    """Hash of a candle window, used as cache key together with the symbol"""
+    return hashlib.blake2b(np.ascontiguousarray(raw).tobytes(), digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """
+    LRU/TTL cache keyed by symbol and candle-window fingerprint, with single-flight
+
+    Only the latest window of a symbol is kept: storing a result for a new
+    fingerprint (a new candle closed) replaces the previous entry. Concurrent
+    requests for the same (symbol, fingerprint) share one computation.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 1800):
+        """
+        Args:
+            max_entries: Maximum number of symbols kept (least recently used are dropped)
+            ttl_seconds: Entries older than this are recomputed
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, Tuple[str, object, float]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0  # requests that joined an in-flight computation
+
+    def get(self, symbol: str, key: str):
+        """Cached result for (symbol, key), or None (counted as hit or miss)"""
+        result = self._lookup(symbol, key)
+        if result is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return result
+
+    def _lookup(self, symbol: str, key: str):
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return None
+
+        cached_key, result, stored_at = entry
+        if cached_key != key or time.monotonic() - stored_at > self.ttl_seconds:
+            return None
+
+        self._entries.move_to_end(symbol)
+        return result
+
+    def put(self, symbol: str, key: str, result) -> None:
+        """Store the result for the latest window of a symbol"""
+        if self.max_entries <= 0:
+            return
+
+        self._entries[symbol] = (key, result, time.monotonic())
+        self._entries.move_to_end(symbol)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop the cached result of a symbol (e.g. a new candle was appended)"""
+        self._entries.pop(symbol, None)
+
+    async def get_or_compute(self, symbol: str, key: str, compute: Callable[[], Awaitable]):
+        """
+        Return the cached result or compute it once for all concurrent callers
+
+        Args:
+            symbol: Trading symbol
+            key: Fingerprint of the candle window
+            compute: Coroutine factory producing the result on a miss
+        """
+        result = self._lookup(symbol, key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        inflight = self._inflight.get((symbol, key))
+        if inflight is not None:
+            self.shared += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[(symbol, key)] = future
+        try:
+            result = await compute()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._inflight[(symbol, key)]
+
+        self.put(symbol, key, result)
+        future.set_result(result)
+        return result
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses + self.shared
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'shared': self.shared,
+            'hit_rate': (self.hits + self.shared) / lookups if lookups else 0.0,
+            'inflight': len(self._inflight)
+        }
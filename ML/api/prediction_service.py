@@ -4,7 +4,10 @@ Provides HTTP endpoint for C# application to get ML predictions
 """
 
 from contextlib import asynccontextmanager
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import asyncio
 import logging
 import sys
 from typing import List, Dict, Optional
@@ -13,6 +16,7 @@ import os
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field, ConfigDict
 import numpy as np
+import pandas as pd
 
 # Ensure compatibility with PyTorch's NumPy expectations
 if not hasattr(np, "_ARRAY_API"):
@@ -29,7 +33,10 @@ load_dotenv(Path(__file__).parent.parent / '.env')
 sys.path.append(str(Path(__file__).parent.parent))
 
 from trading_model.models.transformer_lstm import create_model
-from trading_model.utils.preprocessor import TradingDataPreprocessor, prepare_data_from_candles
+from trading_model.utils.preprocessor import TradingDataPreprocessor
+from trading_model.utils.feature_kernel import RAW_COLUMNS
+from api.candle_buffer import CandleBufferStore
+from api.prediction_cache import PredictionCache, fingerprint
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -44,6 +51,31 @@ device = None
 openai_client = None
 openai_model = None
 
+# Feature engine: 'numpy' (default, fast) or 'pandas' (reference implementation)
+FEATURE_ENGINE = os.getenv('FEATURE_ENGINE', 'numpy').lower()
+
+# Micro-batching of concurrent /predict calls (see MicroBatcher)
+PREDICT_MAX_BATCH_SIZE = int(os.getenv('PREDICT_MAX_BATCH_SIZE', '64'))
+PREDICT_MAX_WAIT_MS = float(os.getenv('PREDICT_MAX_WAIT_MS', '3'))
+batcher = None
+
+# Feature building and forward passes run on a bounded thread pool so the
+# event loop stays free for /health and other requests.
+INFERENCE_WORKERS = max(1, int(os.getenv('INFERENCE_WORKERS', '2')))
+# Torch intra-op threads per worker (default: split the cores between workers)
+TORCH_NUM_THREADS = int(os.getenv('TORCH_NUM_THREADS', '0')) or max(1, (os.cpu_count() or 1) // INFERENCE_WORKERS)
+executor = None
+
+# Per-symbol candle ring buffers fed by /candles/append
+CANDLE_BUFFER_IDLE_SECONDS = float(os.getenv('CANDLE_BUFFER_IDLE_SECONDS', str(6 * 3600)))
+CANDLE_BUFFER_MAX_MB = float(os.getenv('CANDLE_BUFFER_MAX_MB', '256'))
+candle_store = None
+
+# Latest prediction per symbol, keyed by a fingerprint of the candle window
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', '1024'))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv('PREDICTION_CACHE_TTL_SECONDS', '1800'))
+prediction_cache = None
+
 
 class CandleData(BaseModel):
     """Single candle data point"""
@@ -62,6 +94,7 @@ class CandleData(BaseModel):
     ema50: Optional[float] = Field(default=None, alias='ema')
     stoch_k: Optional[float] = Field(default=50, alias='stochSlowK')
     stoch_d: Optional[float] = Field(default=50, alias='stochSlowD')
+    timestamp: Optional[float] = None  # Candle open time, used to detect re-sent candles
 
 
 class PredictionRequest(BaseModel):
@@ -81,6 +114,31 @@ class PredictionResponse(BaseModel):
     attention_summary: Optional[Dict[str, float]] = None  # Which timeframes were most important
 
 
+class BatchPredictionRequest(BaseModel):
+    """Request format for multi-symbol predictions"""
+    requests: List[PredictionRequest] = Field(..., min_length=1, description="One entry per symbol")
+
+
+class BatchPredictionResponse(BaseModel):
+    """Response format for multi-symbol predictions"""
+    predictions: List[PredictionResponse]
+    errors: Dict[str, str] = Field(default_factory=dict)  # symbol -> reason it was skipped
+
+
+class CandleAppendRequest(BaseModel):
+    """Request format for pushing newly closed candles"""
+    symbol: str
+    candles: List[CandleData] = Field(..., min_length=1, description="New candles, oldest first")
+
+
+class CandleAppendResponse(BaseModel):
+    """Response format for candle ingestion"""
+    symbol: str
+    appended: int  # Candles accepted (including replaced ones)
+    stored: int  # Candles kept for this symbol
+    ready: bool  # Enough candles stored for /candles/{symbol}/predict
+
+
 class OpenAIIndicatorRequest(BaseModel):
     """Request format for OpenAI-based analysis"""
     symbol: str
@@ -184,12 +242,52 @@ async def load_model():
         raise
 
 
+def init_inference_thread() -> None:
+    """Executor initializer: pin torch intra-op threads for the worker thread"""
+    torch.set_num_threads(TORCH_NUM_THREADS)
+
+
+async def run_in_executor(func, *args):
+    """Run blocking inference work on the inference pool"""
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan handler to load model on startup without deprecated events."""
+    global batcher, executor, candle_store, prediction_cache
+
     await load_model()
+
+    prediction_cache = PredictionCache(
+        max_entries=PREDICTION_CACHE_SIZE,
+        ttl_seconds=PREDICTION_CACHE_TTL_SECONDS
+    )
+
+    candle_store = CandleBufferStore(
+        lookback=preprocessor.lookback,
+        feature_fn=features_from_raw,
+        idle_seconds=CANDLE_BUFFER_IDLE_SECONDS,
+        max_memory_mb=CANDLE_BUFFER_MAX_MB
+    )
+
+    torch.set_num_threads(TORCH_NUM_THREADS)
+    executor = ThreadPoolExecutor(
+        max_workers=INFERENCE_WORKERS,
+        thread_name_prefix='inference',
+        initializer=init_inference_thread
+    )
+    logger.info(f"Inference pool started (workers={INFERENCE_WORKERS}, torch_threads={TORCH_NUM_THREADS})")
+
+    batcher = MicroBatcher(max_batch_size=PREDICT_MAX_BATCH_SIZE, max_wait_ms=PREDICT_MAX_WAIT_MS)
+    batcher.start()
+    logger.info(f"Micro-batcher started (max_batch_size={PREDICT_MAX_BATCH_SIZE}, max_wait_ms={PREDICT_MAX_WAIT_MS})")
+
     yield
 
+    await batcher.stop()
+    executor.shutdown(wait=True)
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -226,6 +324,324 @@ async def health_check():
     }
 
 
+LABEL_MAP = {0: 'DOWN', 1: 'SIDEWAYS', 2: 'UP'}
+
+
+def candles_to_raw(candles: List[CandleData]) -> np.ndarray:
+    """Convert request candles to a (T, len(RAW_COLUMNS)) array, filling missing ema50 with close"""
+    raw = np.empty((len(candles), len(RAW_COLUMNS)), dtype=np.float64)
+    for i, candle in enumerate(candles):
+        values = candle.dict(by_alias=False)
+        if values['ema50'] is None:
+            values['ema50'] = values['close']
+        raw[i] = [values[col] for col in RAW_COLUMNS]
+    return raw
+
+
+def features_from_raw(raw: np.ndarray) -> np.ndarray:
+    """Compute the model feature rows for raw candles (T, len(RAW_COLUMNS))"""
+    if FEATURE_ENGINE == 'pandas':
+        df = preprocessor.create_features(pd.DataFrame(raw, columns=RAW_COLUMNS))
+        return df[preprocessor.feature_columns].values
+    return preprocessor.create_feature_matrix(raw)
+
+
+def build_sequence(raw: np.ndarray):
+    """
+    Build the scaled model input for one symbol
+
+    Args:
+        raw: Candles as returned by candles_to_raw
+
+    Returns:
+        sequence_scaled: (lookback, features) array ready for the model
+        trend_score: Trend score of the last candle
+    """
+    # Check if we have enough data
+    if len(raw) < preprocessor.lookback:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient data: need at least {preprocessor.lookback} candles, got {len(raw)}"
+        )
+
+    # Prepare features and take the last sequence
+    sequence = features_from_raw(raw)[-preprocessor.lookback:]
+
+    # Scale
+    sequence_scaled = preprocessor.scaler.transform(sequence)
+
+    trend_score = calculate_trend_score(
+        dict(zip(RAW_COLUMNS, raw[-1])),
+        dict(zip(RAW_COLUMNS, raw[-2]))
+    )
+
+    return sequence_scaled, trend_score
+
+
+def run_model(sequences: np.ndarray):
+    """
+    Run a single forward pass over a batch of scaled sequences
+
+    Args:
+        sequences: Array of shape (batch, lookback, features)
+
+    Returns:
+        probs: (batch, 3) class probabilities
+        expected_returns: (batch,) regression outputs
+        attention: (batch, lookback) attention of the last timestep, or None
+    """
+    X = torch.as_tensor(sequences, dtype=torch.float32).to(device)
+
+    with torch.no_grad():
+        if hasattr(model, 'attention'):  # TransformerLSTM
+            class_logits, reg_pred, attn_weights = model(X)
+
+            # Process attention weights
+            # attn_weights shape: (batch, seq_len, seq_len) from MultiheadAttention
+            # Get the attention pattern for the last timestep (what it attends to)
+            if len(attn_weights.shape) == 3:  # (batch, seq, seq)
+                attention = attn_weights[:, -1, :].cpu().numpy()  # (batch, seq_len)
+            elif len(attn_weights.shape) == 4:  # (batch, heads, seq, seq)
+                attention = attn_weights.mean(dim=1)[:, -1, :].cpu().numpy()  # (batch, seq_len)
+            else:
+                logger.warning(f"Unexpected attention weight shape: {attn_weights.shape}")
+                attention = None
+        else:  # LightweightLSTM
+            class_logits, reg_pred = model(X)
+            attention = None
+
+        probs = torch.softmax(class_logits, dim=1).cpu().numpy()
+        expected_returns = reg_pred[:, 0].cpu().numpy()
+
+    return probs, expected_returns, attention
+
+
+def calculate_trend_score(current, previous) -> Optional[int]:
+    """Calculate simple trend score from the last two candles (for reference)"""
+    try:
+        trend_score = 0
+        if current['close'] > current['ema50']:
+            trend_score += 1
+        if current['macd'] > current['macd_signal']:
+            trend_score += 1
+        if current['macd_hist'] > previous['macd_hist']:
+            trend_score += 1
+        if current['rsi'] > 50:
+            trend_score += 1
+        if current['rsi'] > previous['rsi']:
+            trend_score += 1
+
+        # Bearish signals
+        if current['close'] < current['ema50']:
+            trend_score -= 1
+        if current['macd'] < current['macd_signal']:
+            trend_score -= 1
+        if current['macd_hist'] < previous['macd_hist']:
+            trend_score -= 1
+        if current['rsi'] < 50:
+            trend_score -= 1
+        if current['rsi'] < previous['rsi']:
+            trend_score -= 1
+    except Exception as e:
+        logger.warning(f"Could not calculate trend score: {e}")
+        trend_score = None
+
+    return trend_score
+
+
+def build_batch_sequences(requests: List[PredictionRequest], raws: Dict[str, np.ndarray]):
+    """
+    Build scaled sequences for every symbol of a batch request
+
+    Args:
+        requests: Requests to build
+        raws: Raw candle arrays by symbol (see candles_to_raw)
+
+    Returns:
+        symbols, sequences, trend_scores for the valid symbols and
+        errors mapping skipped symbols to the reason
+    """
+    symbols, sequences, trend_scores = [], [], []
+    errors = {}
+
+    for item in requests:
+        try:
+            sequence_scaled, trend_score = build_sequence(raws[item.symbol])
+        except HTTPException as e:
+            errors[item.symbol] = str(e.detail)
+            continue
+        except Exception as e:
+            logger.warning(f"Feature preparation failed for {item.symbol}: {e}")
+            errors[item.symbol] = f"Prediction failed: {str(e)}"
+            continue
+
+        symbols.append(item.symbol)
+        sequences.append(sequence_scaled)
+        trend_scores.append(trend_score)
+
+    return symbols, sequences, trend_scores, errors
+
+
+def build_response(
+    symbol: str,
+    probs: np.ndarray,
+    expected_return: float,
+    attention: Optional[np.ndarray],
+    trend_score: Optional[int]
+) -> PredictionResponse:
+    """Map the model outputs of one sample to a PredictionResponse"""
+    pred_class = int(probs.argmax())
+
+    # Find top 5 most important timesteps
+    attention_summary = None
+    if attention is not None:
+        top_indices = np.argsort(attention)[-5:]
+        attention_summary = {
+            f"t-{preprocessor.lookback - idx}": float(attention[idx])
+            for idx in top_indices
+        }
+
+    return PredictionResponse(
+        symbol=symbol,
+        prediction=LABEL_MAP[pred_class],
+        confidence=float(probs[pred_class]),
+        probabilities={
+            "down": float(probs[0]),
+            "sideways": float(probs[1]),
+            "up": float(probs[2])
+        },
+        expected_return=float(expected_return),
+        trend_score=trend_score,
+        attention_summary=attention_summary
+    )
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-symbol predictions into one forward pass
+
+    Each /predict call submits its scaled sequence and awaits a future. A
+    background task takes the first queued sequence, keeps collecting until
+    max_batch_size sequences are queued or max_wait_ms has elapsed, runs the
+    model once on the stacked batch and resolves every future with its row.
+    """
+
+    def __init__(self, max_batch_size: int = 64, max_wait_ms: float = 3.0):
+        """
+        Args:
+            max_batch_size: Maximum number of sequences per forward pass
+            max_wait_ms: Maximum time to wait for more requests after the first one
+        """
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue = None
+        self._task = None
+
+        # Counters
+        self.total_requests = 0
+        self.total_batches = 0
+        self.batch_sizes = Counter()
+
+    def start(self) -> None:
+        """Start the batching loop on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the batching loop and fail any request still waiting"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction service shutting down"))
+
+    async def submit(self, sequence: np.ndarray):
+        """
+        Queue one scaled sequence and wait for its model outputs
+
+        Args:
+            sequence: Array of shape (lookback, features)
+
+        Returns:
+            probs: (3,) class probabilities
+            expected_return: Regression output
+            attention: (lookback,) attention of the last timestep, or None
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((sequence, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for the first request, then gather more until the batch is full or the window closes"""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """Batching loop"""
+        while True:
+            batch = await self._collect()
+            sequences = [sequence for sequence, _ in batch]
+            futures = [future for _, future in batch]
+
+            self.total_batches += 1
+            self.total_requests += len(batch)
+            self.batch_sizes[len(batch)] += 1
+
+            try:
+                probs, expected_returns, attention = await run_in_executor(run_model, np.stack(sequences))
+            except Exception as e:
+                logger.error(f"Batched inference failed for {len(batch)} requests: {e}", exc_info=True)
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for i, future in enumerate(futures):
+                # Skip callers that gave up (e.g. client disconnected)
+                if not future.done():
+                    future.set_result((
+                        probs[i],
+                        expected_returns[i],
+                        attention[i] if attention is not None else None
+                    ))
+
+    def stats(self) -> Dict:
+        """Achieved batch sizes and settings"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "total_requests": self.total_requests,
+            "total_batches": self.total_batches,
+            "mean_batch_size": self.total_requests / self.total_batches if self.total_batches else 0.0,
+            "max_batch_size_seen": max(self.batch_sizes) if self.batch_sizes else 0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size_histogram": {str(size): count for size, count in sorted(self.batch_sizes.items())}
+        }
+
+
 @app.post("/predict", response_model=PredictionResponse)
 async def predict(request: PredictionRequest):
     """
@@ -240,120 +656,27 @@ async def predict(request: PredictionRequest):
     if model is None or preprocessor is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
-    try:
-        # Convert candles to dict list
-        candles_dict = [candle.dict(by_alias=False) for candle in request.candles]
-
-        # Fill missing ema50 with close price if not provided
-        for candle in candles_dict:
-            if candle['ema50'] is None:
-                candle['ema50'] = candle['close']
-
-        # Prepare features
-        df = prepare_data_from_candles(candles_dict, preprocessor)
-
-        # Check if we have enough data
-        if len(df) < preprocessor.lookback:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient data: need at least {preprocessor.lookback} candles, got {len(df)}"
-            )
+    raw = candles_to_raw(request.candles)
 
-        # Get last sequence
-        feature_cols = preprocessor.feature_columns
-        sequence = df[feature_cols].iloc[-preprocessor.lookback:].values
-
-        # Scale
-        sequence_scaled = preprocessor.scaler.transform(sequence)
-
-        # Convert to tensor
-        X = torch.FloatTensor(sequence_scaled).unsqueeze(0).to(device)  # (1, lookback, features)
-
-        # Inference
-        with torch.no_grad():
-            if hasattr(model, 'attention'):  # TransformerLSTM
-                class_logits, reg_pred, attn_weights = model(X)
-
-                # Process attention weights
-                # attn_weights shape: (batch, seq_len, seq_len) from MultiheadAttention
-                # Get the attention pattern for the last timestep (what it attends to)
-                if len(attn_weights.shape) == 3:  # (batch, seq, seq)
-                    attn_mean = attn_weights[0, -1, :].cpu().numpy()  # (seq_len,)
-                elif len(attn_weights.shape) == 4:  # (batch, heads, seq, seq)
-                    attn_mean = attn_weights.mean(dim=1)[0, -1, :].cpu().numpy()  # (seq_len,)
-                else:
-                    logger.warning(f"Unexpected attention weight shape: {attn_weights.shape}")
-                    attn_mean = None
-
-                # Find top 5 most important timesteps
-                if attn_mean is not None:
-                    top_indices = np.argsort(attn_mean)[-5:]
-                    attention_summary = {
-                        f"t-{preprocessor.lookback - idx}": float(attn_mean[idx])
-                        for idx in top_indices
-                    }
-                else:
-                    attention_summary = None
-            else:  # LightweightLSTM
-                class_logits, reg_pred = model(X)
-                attention_summary = None
-
-        # Get predictions
-        probs = torch.softmax(class_logits, dim=1)[0].cpu().numpy()
-        pred_class = int(probs.argmax())
-        confidence = float(probs[pred_class])
-        expected_return = float(reg_pred[0, 0].cpu())
-
-        # Map to labels
-        label_map = {0: 'DOWN', 1: 'SIDEWAYS', 2: 'UP'}
-        prediction = label_map[pred_class]
-
-        # Calculate simple trend score (for reference)
-        try:
-            current = df.iloc[-1]
-            previous = df.iloc[-2]
-
-            trend_score = 0
-            if current['close'] > current['ema50']:
-                trend_score += 1
-            if current['macd'] > current['macd_signal']:
-                trend_score += 1
-            if current['macd_hist'] > previous['macd_hist']:
-                trend_score += 1
-            if current['rsi'] > 50:
-                trend_score += 1
-            if current['rsi'] > previous['rsi']:
-                trend_score += 1
-
-            # Bearish signals
-            if current['close'] < current['ema50']:
-                trend_score -= 1
-            if current['macd'] < current['macd_signal']:
-                trend_score -= 1
-            if current['macd_hist'] < previous['macd_hist']:
-                trend_score -= 1
-            if current['rsi'] < 50:
-                trend_score -= 1
-            if current['rsi'] < previous['rsi']:
-                trend_score -= 1
-        except Exception as e:
-            logger.warning(f"Could not calculate trend score: {e}")
-            trend_score = None
+    async def compute():
+        sequence_scaled, trend_score = await run_in_executor(build_sequence, raw)
+
+        # Concurrent requests are grouped into one forward pass by the batcher
+        probs, expected_return, attention = await batcher.submit(sequence_scaled)
 
-        return PredictionResponse(
+        return build_response(
             symbol=request.symbol,
-            prediction=prediction,
-            confidence=confidence,
-            probabilities={
-                "down": float(probs[0]),
-                "sideways": float(probs[1]),
-                "up": float(probs[2])
-            },
+            probs=probs,
             expected_return=expected_return,
-            trend_score=trend_score,
-            attention_summary=attention_summary
+            attention=attention,
+            trend_score=trend_score
         )
 
+    try:
+        # Identical windows are served from cache or share one computation
+        key = fingerprint(raw)
+        return await prediction_cache.get_or_compute(request.symbol, key, compute)
+
     except HTTPException:
         raise
     except Exception as e:
@@ -361,6 +684,159 @@ async def predict(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_batch(request: BatchPredictionRequest):
+    """
+    Make predictions for many symbols with a single forward pass
+
+    Features are built per symbol, then all windows are stacked into one
+    (N, lookback, features) tensor so the model runs once for the whole batch.
+    Symbols whose candles cannot be processed are reported in `errors`
+    instead of failing the whole request. Each symbol may appear once
+    (400 otherwise), since results and errors are keyed by symbol.
+    Predictions are returned in request order, whether cached or computed.
+
+    Args:
+        request: BatchPredictionRequest with one PredictionRequest per symbol
+
+    Returns:
+        BatchPredictionResponse with one PredictionResponse per valid symbol
+    """
+    if model is None or preprocessor is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    duplicates = [symbol for symbol, count in Counter(item.symbol for item in request.requests).items() if count > 1]
+    if duplicates:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Duplicate symbols in batch request: {', '.join(duplicates)}"
+        )
+
+    # Serve unchanged windows from cache, compute the rest in one pass
+    results, pending, raws, keys = {}, [], {}, {}
+    for item in request.requests:
+        raws[item.symbol] = candles_to_raw(item.candles)
+        keys[item.symbol] = fingerprint(raws[item.symbol])
+        hit = prediction_cache.get(item.symbol, keys[item.symbol])
+        if hit is not None:
+            results[item.symbol] = hit
+        else:
+            pending.append(item)
+
+    symbols, sequences, trend_scores, errors = await run_in_executor(build_batch_sequences, pending, raws)
+
+    def in_request_order() -> BatchPredictionResponse:
+        predictions = [results[item.symbol] for item in request.requests if item.symbol in results]
+        return BatchPredictionResponse(predictions=predictions, errors=errors)
+
+    if not sequences:
+        return in_request_order()
+
+    try:
+        probs, expected_returns, attention = await run_in_executor(run_model, np.stack(sequences))
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+    for i, symbol in enumerate(symbols):
+        response = build_response(
+            symbol=symbol,
+            probs=probs[i],
+            expected_return=expected_returns[i],
+            attention=attention[i] if attention is not None else None,
+            trend_score=trend_scores[i]
+        )
+        prediction_cache.put(symbol, keys[symbol], response)
+        results[symbol] = response
+
+    return in_request_order()
+
+
+@app.post("/candles/append", response_model=CandleAppendResponse)
+async def append_candles(request: CandleAppendRequest):
+    """
+    Push newly closed candles for a symbol
+
+    Send the full history once (at least lookback candles), then only the
+    candle that just closed. Each append recomputes the window's features over
+    the stored candles, so /candles/{symbol}/predict needs no payload and
+    matches /predict on the same candles. A candle with the same timestamp as
+    the last stored one replaces it.
+    """
+    if model is None or preprocessor is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    raw = candles_to_raw(request.candles)
+    timestamps = [candle.timestamp for candle in request.candles]
+
+    try:
+        result = await run_in_executor(candle_store.append, request.symbol, raw, timestamps)
+        prediction_cache.invalidate(request.symbol)
+    except Exception as e:
+        logger.error(f"Candle append error for {request.symbol}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Candle append failed: {str(e)}")
+
+    return CandleAppendResponse(
+        symbol=request.symbol,
+        appended=result['appended'],
+        stored=result['stored'],
+        ready=result['stored'] >= preprocessor.lookback
+    )
+
+
+@app.get("/candles/{symbol}/predict", response_model=PredictionResponse)
+async def predict_stored(symbol: str):
+    """
+    Make prediction for a symbol from its stored candle window
+
+    Returns:
+        PredictionResponse, same as /predict
+    """
+    if model is None or preprocessor is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+    window = candle_store.window(symbol)
+    if window is None:
+        if candle_store.get(symbol) is None:
+            raise HTTPException(status_code=404, detail=f"No candles stored for {symbol}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient data: need at least {preprocessor.lookback} stored candles for {symbol}"
+        )
+    features, raw_tail, version = window
+
+    async def compute():
+        sequence_scaled = await run_in_executor(preprocessor.scaler.transform, features)
+        probs, expected_return, attention = await batcher.submit(sequence_scaled)
+
+        return build_response(
+            symbol=symbol,
+            probs=probs,
+            expected_return=expected_return,
+            attention=attention,
+            trend_score=calculate_trend_score(
+                dict(zip(RAW_COLUMNS, raw_tail[-1])),
+                dict(zip(RAW_COLUMNS, raw_tail[-2]))
+            )
+        )
+
+    try:
+        # The buffer version changes with every appended candle
+        return await prediction_cache.get_or_compute(symbol, f"buffer:{version}", compute)
+    except Exception as e:
+        logger.error(f"Prediction error for stored {symbol}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+
+@app.delete("/candles/{symbol}")
+async def delete_candles(symbol: str):
+    """Drop the stored candles of a symbol"""
+    if candle_store is None or not candle_store.remove(symbol):
+        raise HTTPException(status_code=404, detail=f"No candles stored for {symbol}")
+    prediction_cache.invalidate(symbol)
+    return {"symbol": symbol, "deleted": True}
+
+
 @app.post("/predict/openai", response_model=OpenAIAnalysisResponse)
 async def predict_with_openai(request: OpenAIIndicatorRequest):
     """
@@ -423,8 +899,9 @@ Respond in JSON format:
 }
 """
 
-        # Call OpenAI API
-        response = openai_client.chat.completions.create(
+        # Call OpenAI API (blocking client, so keep it off the event loop)
+        response = await asyncio.to_thread(
+            openai_client.chat.completions.create,
             model=openai_model,
             messages=[
                 {"role": "system", "content": "You are an expert cryptocurrency trading analyst. Provide objective, data-driven analysis based on technical indicators. Always respond in valid JSON format."},
@@ -467,6 +944,16 @@ Respond in JSON format:
         raise HTTPException(status_code=500, detail=f"OpenAI prediction failed: {str(e)}")
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime counters of the prediction service"""
+    return {
+        "batcher": batcher.stats() if batcher is not None else None,
+        "candle_buffer": candle_store.stats() if candle_store is not None else None,
+        "prediction_cache": prediction_cache.stats() if prediction_cache is not None else None
+    }
+
+
 @app.get("/model/info")
 async def model_info():
     """Get model information"""
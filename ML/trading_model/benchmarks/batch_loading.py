@@ -0,0 +1,139 @@
+"""
+Benchmark: batch-level window loading vs per-sample DataLoader
+
+Times one epoch of batches from TradingDataset through
+  - DataLoader (per-sample __getitem__ + default_collate, previous path)
+  - WindowBatchLoader inline (one index_select per batch)
+  - WindowBatchLoader with background prefetch
+then a few CPU training steps of a small lightweight model with each
+loader, timing how much of each step is spent waiting for the next batch.
+Also checks that gathered batches match per-sample windows and that the
+prefetch thread exits when iteration stops early.
+
+Usage (from ML/trading_model):
+    python benchmarks/batch_loading.py
+    python benchmarks/batch_loading.py --rows 2000000 --batch-size 512 --steps 60
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.transformer_lstm import create_model
+from train import TradingDataset, WindowBatchLoader
+
+
+def epoch_seconds(loader, max_batches: int = None) -> float:
+    start = time.perf_counter()
+    for i, (X, y_class, y_reg) in enumerate(loader):
+        if max_batches is not None and i + 1 >= max_batches:
+            break
+    return time.perf_counter() - start
+
+
+def producer_exits_early(dataset: TradingDataset, batch_size: int) -> bool:
+    """
+    True if the prefetch thread exits when the consumer stops reading partway
+
+    With prefetch=1 and three batches, two are read; the producer then queues
+    the last one and waits to queue the end sentinel when iteration is closed
+    (as a break or an exception in the training step does).
+    """
+    small = TradingDataset(dataset.features.numpy(), dataset.window_ends[:3 * batch_size].numpy(),
+                           dataset.y_class[:3 * batch_size].numpy(), dataset.y_reg[:3 * batch_size, 0].numpy(),
+                           dataset.lookback)
+    batches = iter(WindowBatchLoader(small, batch_size, prefetch=1))
+    next(batches)
+    next(batches)
+    time.sleep(0.5)
+
+    closer = threading.Thread(target=batches.close, daemon=True)
+    closer.start()
+    closer.join(timeout=5)
+    return not closer.is_alive() and not any(t.name == 'window-batch-prefetch' for t in threading.enumerate())
+
+
+def train_seconds(model: nn.Module, loader, steps: int) -> Tuple[float, float]:
+    """Seconds for steps training steps, and the part of it spent waiting for batches"""
+    optimizer = torch.optim.AdamW(model.parameters(), lr=1e-4)
+    criterion = nn.CrossEntropyLoss()
+    batches = iter(loader)
+    waiting = 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        fetch = time.perf_counter()
+        X, y_class, y_reg = next(batches)
+        waiting += time.perf_counter() - fetch
+
+        class_logits, reg_pred = model(X)
+        loss = criterion(class_logits, y_class) + 0.15 * nn.functional.mse_loss(reg_pred, y_reg)
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+    del batches
+    return time.perf_counter() - start, waiting
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch-level window loading')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Feature rows (default: 1,000,000)')
+    parser.add_argument('--features', type=int, default=31, help='Features per row (default: 31)')
+    parser.add_argument('--lookback', type=int, default=50, help='Window length (default: 50)')
+    parser.add_argument('--batch-size', type=int, default=256, help='Batch size (default: 256)')
+    parser.add_argument('--batches', type=int, default=400, help='Batches timed per loader (default: 400)')
+    parser.add_argument('--steps', type=int, default=30, help='Training steps per loader (default: 30)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(args.rows, args.features)).astype(np.float32)
+    window_ends = np.arange(args.lookback, args.rows, dtype=np.int64)
+    y_class = rng.integers(0, 3, len(window_ends))
+    y_reg = rng.normal(0, 0.01, len(window_ends)).astype(np.float32)
+    dataset = TradingDataset(features, window_ends, y_class, y_reg, args.lookback)
+
+    loaders = {
+        'DataLoader (per sample)': DataLoader(dataset, batch_size=args.batch_size, shuffle=True),
+        'WindowBatchLoader inline': WindowBatchLoader(dataset, args.batch_size, shuffle=True, prefetch=0),
+        'WindowBatchLoader prefetch=2': WindowBatchLoader(dataset, args.batch_size, shuffle=True, prefetch=2)
+    }
+
+    # Same batches from every path
+    indices = torch.arange(args.batch_size) * 7 % len(dataset)
+    reference = torch.stack([dataset[int(i)][0] for i in indices])
+    if not torch.equal(dataset.get_batch(indices)[0], reference):
+        print("get_batch does not match per-sample windows")
+        sys.exit(1)
+    if not producer_exits_early(dataset, args.batch_size):
+        print("Prefetch thread did not exit after iteration stopped early")
+        sys.exit(1)
+
+    print(f"BATCH LOADING BENCHMARK ({args.rows:,} rows x {args.features} features, lookback {args.lookback}, "
+          f"batch {args.batch_size}, {torch.get_num_threads()} torch threads)")
+    print(f"\n  {args.batches} batches:")
+    baseline = None
+    for name, loader in loaders.items():
+        seconds = epoch_seconds(loader, args.batches)
+        baseline = baseline or seconds
+        print(f"    {name:<30}{seconds:8.3f} s  {seconds / args.batches * 1000:7.2f} ms/batch"
+              f"  ({baseline / seconds:5.1f}x)")
+
+    torch.manual_seed(0)
+    model = create_model('lightweight_lstm', input_size=args.features, hidden_size=64, num_layers=1, dropout=0.2)
+    model.train()
+    print(f"\n  {args.steps} CPU training steps (lightweight_lstm):")
+    for name, loader in loaders.items():
+        seconds, waiting = train_seconds(model, loader, args.steps)
+        print(f"    {name:<30}{seconds / args.steps * 1000:8.1f} ms/step  waiting for data {waiting / seconds:6.1%}")
+
+if __name__ == '__main__':
+    main()
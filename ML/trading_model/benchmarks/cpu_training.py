@@ -0,0 +1,92 @@
+"""
+Benchmark: CPU training throughput of the trainer's performance options
+
+Runs TradingModelTrainer.train_epoch on synthetic windows for each model with
+  - fp32 eager, single-tensor AdamW (previous CPU setup)
+  - + fused AdamW
+  - + bfloat16 autocast
+  - + torch.compile
+and reports train samples/sec (after warm-up steps, which include compilation).
+
+Usage (from ML/trading_model):
+    python benchmarks/cpu_training.py
+    python benchmarks/cpu_training.py --models lightweight_lstm --batch-size 512 --steps 20 --threads 8
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import torch
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.transformer_lstm import create_model
+from train import TradingDataset, TradingModelTrainer, WindowBatchLoader
+from utils.cpu_perf import configure_cpu_threads, cpu_supports_bf16
+
+# Architectures as configured in train.py
+MODEL_KWARGS = {
+    'transformer_lstm': dict(hidden_size=256, num_lstm_layers=2, num_transformer_layers=3, num_heads=8, dropout=0.2),
+    'lightweight_lstm': dict(hidden_size=128, num_layers=2, dropout=0.2)
+}
+
+CONFIGS = [
+    ('fp32 eager, AdamW', dict(fused_optimizer=False)),
+    ('+ fused AdamW', dict()),
+    ('+ bf16 autocast', dict(cpu_bf16=True)),
+    ('+ torch.compile', dict(cpu_bf16=True, compile_model=True))
+]
+
+
+def make_loader(rows: int, features: int, lookback: int, batch_size: int) -> WindowBatchLoader:
+    rng = np.random.default_rng(0)
+    window_ends = np.arange(lookback, rows, dtype=np.int64)
+    dataset = TradingDataset(rng.normal(size=(rows, features)).astype(np.float32), window_ends,
+                             rng.integers(0, 3, len(window_ends)), rng.normal(0, 0.01, len(window_ends)), lookback)
+    return WindowBatchLoader(dataset, batch_size, shuffle=True, prefetch=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CPU training performance options')
+    parser.add_argument('--models', nargs='+', default=list(MODEL_KWARGS), choices=list(MODEL_KWARGS),
+                        help='Models to benchmark (default: both)')
+    parser.add_argument('--features', type=int, default=31, help='Features per row (default: 31)')
+    parser.add_argument('--lookback', type=int, default=50, help='Window length (default: 50)')
+    parser.add_argument('--batch-size', type=int, default=256, help='Batch size (default: 256)')
+    parser.add_argument('--steps', type=int, default=10, help='Timed steps per configuration (default: 10)')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed steps first (default: 3)')
+    parser.add_argument('--threads', type=int, default=None, help='Intra-op threads (default: all cores)')
+    args = parser.parse_args()
+
+    threads = configure_cpu_threads(args.threads)
+    print(f"CPU TRAINING BENCHMARK (batch {args.batch_size}, lookback {args.lookback}, {args.features} features, "
+          f"{threads['intra_op_threads']} threads, native bf16: {cpu_supports_bf16()})")
+
+    warmup_loader = make_loader(args.lookback + args.warmup * args.batch_size, args.features,
+                                args.lookback, args.batch_size)
+    timed_loader = make_loader(args.lookback + args.steps * args.batch_size, args.features,
+                               args.lookback, args.batch_size)
+
+    for model_type in args.models:
+        print(f"\n  {model_type}:")
+        baseline = None
+        for name, options in CONFIGS:
+            torch.manual_seed(0)
+            model = create_model(model_type, input_size=args.features, **MODEL_KWARGS[model_type])
+            trainer = TradingModelTrainer(model, device='cpu', **options)
+            trainer.criterion_class = torch.nn.CrossEntropyLoss()
+
+            trainer.train_epoch(warmup_loader)
+            loss = trainer.train_epoch(timed_loader)
+            stats = trainer.train_stats
+            baseline = baseline or stats['samples_per_sec']
+            stages = stats['stage_share']
+            print(f"    {name:<20}{stats['samples_per_sec']:9,.0f} samples/s  ({stats['samples_per_sec'] / baseline:4.2f}x)"
+                  f"  fwd {stages['forward']:.0%} bwd {stages['backward']:.0%} opt {stages['optimizer']:.0%}"
+                  f"  loss {loss:.4f}")
+
+
+if __name__ == '__main__':
+    main()
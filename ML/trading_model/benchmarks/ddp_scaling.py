@@ -0,0 +1,96 @@
+"""
+Benchmark: data-parallel CPU training throughput vs process count
+
+Spawns 1, 2, 4, ... gloo processes on this host (like torchrun would), splits
+the cores between them and trains the lightweight model on synthetic windows
+with TradingModelTrainer(distributed=True). Reports global samples/sec and
+the scaling efficiency relative to one process.
+
+Usage (from ML/trading_model):
+    python benchmarks/ddp_scaling.py
+    python benchmarks/ddp_scaling.py --processes 1 2 4 8 --steps 40 --model transformer_lstm
+"""
+
+import argparse
+import os
+import socket
+import sys
+from pathlib import Path
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.transformer_lstm import create_model
+from train import TradingDataset, TradingModelTrainer, create_batch_loader
+from utils.cpu_perf import configure_cpu_threads
+from utils.distributed import DistributedWindowSampler, cleanup_distributed, init_distributed
+
+MODEL_KWARGS = {
+    'transformer_lstm': dict(hidden_size=256, num_lstm_layers=2, num_transformer_layers=3, num_heads=8, dropout=0.2),
+    'lightweight_lstm': dict(hidden_size=128, num_layers=2, dropout=0.2)
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def worker(rank: int, world_size: int, port: int, args, results) -> None:
+    os.environ.update(RANK=str(rank), WORLD_SIZE=str(world_size), LOCAL_WORLD_SIZE=str(world_size),
+                      MASTER_ADDR='127.0.0.1', MASTER_PORT=str(port))
+    init_distributed('gloo')
+    configure_cpu_threads(max(1, args.cores // world_size))
+
+    # Every rank sees the same windows; the sampler gives each a 1/world_size share
+    rng = np.random.default_rng(0)
+    windows = args.steps * args.batch_size * world_size
+    rows = windows + args.lookback
+    window_ends = np.arange(args.lookback, rows, dtype=np.int64)
+    dataset = TradingDataset(rng.normal(size=(rows, args.features)).astype(np.float32), window_ends,
+                             rng.integers(0, 3, windows), rng.normal(0, 0.01, windows), args.lookback)
+    loader = create_batch_loader(dataset, args.batch_size, sampler=DistributedWindowSampler(windows))
+
+    torch.manual_seed(0)
+    model = create_model(args.model, input_size=args.features, **MODEL_KWARGS[args.model])
+    trainer = TradingModelTrainer(model, device='cpu', distributed=True)
+    trainer.criterion_class = torch.nn.CrossEntropyLoss()
+
+    warmup = create_batch_loader(dataset, args.batch_size,
+                                 sampler=DistributedWindowSampler(args.batch_size * world_size * 2))
+    trainer.train_epoch(warmup)
+    trainer.train_epoch(loader)
+    if rank == 0:
+        results[world_size] = trainer.train_stats['samples_per_sec']
+    cleanup_distributed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DDP (gloo) scaling on CPU')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4],
+                        help='Process counts to run (default: 1 2 4)')
+    parser.add_argument('--model', default='lightweight_lstm', choices=list(MODEL_KWARGS))
+    parser.add_argument('--cores', type=int, default=os.cpu_count() or 1, help='Cores to split (default: all)')
+    parser.add_argument('--features', type=int, default=31, help='Features per row (default: 31)')
+    parser.add_argument('--lookback', type=int, default=50, help='Window length (default: 50)')
+    parser.add_argument('--batch-size', type=int, default=256, help='Batch size per process (default: 256)')
+    parser.add_argument('--steps', type=int, default=20, help='Timed steps per process (default: 20)')
+    args = parser.parse_args()
+
+    print(f"DDP SCALING BENCHMARK ({args.model}, batch {args.batch_size} per process, {args.cores} cores)")
+    results = mp.Manager().dict()
+    baseline = None
+    for world_size in args.processes:
+        mp.spawn(worker, args=(world_size, free_port(), args, results), nprocs=world_size, join=True)
+        samples_per_sec = results[world_size]
+        baseline = baseline or samples_per_sec / world_size
+        print(f"  {world_size:>3} processes: {samples_per_sec:9,.0f} samples/s  "
+              f"({samples_per_sec / baseline:4.2f}x, efficiency {samples_per_sec / baseline / world_size:5.1%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Parity check and benchmark: NumPy feature kernel vs pandas create_features,
+and the service's candle buffer (/candles/{symbol}/predict) vs /predict
+
+Usage (from ML/trading_model):
+    python benchmarks/feature_parity.py
+    python benchmarks/feature_parity.py --data ../data/candles --interval 30m
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.candle_buffer import CandleBufferStore
+from utils.candle_store import load_candles
+from utils.feature_kernel import RAW_COLUMNS
+from utils.preprocessor import TradingDataPreprocessor
+
+
+def synthetic_candles(n: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk candles with indicator columns"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + rng.uniform(0, 0.005, n)),
+        'low': np.minimum(open_, close) * (1 - rng.uniform(0, 0.005, n)),
+        'close': close,
+        'volume': rng.uniform(10, 100, n),
+        'rsi': rng.uniform(20, 80, n),
+        'macd': rng.normal(0, 1, n),
+        'macd_signal': rng.normal(0, 1, n),
+        'macd_hist': rng.normal(0, 1, n),
+        'ema50': close * 0.99,
+        'stoch_k': rng.uniform(0, 100, n),
+        'stoch_d': rng.uniform(0, 100, n)
+    })
+
+
+def edge_cases() -> dict:
+    """Inputs exercising the zero/inf/NaN handling"""
+    cases = {}
+
+    df = synthetic_candles(60, seed=1)
+    df['volume'] = 0
+    cases['zero volume'] = df
+
+    df = synthetic_candles(60, seed=2)
+    df.loc[10:12, 'volume'] = 0
+    df.loc[30, ['open', 'ema50']] = 0
+    cases['zero denominators'] = df
+
+    df = synthetic_candles(60, seed=3)
+    df.loc[25, 'close'] = df.loc[24, 'close']
+    df.loc[40:44, 'close'] = df.loc[40, 'close']
+    cases['flat prices'] = df
+
+    df = synthetic_candles(60, seed=4)
+    df.loc[5, 'rsi'] = np.nan
+    df.loc[15, 'close'] = np.nan
+    cases['missing values'] = df
+
+    df = synthetic_candles(120, seed=6)
+    df.loc[70:, 'volume'] = 0
+    cases['zero volume tail'] = df
+
+    df = synthetic_candles(120, seed=7)
+    df.loc[60:, 'rsi'] = np.nan
+    df.loc[90, 'close'] = np.nan
+    cases['missing tail'] = df
+
+    cases['short window'] = synthetic_candles(8, seed=5)
+    return cases
+
+
+def check_parity(preprocessor: TradingDataPreprocessor, df: pd.DataFrame) -> float:
+    """Max absolute difference between both engines (relative for large values)"""
+    feature_cols = preprocessor.get_feature_columns()
+    expected = preprocessor.create_features(df)[feature_cols].values
+    actual = preprocessor.create_feature_matrix(df[RAW_COLUMNS].values)
+    scale = np.maximum(1.0, np.abs(expected))
+    return float(np.max(np.abs(actual - expected) / scale))
+
+
+def check_buffer_parity(preprocessor: TradingDataPreprocessor, df: pd.DataFrame, lookback: int) -> bool:
+    """
+    True if the candle buffer's window equals the /predict sequence after every append
+
+    The first lookback candles are pushed at once, then one candle at a time,
+    each also re-sent once (replacing the stored candle). /predict is given the
+    same candles the buffer holds.
+    """
+    raw = df[RAW_COLUMNS].values.astype(np.float64)
+    store = CandleBufferStore(lookback, preprocessor.create_feature_matrix)
+    store.append('TEST', raw[:lookback], list(range(lookback)))
+    for i in range(lookback, len(raw)):
+        store.append('TEST', raw[i:i + 1] * 1.001, [i])
+        store.append('TEST', raw[i:i + 1], [i])
+        buffer = store.get('TEST')
+        expected = preprocessor.create_feature_matrix(buffer.tail(buffer.raw, buffer.count))[-lookback:]
+        if not np.array_equal(store.window('TEST')[0], expected):
+            return False
+    return True
+
+
+def benchmark(func, repeats: int) -> float:
+    """Mean runtime in milliseconds"""
+    func()  # warmup
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare NumPy and pandas feature engines')
+    parser.add_argument('--data', type=str, help='Candle store directory or .csv path to also check parity on')
+    parser.add_argument('--interval', type=str, default=None,
+                        help='Candle interval (required if the store holds several)')
+    parser.add_argument('--window', type=int, default=50, help='Rows per inference window (default: 50)')
+    parser.add_argument('--repeats', type=int, default=200, help='Benchmark repetitions (default: 200)')
+    parser.add_argument('--tolerance', type=float, default=1e-5, help='Max allowed difference (float32 output)')
+    args = parser.parse_args()
+
+    preprocessor = TradingDataPreprocessor()
+    cases = {'random walk': synthetic_candles(500)}
+    cases.update(edge_cases())
+
+    if args.data:
+        data = load_candles(args.data, interval=args.interval)
+        for symbol, symbol_df in list(data.groupby('symbol'))[:5]:
+            cases[f'data {symbol}'] = symbol_df.sort_values('timestamp').reset_index(drop=True)
+
+    print("PARITY (NumPy kernel vs pandas create_features)")
+    failed = False
+    for name, df in cases.items():
+        diff = check_parity(preprocessor, df)
+        status = 'OK' if diff <= args.tolerance else 'FAIL'
+        failed |= status == 'FAIL'
+        print(f"  {name:20s}: max diff {diff:.2e} {status}")
+
+    print(f"\nPARITY (candle buffer vs /predict on the stored candles, lookback {args.window})")
+    for name, df in cases.items():
+        if len(df) <= args.window:
+            continue
+        status = 'OK' if check_buffer_parity(preprocessor, df, args.window) else 'FAIL'
+        failed |= status == 'FAIL'
+        print(f"  {name:20s}: {status}")
+
+    window = synthetic_candles(args.window)
+    raw = window[RAW_COLUMNS].values.astype(np.float32)
+    pandas_ms = benchmark(lambda: preprocessor.create_features(window), args.repeats)
+    numpy_ms = benchmark(lambda: preprocessor.create_feature_matrix(raw), args.repeats)
+
+    print(f"\nBENCHMARK ({args.window}-row window, {args.repeats} runs)")
+    print(f"  pandas: {pandas_ms:.3f} ms")
+    print(f"  numpy:  {numpy_ms:.3f} ms ({pandas_ms / numpy_ms:.1f}x faster)")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Parity check and benchmark: native indicator engine vs per-symbol pandas_ta / TA-Lib
+
+Parity is checked against a scalar port of the TA-Lib loops (always available)
+and against the TA-Lib Python bindings when installed. pandas_ta seeds its
+averages differently, so it is only compared after a warm-up.
+
+Usage (from ML/trading_model):
+    python benchmarks/indicators.py
+    python benchmarks/indicators.py --symbols 80 --rows 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.indicators import INDICATOR_COLUMNS, compute_indicators
+
+PANDAS_TA_WARMUP = 500
+
+
+def synthetic_candles(n_symbols: int, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk candles for several symbols with different lengths, in store order"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(n_symbols):
+        n = n_rows - i * (n_rows // (2 * n_symbols))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        open_ = np.r_[close[0], close[:-1]]
+        frames.append(pd.DataFrame({
+            'symbol': f'SYM{i:03d}USDT',
+            'timestamp': 1.7e9 + np.arange(n) * 1800.0,
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + rng.uniform(0, 0.005, n)),
+            'low': np.minimum(open_, close) * (1 - rng.uniform(0, 0.005, n)),
+            'close': close
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _ema_loop(x, period, first):
+    out = np.full(len(x), np.nan)
+    if first >= len(x):
+        return out
+    k = 2.0 / (period + 1)
+    value = sum(x[first - period + 1:first + 1]) / period
+    out[first] = value
+    for i in range(first + 1, len(x)):
+        value = (x[i] - value) * k + value
+        out[i] = value
+    return out
+
+
+def _sma_loop(x, period):
+    out = np.full(len(x), np.nan)
+    for i in range(period - 1, len(x)):
+        out[i] = sum(x[i - period + 1:i + 1]) / period
+    return out
+
+
+def talib_loops(high, low, close) -> dict:
+    """Scalar port of TA_RSI, TA_MACD, TA_EMA and TA_STOCH for one symbol"""
+    n = len(close)
+    rsi = np.full(n, np.nan)
+    if n > 14:
+        gain = loss = 0.0
+        for i in range(1, 15):
+            change = close[i] - close[i - 1]
+            gain, loss = gain + max(change, 0), loss + max(-change, 0)
+        gain, loss = gain / 14, loss / 14
+        for i in range(14, n):
+            if i > 14:
+                change = close[i] - close[i - 1]
+                gain = (gain * 13 + max(change, 0)) / 14
+                loss = (loss * 13 + max(-change, 0)) / 14
+            rsi[i] = 0.0 if abs(gain + loss) < 1e-14 else 100 * gain / (gain + loss)
+
+    line = _ema_loop(close, 12, 25) - _ema_loop(close, 26, 25)
+    signal = np.full(n, np.nan)
+    signal[25:] = _ema_loop(line[25:], 9, 8)
+    line[:33] = np.nan
+
+    fast_k = np.full(n, np.nan)
+    for i in range(4, n):
+        lowest, highest = min(low[i - 4:i + 1]), max(high[i - 4:i + 1])
+        span = (highest - lowest) / 100
+        fast_k[i] = 0.0 if abs(span) < 1e-14 else (close[i] - lowest) / span
+    stoch_k = _sma_loop(fast_k, 3)
+    stoch_d = _sma_loop(stoch_k, 3)
+    stoch_k[:8] = np.nan
+
+    return {'rsi': rsi, 'macd': line, 'macd_signal': signal, 'macd_hist': line - signal,
+            'ema50': _ema_loop(close, 50, 49), 'stoch_k': stoch_k, 'stoch_d': stoch_d}
+
+
+def talib_per_symbol(df: pd.DataFrame, talib) -> pd.DataFrame:
+    """TA-Lib bindings, one call per symbol and indicator"""
+    out = pd.DataFrame(index=df.index, columns=INDICATOR_COLUMNS, dtype=np.float64)
+    for _, symbol_df in df.sort_values('timestamp').groupby('symbol'):
+        high, low, close = (symbol_df[c].to_numpy(np.float64) for c in ('high', 'low', 'close'))
+        macd, signal, hist = talib.MACD(close, 12, 26, 9)
+        stoch_k, stoch_d = talib.STOCH(high, low, close, 5, 3, 0, 3, 0)
+        out.loc[symbol_df.index] = np.column_stack([
+            talib.RSI(close, 14), macd, signal, hist, talib.EMA(close, 50), stoch_k, stoch_d])
+    return out
+
+
+def pandas_ta_per_symbol(df: pd.DataFrame, ta) -> pd.DataFrame:
+    """Previous collector implementation (filter per symbol, pandas_ta per indicator)"""
+    result_dfs = []
+    for symbol in df['symbol'].unique():
+        symbol_df = df[df['symbol'] == symbol].sort_values('timestamp').copy()
+        symbol_df['rsi'] = ta.rsi(symbol_df['close'], length=14)
+        macd = ta.macd(symbol_df['close'], fast=12, slow=26, signal=9)
+        symbol_df['macd'] = macd['MACD_12_26_9']
+        symbol_df['macd_signal'] = macd['MACDs_12_26_9']
+        symbol_df['macd_hist'] = macd['MACDh_12_26_9']
+        symbol_df['ema50'] = ta.ema(symbol_df['close'], length=50)
+        stoch = ta.stoch(symbol_df['high'], symbol_df['low'], symbol_df['close'], k=5, d=3)
+        symbol_df['stoch_k'] = stoch['STOCHk_5_3_3']
+        symbol_df['stoch_d'] = stoch['STOCHd_5_3_3']
+        result_dfs.append(symbol_df)
+    return pd.concat(result_dfs).loc[df.index, INDICATOR_COLUMNS]
+
+
+def compare(actual: pd.DataFrame, expected: pd.DataFrame, rows=None):
+    """Max relative difference per column and whether warm-up (NaN) rows match"""
+    report = {}
+    for column in INDICATOR_COLUMNS:
+        a, e = actual[column].to_numpy(np.float64), expected[column].to_numpy(np.float64)
+        if rows is not None:
+            a, e = a[rows], e[rows]
+        scale = max(np.nanmax(np.abs(e)), 1e-12) if np.isfinite(e).any() else 1.0
+        diff = np.nanmax(np.abs(a - e)) / scale if np.isfinite(a - e).any() else 0.0
+        report[column] = (diff, np.array_equal(np.isnan(a), np.isnan(e)))
+    return report
+
+
+def print_report(name: str, report: dict, tolerance: float = None) -> bool:
+    ok = True
+    print(f"\n  vs {name}:")
+    for column, (diff, same_nan) in report.items():
+        status = ''
+        if tolerance is not None:
+            column_ok = diff <= tolerance and same_nan
+            ok &= column_ok
+            status = 'OK' if column_ok else 'MISMATCH'
+        print(f"    {column:12s} max rel diff {diff:.2e}, NaN positions match: {same_nan} {status}")
+    return ok
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and benchmark the native indicator engine')
+    parser.add_argument('--symbols', type=int, default=80, help='Number of symbols (default: 80)')
+    parser.add_argument('--rows', type=int, default=50_000, help='Rows of the longest symbol (default: 50,000)')
+    parser.add_argument('--parity-symbols', type=int, default=3,
+                        help='Symbols checked against the scalar TA-Lib port (default: 3)')
+    args = parser.parse_args()
+
+    df = synthetic_candles(args.symbols, args.rows)
+    print(f"INDICATOR BENCHMARK ({args.symbols} symbols, {len(df):,} rows)")
+
+    native, native_s = timed(compute_indicators, df)
+    print(f"\n  native grouped pass:      {native_s:8.3f} s")
+
+    ok = True
+    parity_df = df[df['symbol'].isin(df['symbol'].unique()[:args.parity_symbols])]
+    expected = pd.DataFrame(index=parity_df.index, columns=INDICATOR_COLUMNS, dtype=np.float64)
+    for _, symbol_df in parity_df.sort_values('timestamp').groupby('symbol'):
+        columns = talib_loops(*(symbol_df[c].to_numpy(np.float64) for c in ('high', 'low', 'close')))
+        expected.loc[symbol_df.index] = np.column_stack([columns[c] for c in INDICATOR_COLUMNS])
+    ok &= print_report(f'scalar TA-Lib port ({args.parity_symbols} symbols)',
+                       compare(native.loc[parity_df.index], expected), tolerance=1e-9)
+
+    try:
+        import talib
+    except ImportError:
+        print("\n  TA-Lib not installed, skipping")
+    else:
+        reference, talib_s = timed(talib_per_symbol, df, talib)
+        print(f"\n  TA-Lib per symbol:        {talib_s:8.3f} s ({talib_s / native_s:.1f}x native)")
+        ok &= print_report('TA-Lib', compare(native, reference), tolerance=1e-9)
+
+    try:
+        import pandas_ta as ta
+    except ImportError:
+        print("\n  pandas_ta not installed, skipping")
+    else:
+        reference, pandas_ta_s = timed(pandas_ta_per_symbol, df, ta)
+        print(f"\n  pandas_ta per symbol:     {pandas_ta_s:8.3f} s ({pandas_ta_s / native_s:.1f}x slower)")
+        position = df.groupby('symbol').cumcount().to_numpy()
+        print_report(f'pandas_ta (after {PANDAS_TA_WARMUP} bars)',
+                     compare(native, reference, rows=position >= PANDAS_TA_WARMUP))
+
+    print(f"\nPARITY: {'OK' if ok else 'FAILED'}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Check and benchmark the async kline fetcher against a local stub kline server
+
+The stub serves deterministic klines for any symbol, reports request weight in
+X-MBX-USED-WEIGHT-1M, adds latency and can inject 5xx / 429 responses.
+
+Usage (from ML/trading_model):
+    python benchmarks/kline_fetch.py
+    python benchmarks/kline_fetch.py --symbols 80 --months 6 --latency-ms 80 --fail-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.kline_fetcher import KLINES_LIMIT, KLINES_WEIGHT, fetch_klines, interval_to_ms
+
+
+class StubKlineServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency_ms: float = 0, fail_rate: float = 0.0):
+        super().__init__(('127.0.0.1', 0), StubKlineHandler)
+        self.latency = latency_ms / 1000
+        self.fail_rate = fail_rate
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.weight = 0
+        self.minute = int(time.time() // 60)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def count(self) -> int:
+        """Register one request; returns the weight used in the current minute"""
+        with self.lock:
+            self.requests += 1
+            minute = int(time.time() // 60)
+            if minute != self.minute:
+                self.minute, self.weight = minute, 0
+            self.weight += KLINES_WEIGHT
+            return self.weight
+
+
+class StubKlineHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server: StubKlineServer = self.server
+        used_weight = server.count()
+        time.sleep(server.latency)
+
+        # Deterministic failure injection, spread over requests
+        if server.fail_rate and (server.requests * 7919) % 1000 < server.fail_rate * 1000:
+            status = 429 if server.requests % 2 else 503
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '1')
+            self.end_headers()
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        step = interval_to_ms(query['interval'][0])
+        start = -(-int(query['startTime'][0]) // step) * step
+        end = int(query['endTime'][0])
+        limit = int(query.get('limit', [KLINES_LIMIT])[0])
+
+        klines = []
+        for open_time in range(start, end + 1, step)[:limit]:
+            price = 100 + (open_time // step) % 97
+            klines.append([open_time, str(price), str(price + 1), str(price - 1), str(price + 0.5),
+                           '10.0', open_time + step - 1, '0', 1, '0', '0', '0'])
+
+        body = json.dumps(klines).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-MBX-USED-WEIGHT-1M', str(used_weight))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def run(server: StubKlineServer, symbols, interval, start_ms, end_ms, **kwargs):
+    """Fetch everything; returns (seconds, requests, complete)"""
+    expected = len(range(start_ms, end_ms, interval_to_ms(interval)))
+    requests_before = server.requests
+    started = time.perf_counter()
+    results = asyncio.run(fetch_klines(symbols, interval, start_ms, end_ms, base_url=server.url,
+                                       backoff_seconds=0.05, **kwargs))
+    elapsed = time.perf_counter() - started
+    complete = len(results) == len(symbols) and all(len(df) == expected for df in results.values())
+    return elapsed, server.requests - requests_before, complete
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the async kline fetcher on a stub server')
+    parser.add_argument('--symbols', type=int, default=20, help='Number of symbols (default: 20)')
+    parser.add_argument('--months', type=int, default=6, help='Months of history (default: 6)')
+    parser.add_argument('--interval', type=str, default='30m', help='Candle interval (default: 30m)')
+    parser.add_argument('--latency-ms', type=float, default=50, help='Stub response latency (default: 50)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of 429/503 responses')
+    parser.add_argument('--connections', type=int, default=16, help='Pooled connections (default: 16)')
+    args = parser.parse_args()
+
+    server = StubKlineServer(args.latency_ms, args.fail_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    symbols = [f'SYM{i:03d}USDT' for i in range(args.symbols)]
+    step = interval_to_ms(args.interval)
+    end_ms = int(time.time() * 1000) // step * step
+    start_ms = end_ms - args.months * 30 * 86_400_000
+
+    print(f"STUB FETCH ({args.symbols} symbols, {args.months} months of {args.interval}, "
+          f"{args.latency_ms:.0f} ms latency, {args.fail_rate:.0%} failures)")
+
+    serial = run(server, symbols, args.interval, start_ms, end_ms,
+                 max_connections=1, symbol_concurrency=1)
+    print(f"  serial (1 connection): {serial[0]:.2f} s, {serial[1]} requests, complete={serial[2]}")
+
+    concurrent = run(server, symbols, args.interval, start_ms, end_ms,
+                     max_connections=args.connections)
+    print(f"  concurrent ({args.connections} connections): {concurrent[0]:.2f} s, {concurrent[1]} requests, "
+          f"complete={concurrent[2]} ({serial[0] / concurrent[0]:.1f}x faster)")
+
+    server.shutdown()
+    if not (serial[2] and concurrent[2]):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,10 @@
 """Quick test to show how features are created"""
 import pandas as pd
 from utils.preprocessor import TradingDataPreprocessor
+from utils.candle_store import load_candles
 
 # Load raw data
-df = pd.read_csv('../data/training_data.csv', nrows=100)
+df = load_candles('../data/candles').head(100)
 print("RAW CSV COLUMNS:")
 print(df.columns.tolist())
 print(f"\nNumber of columns in CSV: {len(df.columns)}")
@@ -5,16 +5,31 @@ Training pipeline for LSTM/Transformer trading model
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader, random_split, WeightedRandomSampler
+from torch.utils.data import (Dataset, DataLoader, random_split, WeightedRandomSampler,
+                              BatchSampler, RandomSampler, SequentialSampler, Sampler)
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Iterator, Optional
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import json
+import os
+import queue
+import threading
+from contextlib import nullcontext
 from datetime import datetime
 
 from models.transformer_lstm import create_model
 from utils.preprocessor import TradingDataPreprocessor
+from utils.balance_dataset import WindowBalancer
+from utils.candle_store import load_candles
+from utils.collect_data_validation import symbols_with_errors
+from utils.feature_kernel import RAW_COLUMNS
+from utils.cpu_perf import configure_cpu_threads, cpu_supports_bf16
+from utils.distributed import (DistributedWindowSampler, all_reduce_sum, cleanup_distributed, get_local_world_size,
+                               get_world_size, init_distributed, is_main_process, reduce_stage_stats)
+from utils.training_profiler import StageTimer, create_profiler, peak_memory_mb, reset_peak_memory
 
 
 class FocalLoss(nn.Module):
@@ -63,18 +78,216 @@ class FocalLoss(nn.Module):
 
 
 class TradingDataset(Dataset):
-    """PyTorch Dataset for trading sequences"""
+    """
+    PyTorch Dataset for trading sequences
+
+    Rows of all symbols are kept once in a contiguous feature matrix and each
+    sample is a zero-copy view of `lookback` rows ending at window_ends[idx],
+    so memory scales with rows rather than rows x lookback. get_batch gathers
+    a whole batch of windows with one index_select (see WindowBatchLoader).
+    """
 
-    def __init__(self, X: np.ndarray, y_class: np.ndarray, y_reg: np.ndarray):
-        self.X = torch.FloatTensor(X)
-        self.y_class = torch.LongTensor(y_class)
-        self.y_reg = torch.FloatTensor(y_reg).unsqueeze(1)
+    def __init__(
+        self,
+        features: np.ndarray,
+        window_ends: np.ndarray,
+        y_class: np.ndarray,
+        y_reg: np.ndarray,
+        lookback: int
+    ):
+        self.features = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32))
+        self.window_ends = torch.from_numpy(np.asarray(window_ends, dtype=np.int64))
+        self.y_class = torch.from_numpy(np.asarray(y_class, dtype=np.int64))
+        self.y_reg = torch.from_numpy(np.asarray(y_reg, dtype=np.float32)).unsqueeze(1)
+        self.lookback = lookback
+        self.row_offsets = torch.arange(-lookback, 0, dtype=torch.int64)
 
     def __len__(self) -> int:
-        return len(self.X)
+        return len(self.window_ends)
 
-    def __getitem__(self, idx: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
-        return self.X[idx], self.y_class[idx], self.y_reg[idx]
+    def __getitem__(self, idx) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """One window, or a whole batch when idx is a list of windows (BatchSampler with batch_size=None)"""
+        if not isinstance(idx, (int, np.integer)):
+            return self.get_batch(idx)
+        end = int(self.window_ends[idx])
+        return self.features[end - self.lookback:end], self.y_class[idx], self.y_reg[idx]
+
+    def get_batch(
+        self,
+        indices,
+        out: Optional[torch.Tensor] = None
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Gather a batch of windows with one index_select into the feature rows
+
+        Args:
+            indices: Window indexes (list, array or int64 tensor)
+            out: Optional preallocated (>= batch, lookback, features) tensor to gather into
+
+        Returns:
+            X (batch, lookback, features), y_class (batch,), y_reg (batch, 1)
+        """
+        indices = torch.as_tensor(indices, dtype=torch.int64)
+        rows = (self.window_ends[indices].unsqueeze(1) + self.row_offsets).reshape(-1)
+        shape = (len(indices), self.lookback, self.features.shape[1])
+        if out is None:
+            X = torch.index_select(self.features, 0, rows).view(shape)
+        else:
+            X = out[:len(indices)]
+            torch.index_select(self.features, 0, rows, out=X.view(-1, shape[2]))
+        return X, self.y_class[indices], self.y_reg[indices]
+
+
+class WindowBatchLoader:
+    """
+    In-process batch loader for TradingDataset
+
+    Replaces DataLoader's per-sample __getitem__ + default_collate with one
+    gather per batch. With prefetch > 0 a background thread gathers the next
+    batches while the model runs (index_select releases the GIL); batches are
+    written into a ring of prefetch + 2 preallocated buffers, so no tensor is
+    allocated per step. A batch's X is only valid until the loop has advanced
+    prefetch + 1 batches further: copy it if it must be kept.
+
+    Exposes dataset and __len__ like a DataLoader, so the trainer takes either.
+    """
+
+    def __init__(
+        self,
+        dataset: TradingDataset,
+        batch_size: int,
+        sampler: Optional[Sampler] = None,
+        shuffle: bool = False,
+        drop_last: bool = False,
+        prefetch: int = 2,
+        pin_memory: bool = False
+    ):
+        """
+        Args:
+            dataset: TradingDataset to batch
+            batch_size: Windows per batch
+            sampler: Window order (e.g. WeightedRandomSampler); overrides shuffle
+            shuffle: Random order each epoch (ignored with a sampler)
+            drop_last: Drop the last incomplete batch
+            prefetch: Batches gathered ahead in a background thread (0 = gather inline)
+            pin_memory: Gather into pinned buffers (faster, asynchronous copies to CUDA)
+        """
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.sampler = sampler
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.prefetch = prefetch
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self._buffers = None
+
+    def _num_samples(self) -> int:
+        return len(self.sampler) if self.sampler is not None else len(self.dataset)
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self._num_samples() // self.batch_size
+        return -(-self._num_samples() // self.batch_size)
+
+    def _epoch_order(self) -> torch.Tensor:
+        if self.sampler is not None:
+            return torch.as_tensor(list(self.sampler), dtype=torch.int64)
+        if self.shuffle:
+            return torch.randperm(len(self.dataset))
+        return torch.arange(len(self.dataset))
+
+    def _batch_indices(self) -> List[torch.Tensor]:
+        return list(self._epoch_order().split(self.batch_size))[:len(self)]
+
+    def _get_buffers(self) -> List[torch.Tensor]:
+        if self._buffers is None:
+            shape = (self.batch_size, self.dataset.lookback, self.dataset.features.shape[1])
+            self._buffers = [torch.empty(shape, dtype=self.dataset.features.dtype, pin_memory=self.pin_memory)
+                             for _ in range(self.prefetch + 2)]
+        return self._buffers
+
+    def __iter__(self) -> Iterator[Tuple[torch.Tensor, torch.Tensor, torch.Tensor]]:
+        batches = self._batch_indices()
+        if self.prefetch <= 0:
+            for indices in batches:
+                yield self.dataset.get_batch(indices)
+            return
+
+        buffers = self._get_buffers()
+        ready = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            """Queue item unless the consumer stopped reading (then False)"""
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for i, indices in enumerate(batches):
+                    if not put(self.dataset.get_batch(indices, out=buffers[i % len(buffers)])):
+                        return
+                put(None)
+            except BaseException as e:  # surfaced in the training loop
+                put(e)
+
+        producer = threading.Thread(target=produce, name='window-batch-prefetch', daemon=True)
+        producer.start()
+        try:
+            while True:
+                batch = ready.get()
+                if batch is None:
+                    break
+                if isinstance(batch, BaseException):
+                    raise batch
+                yield batch
+        finally:
+            stop.set()
+            producer.join()
+
+
+def create_batch_loader(
+    dataset: TradingDataset,
+    batch_size: int,
+    sampler: Optional[Sampler] = None,
+    shuffle: bool = False,
+    num_workers: int = 0,
+    prefetch: int = 2,
+    pin_memory: bool = False
+):
+    """
+    Batch-level loader for a TradingDataset
+
+    num_workers == 0 returns a WindowBatchLoader (gather in a background
+    thread). With worker processes, a DataLoader is driven by a BatchSampler
+    (batch_size=None), so every worker gathers whole batches with
+    TradingDataset.get_batch; the feature matrix is moved to shared memory
+    first, so workers map it instead of each holding a copy.
+
+    Returns:
+        WindowBatchLoader or DataLoader yielding (X, y_class, y_reg) batches
+    """
+    if num_workers <= 0:
+        return WindowBatchLoader(dataset, batch_size, sampler=sampler, shuffle=shuffle,
+                                 prefetch=prefetch, pin_memory=pin_memory)
+
+    dataset.features.share_memory_()
+    if sampler is None:
+        sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    return DataLoader(
+        dataset,
+        sampler=BatchSampler(sampler, batch_size, drop_last=False),
+        batch_size=None,
+        num_workers=num_workers,
+        prefetch_factor=max(prefetch, 1),
+        persistent_workers=True,
+        pin_memory=pin_memory and torch.cuda.is_available()
+    )
 
 
 class TradingModelTrainer:
@@ -96,11 +309,33 @@ class TradingModelTrainer:
         warmup_epochs: int = 5,
         min_learning_rate: float = 1e-4,
         scheduler_patience: int = 5,
-        scheduler_factor: float = 0.8
+        scheduler_factor: float = 0.8,
+        profile_steps: int = 0,  # Record a torch.profiler trace of the first N steps
+        profile_dir: str = None,  # Trace directory (default: <save_dir>/profile)
+        cpu_bf16: bool = False,  # bfloat16 autocast when training on CPU
+        compile_model: bool = False,  # torch.compile the forward/backward of each step
+        fused_optimizer: bool = True,  # Fused AdamW (foreach where unsupported)
+        distributed: bool = False  # DDP across the torchrun process group (see utils/distributed.py)
     ):
         self.model = model.to(device)
         self.device = device
+        self.is_main = is_main_process()
         self.use_amp = use_amp and device == 'cuda'
+        self.cpu_bf16 = cpu_bf16 and device == 'cpu'
+        if self.cpu_bf16 and not cpu_supports_bf16():
+            print("Warning: CPU has no native bfloat16 (AVX512-BF16/AMX); bf16 autocast will be slow")
+        # Checkpoints save self.model, so the DDP / compiled wrappers are kept separately.
+        # Training steps go through DDP (gradients are all-reduced during backward);
+        # validation runs the plain module, so ranks may see different batch counts
+        self.compile_model = compile_model
+        self.ddp_model = None
+        if distributed and get_world_size() > 1:
+            self.ddp_model = nn.parallel.DistributedDataParallel(
+                self.model, device_ids=[torch.cuda.current_device()] if device == 'cuda' else None)
+        train_model = self.ddp_model if self.ddp_model is not None else self.model
+        self.forward_model = torch.compile(train_model) if compile_model else train_model
+        self.eval_model = self.forward_model if train_model is self.model else (
+            torch.compile(self.model) if compile_model else self.model)
         self.gradient_accumulation_steps = gradient_accumulation_steps
         self.use_focal_loss = use_focal_loss
         self.focal_gamma = focal_gamma
@@ -108,12 +343,19 @@ class TradingModelTrainer:
         self.warmup_epochs = warmup_epochs
         self.base_learning_rate = learning_rate
         self.min_learning_rate = min_learning_rate
-
-        self.optimizer = optim.AdamW(
-            model.parameters(),
-            lr=learning_rate,
-            weight_decay=weight_decay
-        )
+        self.profile_steps = profile_steps
+        self.profile_dir = profile_dir
+        self.train_stats = None  # Stage timings of the last train_epoch / validate
+        self.val_stats = None
+
+        # One fused kernel for all parameters instead of a Python loop over them
+        params = list(model.parameters())
+        try:
+            self.optimizer = optim.AdamW(params, lr=learning_rate, weight_decay=weight_decay,
+                                         fused=True if fused_optimizer else None)
+        except (RuntimeError, TypeError):  # fused AdamW unavailable for this device / torch version
+            self.optimizer = optim.AdamW(params, lr=learning_rate, weight_decay=weight_decay,
+                                         foreach=True if fused_optimizer else None)
 
         # Use val loss to drive LR reduction (more standard than accuracy)
         self.scheduler = optim.lr_scheduler.ReduceLROnPlateau(
@@ -147,9 +389,19 @@ class TradingModelTrainer:
             'val_loss': [],
             'val_accuracy': [],
             'val_f1': [],
-            'learning_rate': []
+            'learning_rate': [],
+            'performance': []  # Per epoch: stage timings, samples/sec, peak memory
         }
 
+    def _autocast(self):
+        """bfloat16 autocast on CPU (cpu_bf16), float16 AMP on CUDA (use_amp), otherwise a no-op"""
+        if self.cpu_bf16:
+            return torch.autocast('cpu', dtype=torch.bfloat16)
+        try:
+            return torch.amp.autocast('cuda', enabled=self.use_amp)
+        except TypeError:
+            return torch.cuda.amp.autocast(enabled=self.use_amp)
+
     def set_class_weights(self, train_loader: DataLoader):
         """
         Calculate class weights from training data to handle imbalance.
@@ -189,6 +441,8 @@ class TradingModelTrainer:
                 label_smoothing=self.label_smoothing
             )
 
+        if not self.is_main:
+            return
         print(f"\nClass distribution in training data (N={len(all_labels)}):")
         for i, count in enumerate(class_counts):
             class_name = ['DOWN', 'SIDEWAYS', 'UP'][i]
@@ -196,28 +450,32 @@ class TradingModelTrainer:
             print(f"  {class_name:10s}: {int(count):7,} ({pct:5.2f}%) - weight: {weights[i]:.4f}")
         print()
 
-    def train_epoch(self, train_loader: DataLoader) -> float:
-        """Train for one epoch with mixed precision and gradient accumulation"""
+    def train_epoch(self, train_loader: DataLoader, profiler=None) -> float:
+        """
+        Train for one epoch with mixed precision and gradient accumulation
+
+        Time per stage (data, forward, backward, optimizer) is kept in self.train_stats.
+        With DDP the returned loss and the throughput cover all ranks.
+
+        Args:
+            train_loader: Training data loader
+            profiler: Optional torch.profiler.profile, stepped after every batch
+        """
         self.model.train()
         total_loss = 0
         n_batches = 0
+        timer = StageTimer(self.device)
+        if profiler is not None:
+            profiler.start()
 
-        for batch_idx, (X_batch, y_class_batch, y_reg_batch) in enumerate(train_loader):
-            X_batch = X_batch.to(self.device, non_blocking=True)
-            y_class_batch = y_class_batch.to(self.device, non_blocking=True)
-            y_reg_batch = y_reg_batch.to(self.device, non_blocking=True)
-
+        for batch_idx, (X_batch, y_class_batch, y_reg_batch) in enumerate(timer.batches(train_loader, self.device)):
             # Mixed precision forward pass
-            try:
-                autocast_ctx = torch.amp.autocast('cuda', enabled=self.use_amp)
-            except TypeError:
-                autocast_ctx = torch.cuda.amp.autocast(enabled=self.use_amp)
-            with autocast_ctx:
+            with timer.stage('forward'), self._autocast():
                 # Forward pass
                 if hasattr(self.model, 'attention'):  # TransformerLSTM
-                    class_logits, reg_pred, _ = self.model(X_batch)
+                    class_logits, reg_pred, _ = self.forward_model(X_batch)
                 else:  # LightweightLSTM
-                    class_logits, reg_pred = self.model(X_batch)
+                    class_logits, reg_pred = self.forward_model(X_batch)
 
                 # Multi-task loss
                 loss_class = self.criterion_class(class_logits, y_class_batch)
@@ -226,57 +484,66 @@ class TradingModelTrainer:
                 # Combined loss (classification weighted higher)
                 loss = (loss_class + 0.15 * loss_reg) / self.gradient_accumulation_steps
 
-            # Mixed precision backward pass
-            if self.use_amp:
-                self.scaler.scale(loss).backward()
-            else:
-                loss.backward()
-
-            # Only update weights every N steps
-            if (batch_idx + 1) % self.gradient_accumulation_steps == 0:
+            # Mixed precision backward pass; with DDP, gradients are only all-reduced
+            # on the micro-batch that ends an accumulation cycle
+            update_step = (batch_idx + 1) % self.gradient_accumulation_steps == 0
+            no_sync = self.ddp_model.no_sync() if self.ddp_model is not None and not update_step else nullcontext()
+            with timer.stage('backward'), no_sync:
                 if self.use_amp:
-                    # Gradient clipping
-                    self.scaler.unscale_(self.optimizer)
-                    torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
-                    self.scaler.step(self.optimizer)
-                    self.scaler.update()
+                    self.scaler.scale(loss).backward()
                 else:
-                    torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
-                    self.optimizer.step()
+                    loss.backward()
 
-                self.optimizer.zero_grad()
+            # Only update weights every N steps
+            if update_step:
+                with timer.stage('optimizer'):
+                    if self.use_amp:
+                        # Gradient clipping
+                        self.scaler.unscale_(self.optimizer)
+                        torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
+                        self.scaler.step(self.optimizer)
+                        self.scaler.update()
+                    else:
+                        torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
+                        self.optimizer.step()
+
+                    self.optimizer.zero_grad(set_to_none=True)
 
             total_loss += loss.item() * self.gradient_accumulation_steps
             n_batches += 1
-
+            timer.add_samples(len(X_batch))
+            if profiler is not None:
+                profiler.step()
+
+        if profiler is not None:
+            profiler.stop()
+        self.train_stats = reduce_stage_stats(timer.summary())
+        total_loss, n_batches = all_reduce_sum([total_loss, n_batches])  # mean over all ranks' batches
         return total_loss / n_batches
 
     @torch.no_grad()
     def validate(self, val_loader: DataLoader) -> Dict[str, float]:
-        """Validate model with mixed precision"""
+        """
+        Validate model with mixed precision (stage timings in self.val_stats)
+
+        Metrics come from a confusion matrix summed over all ranks, so with DDP
+        every rank gets the metrics of the whole validation set.
+        """
         self.model.eval()
 
         total_loss = 0
-        all_preds = []
-        all_labels = []
+        confusion = torch.zeros(9, dtype=torch.int64)  # label * 3 + prediction
         n_batches = 0
+        timer = StageTimer(self.device)
 
-        for X_batch, y_class_batch, y_reg_batch in val_loader:
-            X_batch = X_batch.to(self.device, non_blocking=True)
-            y_class_batch = y_class_batch.to(self.device, non_blocking=True)
-            y_reg_batch = y_reg_batch.to(self.device, non_blocking=True)
-
+        for X_batch, y_class_batch, y_reg_batch in timer.batches(val_loader, self.device):
             # Mixed precision forward pass
-            try:
-                autocast_ctx = torch.amp.autocast('cuda', enabled=self.use_amp)
-            except TypeError:
-                autocast_ctx = torch.cuda.amp.autocast(enabled=self.use_amp)
-            with autocast_ctx:
+            with timer.stage('forward'), self._autocast():
                 # Forward pass
                 if hasattr(self.model, 'attention'):
-                    class_logits, reg_pred, _ = self.model(X_batch)
+                    class_logits, reg_pred, _ = self.eval_model(X_batch)
                 else:
-                    class_logits, reg_pred = self.model(X_batch)
+                    class_logits, reg_pred = self.eval_model(X_batch)
 
                 # Loss
                 loss_class = self.criterion_class(class_logits, y_class_batch)
@@ -288,30 +555,33 @@ class TradingModelTrainer:
 
             # Predictions
             pred_class = class_logits.argmax(dim=1)
-            all_preds.extend(pred_class.cpu().numpy())
-            all_labels.extend(y_class_batch.cpu().numpy())
+            confusion += torch.bincount((y_class_batch * 3 + pred_class).cpu(), minlength=9)
+            timer.add_samples(len(X_batch))
+
+        self.val_stats = reduce_stage_stats(timer.summary())
 
-        # Calculate metrics
-        all_preds = np.array(all_preds)
-        all_labels = np.array(all_labels)
+        # Calculate metrics (over all ranks)
+        reduced = all_reduce_sum(np.r_[total_loss, n_batches, confusion.numpy()])
+        total_loss, n_batches = reduced[0], reduced[1]
+        confusion = reduced[2:].reshape(3, 3)  # rows: labels, columns: predictions
+        total = confusion.sum()
 
-        accuracy = float((all_preds == all_labels).mean()) if all_labels.size > 0 else 0.0
+        accuracy = float(np.trace(confusion) / total) if total > 0 else 0.0
 
         # Per-class accuracy (handle missing classes)
         class_accuracies = {}
         for cls in [0, 1, 2]:  # DOWN, SIDEWAYS, UP
-            mask = all_labels == cls
-            if mask.sum() > 0:
-                class_accuracies[cls] = float((all_preds[mask] == all_labels[mask]).mean())
+            if confusion[cls].sum() > 0:
+                class_accuracies[cls] = float(confusion[cls, cls] / confusion[cls].sum())
             else:
                 class_accuracies[cls] = None  # No examples in validation set
 
         # F1-score (macro average)
         f1_scores = []
         for cls in [0, 1, 2]:
-            tp = ((all_preds == cls) & (all_labels == cls)).sum()
-            fp = ((all_preds == cls) & (all_labels != cls)).sum()
-            fn = ((all_preds != cls) & (all_labels == cls)).sum()
+            tp = confusion[cls, cls]
+            fp = confusion[:, cls].sum() - tp
+            fn = confusion[cls].sum() - tp
 
             precision = tp / (tp + fp) if (tp + fp) > 0 else 0
             recall = tp / (tp + fn) if (tp + fn) > 0 else 0
@@ -350,17 +620,23 @@ class TradingModelTrainer:
         """
         save_path = Path(save_dir)
         save_path.mkdir(parents=True, exist_ok=True)
+        # With DDP every rank trains and validates, rank 0 alone logs and writes checkpoints
+        log = print if self.is_main else (lambda *args, **kwargs: None)
 
         best_val_f1 = -1.0
         best_val_acc = -1.0
         patience_counter = 0
 
-        print(f"Training on device: {self.device}")
-        print(f"Mixed precision (AMP): {'Enabled' if self.use_amp else 'Disabled'}")
-        print(f"Model parameters: {sum(p.numel() for p in self.model.parameters()):,}")
-        print(f"Base LR: {self.base_learning_rate} (warmup_epochs={self.warmup_epochs}, min_lr={self.min_learning_rate})")
-        print(f"Label smoothing: {self.label_smoothing}")
-        print(f"Classification loss: {'Focal' if self.use_focal_loss else 'CrossEntropy'}")
+        log(f"Training on device: {self.device}")
+        if self.ddp_model is not None:
+            log(f"Distributed data parallel: {get_world_size()} processes (gloo)")
+        log(f"Mixed precision (AMP): {'Enabled' if self.use_amp else 'bfloat16 (CPU)' if self.cpu_bf16 else 'Disabled'}")
+        log(f"Compiled step: {'Enabled' if self.compile_model else 'Disabled'}, "
+              f"optimizer: {'fused' if self.optimizer.defaults.get('fused') else 'foreach' if self.optimizer.defaults.get('foreach') else 'default'} AdamW")
+        log(f"Model parameters: {sum(p.numel() for p in self.model.parameters()):,}")
+        log(f"Base LR: {self.base_learning_rate} (warmup_epochs={self.warmup_epochs}, min_lr={self.min_learning_rate})")
+        log(f"Label smoothing: {self.label_smoothing}")
+        log(f"Classification loss: {'Focal' if self.use_focal_loss else 'CrossEntropy'}")
 
         # Calculate class weights to handle imbalanced data
         self.set_class_weights(train_loader)
@@ -373,8 +649,13 @@ class TradingModelTrainer:
                 for param_group in self.optimizer.param_groups:
                     param_group['lr'] = warmup_lr
 
-            # Train
-            train_loss = self.train_epoch(train_loader)
+            # Train (the first epoch optionally under the profiler)
+            reset_peak_memory(self.device)
+            profiler = None
+            if epoch == 1 and self.is_main:
+                profiler = create_profiler(self.profile_dir or str(save_path / 'profile'),
+                                           self.profile_steps, self.device)
+            train_loss = self.train_epoch(train_loader, profiler)
 
             # Validate
             val_metrics = self.validate(val_loader)
@@ -389,13 +670,19 @@ class TradingModelTrainer:
             self.history['val_accuracy'].append(val_metrics['accuracy'])
             self.history['val_f1'].append(val_metrics['f1'])
             self.history['learning_rate'].append(self.optimizer.param_groups[0]['lr'])
+            self.history['performance'].append({
+                'epoch': epoch,
+                'train': self.train_stats,
+                'val': self.val_stats,
+                'peak_memory_mb': round(peak_memory_mb(self.device), 1)
+            })
 
             # Print progress
-            print(f"Epoch {epoch}/{epochs}")
-            print(f"  Train Loss: {train_loss:.6f}")
-            print(f"  Val Loss: {val_metrics['loss']:.6f}")
-            print(f"  Val Accuracy: {val_metrics['accuracy']:.6f}")
-            print(f"  Val F1: {val_metrics['f1']:.6f}")
+            log(f"Epoch {epoch}/{epochs}")
+            log(f"  Train Loss: {train_loss:.6f}")
+            log(f"  Val Loss: {val_metrics['loss']:.6f}")
+            log(f"  Val Accuracy: {val_metrics['accuracy']:.6f}")
+            log(f"  Val F1: {val_metrics['f1']:.6f}")
 
             # Format class accuracies (handle None values)
             class_acc_parts = []
@@ -405,8 +692,13 @@ class TradingModelTrainer:
                     class_acc_parts.append(f"{name}={acc:.3f}")
                 else:
                     class_acc_parts.append(f"{name}=None")
-            print(f"  Class Accuracies: {', '.join(class_acc_parts)}")
-            print(f"  LR: {self.optimizer.param_groups[0]['lr']:.8f}")
+            log(f"  Class Accuracies: {', '.join(class_acc_parts)}")
+            log(f"  LR: {self.optimizer.param_groups[0]['lr']:.8f}")
+            share = self.train_stats['stage_share']
+            log(f"  Throughput: {self.train_stats['samples_per_sec']:,.0f} train samples/s "
+                  f"({', '.join(f'{name} {share[name]:.0%}' for name in share)}), "
+                  f"{self.val_stats['samples_per_sec']:,.0f} val samples/s, "
+                  f"peak memory {self.history['performance'][-1]['peak_memory_mb']:,.0f} MB")
 
             # Save best model by F1 (primary metric)
             saved = False
@@ -425,8 +717,9 @@ class TradingModelTrainer:
                     'model_type': getattr(self.model, 'model_type', None),
                     'model_kwargs': getattr(self.model, 'model_kwargs', None)
                 }
-                torch.save(checkpoint, save_path / 'best_model.pt')
-                print(f"  ✓ Saved best model by F1 (f1={val_metrics['f1']:.4f}, acc={val_metrics['accuracy']:.4f})")
+                if self.is_main:
+                    torch.save(checkpoint, save_path / 'best_model.pt')
+                log(f"  ✓ Saved best model by F1 (f1={val_metrics['f1']:.4f}, acc={val_metrics['accuracy']:.4f})")
                 saved = True
             else:
                 patience_counter += 1
@@ -434,42 +727,183 @@ class TradingModelTrainer:
             # Also save best accuracy separately (optional)
             if val_metrics['accuracy'] > best_val_acc and not saved:
                 best_val_acc = val_metrics['accuracy']
-                torch.save({
-                    'epoch': epoch,
-                    'model_state_dict': self.model.state_dict(),
-                    'optimizer_state_dict': self.optimizer.state_dict(),
-                    'val_accuracy': val_metrics['accuracy'],
-                    'val_f1': val_metrics['f1'],
-                    'history': self.history,
-                    'model_type': getattr(self.model, 'model_type', None),
-                    'model_kwargs': getattr(self.model, 'model_kwargs', None)
-                }, save_path / 'best_model_by_acc.pt')
-                print(f"  ✓ Saved best model by Accuracy (acc={val_metrics['accuracy']:.4f})")
+                if self.is_main:
+                    torch.save({
+                        'epoch': epoch,
+                        'model_state_dict': self.model.state_dict(),
+                        'optimizer_state_dict': self.optimizer.state_dict(),
+                        'val_accuracy': val_metrics['accuracy'],
+                        'val_f1': val_metrics['f1'],
+                        'history': self.history,
+                        'model_type': getattr(self.model, 'model_type', None),
+                        'model_kwargs': getattr(self.model, 'model_kwargs', None)
+                    }, save_path / 'best_model_by_acc.pt')
+                log(f"  ✓ Saved best model by Accuracy (acc={val_metrics['accuracy']:.4f})")
 
             # Early stopping based on F1
             if patience_counter >= early_stopping_patience:
-                print(f"\nEarly stopping triggered after epoch {epoch} (no F1 improvement in {early_stopping_patience} epochs)")
+                log(f"\nEarly stopping triggered after epoch {epoch} (no F1 improvement in {early_stopping_patience} epochs)")
                 break
 
-            print()
+            log()
 
         # Save final model & history
-        torch.save({
-            'model_state_dict': self.model.state_dict(),
-            'model_type': getattr(self.model, 'model_type', None),
-            'model_kwargs': getattr(self.model, 'model_kwargs', None),
-            'history': self.history
-        }, save_path / 'final_model.pt')
-        with open(save_path / 'history.json', 'w') as f:
-            json.dump(self.history, f, indent=2)
-
-        print(f"\nTraining completed!")
-        print(f"Best validation F1: {best_val_f1:.6f}")
-        print(f"Best validation accuracy: {best_val_acc:.6f}")
+        if self.is_main:
+            torch.save({
+                'model_state_dict': self.model.state_dict(),
+                'model_type': getattr(self.model, 'model_type', None),
+                'model_kwargs': getattr(self.model, 'model_kwargs', None),
+                'history': self.history
+            }, save_path / 'final_model.pt')
+            with open(save_path / 'history.json', 'w') as f:
+                json.dump(self.history, f, indent=2)
+
+        log(f"\nTraining completed!")
+        log(f"Best validation F1: {best_val_f1:.6f}")
+        log(f"Best validation accuracy: {best_val_acc:.6f}")
 
         return self.history
 
 
+def build_symbol_windows(
+    preprocessor: TradingDataPreprocessor,
+    sym_df_raw: pd.DataFrame,
+    val_split: float,
+    shm_name: str = None,
+    row_offset: int = 0
+) -> Dict:
+    """
+    Features, labels and chronological train/val window split for one symbol
+
+    Features and labels are computed once over the full symbol series; windows are
+    then assigned by end row. Train labels must not look past the split row, so
+    windows whose forward return straddles the boundary are dropped.
+
+    Args:
+        preprocessor: Preprocessor with feature_columns set
+        sym_df_raw: Raw candles of one symbol, oldest first
+        val_split: Validation fraction
+        shm_name: Shared memory block (rows, features) float32 to write the feature
+            rows into at row_offset; None returns them in the result instead
+
+    Returns:
+        Dict with rows, split_idx, features (None when written to shared memory)
+        and (window_ends, y_class, y_reg) for 'train' and 'val', ends relative to the symbol
+    """
+    # Store columns are float32; compute features in float64 like the inference kernel
+    sym_df_raw = sym_df_raw.astype({c: np.float64 for c in RAW_COLUMNS if c in sym_df_raw.columns})
+    sym_df = preprocessor.create_features(sym_df_raw)
+    sym_df = preprocessor.create_labels(sym_df)
+    features, ends, y_class, y_reg = preprocessor.create_window_index(sym_df, preprocessor.feature_columns)
+
+    split_idx = int(len(sym_df) * (1 - val_split))
+    train_mask = ends < split_idx - preprocessor.forward_bars
+    val_mask = ends >= split_idx
+
+    if shm_name is not None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            block = np.ndarray(features.shape, dtype=np.float32, buffer=shm.buf,
+                               offset=row_offset * features.shape[1] * features.itemsize)
+            block[:] = features
+            del block
+        finally:
+            shm.close()
+        features = None
+
+    return {
+        'rows': len(sym_df),
+        'split_idx': split_idx,
+        'features': features,
+        'train': (ends[train_mask], y_class[train_mask], y_reg[train_mask]),
+        'val': (ends[val_mask], y_class[val_mask], y_reg[val_mask])
+    }
+
+
+def build_all_symbol_windows(
+    df: pd.DataFrame,
+    preprocessor: TradingDataPreprocessor,
+    val_split: float,
+    workers: int = None
+) -> Tuple[np.ndarray, List[Tuple[str, Dict]]]:
+    """
+    Run build_symbol_windows for every symbol, across a process pool
+
+    Workers write feature rows straight into one shared memory block (only the
+    1-D window indexes and labels are pickled back), so the parent does a single
+    copy into the final matrix.
+
+    Args:
+        df: Raw candles of all symbols
+        preprocessor: Preprocessor with feature_columns set
+        val_split: Validation fraction
+        workers: Worker processes (None = one per CPU, capped at the symbol count; <= 1 = serial)
+
+    Returns:
+        features: (rows of all built symbols, features) float32
+        results: [(symbol, result)] with window ends offset into features; symbols
+            without enough rows have result None
+    """
+    groups = list(df.groupby('symbol', sort=False))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(groups))
+
+    if workers <= 1:
+        results = []
+        for symbol, sym_df_raw in groups:
+            try:
+                result = build_symbol_windows(preprocessor, sym_df_raw, val_split)
+            except ValueError:
+                result = None
+            results.append((symbol, result))
+        features = _concat_rows([result['features'] for _, result in results if result is not None], preprocessor)
+    else:
+        n_features = len(preprocessor.feature_columns)
+        offsets = np.concatenate([[0], np.cumsum([len(g) for _, g in groups])])
+        shm = shared_memory.SharedMemory(create=True, size=max(1, int(offsets[-1]) * n_features * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(build_symbol_windows, preprocessor, sym_df_raw, val_split, shm.name, int(offset))
+                    for (_, sym_df_raw), offset in zip(groups, offsets)
+                ]
+                results = []
+                for (symbol, _), future in zip(groups, futures):
+                    try:
+                        results.append((symbol, future.result()))
+                    except ValueError:
+                        results.append((symbol, None))
+
+            shared = np.ndarray((int(offsets[-1]), n_features), dtype=np.float32, buffer=shm.buf)
+            features = _concat_rows([shared[offset:offset + result['rows']]
+                                     for (_, result), offset in zip(results, offsets) if result is not None],
+                                    preprocessor)
+            del shared
+        finally:
+            shm.close()
+            shm.unlink()
+
+    # Offset window ends into the concatenated matrix
+    row_offset = 0
+    for _, result in results:
+        if result is None:
+            continue
+        for split in ('train', 'val'):
+            ends, y_class, y_reg = result[split]
+            result[split] = (ends + row_offset, y_class, y_reg)
+        result['features'] = None
+        row_offset += result['rows']
+
+    return features, results
+
+
+def _concat_rows(blocks: List[np.ndarray], preprocessor: TradingDataPreprocessor) -> np.ndarray:
+    if not blocks:
+        return np.empty((0, len(preprocessor.feature_columns)), dtype=np.float32)
+    return np.concatenate(blocks, axis=0)
+
+
 def prepare_dataloaders(
     csv_path: str,
     preprocessor: TradingDataPreprocessor = None,
@@ -478,39 +912,54 @@ def prepare_dataloaders(
     max_rows: int = None,
     lookback: int = 30,
     num_workers: int = 0,
-    use_weighted_sampler: bool = True
+    use_weighted_sampler: bool = True,
+    preprocess_workers: int = None,
+    interval: str = None,
+    quality_report: str = None,
+    balance_ratio: Tuple[float, float, float] = None,
+    prefetch_batches: int = 2,
+    distributed: bool = False
 ) -> Tuple[DataLoader, DataLoader, TradingDataPreprocessor]:
     """
-    Load data from CSV and create train/val dataloaders
+    Load data from the candle store and create train/val dataloaders
 
     Args:
-        csv_path: Path to CSV file with OHLCV and indicator data
+        csv_path: Candle store directory (or legacy CSV file) with OHLCV and indicator data
         preprocessor: Optional preprocessor (creates new if None)
         batch_size: Batch size for dataloaders
         val_split: Validation set fraction
         max_rows: Maximum number of rows to use (None = all data)
         lookback: Number of historical bars to use as input
+        num_workers: Loader worker processes (0 = gather batches in a background thread of this process)
+        use_weighted_sampler: Balance classes with a WeightedRandomSampler
+        preprocess_workers: Processes for per-symbol feature building (None = all CPUs, 1 = serial)
+        interval: Candle interval to train on (required if the store holds several)
+        quality_report: JSON report of utils/collect_data_validation.py; symbols
+            whose partitions have errors there are left out
+        balance_ratio: Undersample training windows to this (DOWN, SIDEWAYS, UP)
+            share (None = keep all); validation windows are never balanced
+        prefetch_batches: Batches gathered ahead of the training step
+        distributed: Shard train and val windows across the torchrun process group
+            (each rank builds the features, then iterates its own share of windows)
 
     Returns:
         train_loader, val_loader, preprocessor
     """
     # Load data (limit rows to save memory)
     import sys
-    print("  Step 1/5: Reading CSV file...")
+    print("  Step 1/5: Reading candles...")
     sys.stdout.flush()
 
-    if max_rows:
-        # Read file line count first
-        total_rows = sum(1 for _ in open(csv_path)) - 1  # -1 for header
-        skip_rows = max(0, total_rows - max_rows)
-        if skip_rows > 0:
-            print(f"  Loading last {max_rows} rows of {total_rows} total rows (skipping {skip_rows})")
-            sys.stdout.flush()
-            df = pd.read_csv(csv_path, skiprows=range(1, skip_rows + 1))
-        else:
-            df = pd.read_csv(csv_path)
-    else:
-        df = pd.read_csv(csv_path)
+    df = load_candles(csv_path, interval=interval)
+    if quality_report:
+        excluded = symbols_with_errors(quality_report, interval)
+        if excluded:
+            print(f"  Skipping {len(excluded)} symbols with data errors: {', '.join(excluded)}")
+            df = df[~df['symbol'].isin(excluded)].reset_index(drop=True)
+    if max_rows and len(df) > max_rows:
+        print(f"  Loading last {max_rows} rows of {len(df)} total rows (skipping {len(df) - max_rows})")
+        sys.stdout.flush()
+        df = df.iloc[len(df) - max_rows:].reset_index(drop=True)
 
     print(f"  ✓ Loaded {len(df)} rows")
     sys.stdout.flush()
@@ -522,89 +971,70 @@ def prepare_dataloaders(
     print("  ✓ Preprocessor created")
     sys.stdout.flush()
 
-    # Per-symbol chronological split to avoid symbol imbalance
-    # Split each symbol's data chronologically, then combine
-    train_dfs = []
-    val_dfs = []
+    # Features and labels are computed once per full symbol series (in parallel across
+    # symbols), then windows are split chronologically per symbol by their end row
+    # (avoids symbol imbalance and recomputing rolling warm-up at the split boundary)
+    feature_cols = preprocessor.get_feature_columns()
+    preprocessor.feature_columns = feature_cols  # ensure set for downstream use
 
-    print("  Splitting data per-symbol chronologically:")
-    for symbol in df['symbol'].unique():
-        symbol_df = df[df['symbol'] == symbol].copy()
-        split_idx = int(len(symbol_df) * (1 - val_split))
-
-        train_dfs.append(symbol_df.iloc[:split_idx])
-        val_dfs.append(symbol_df.iloc[split_idx:])
-
-        print(f"    {symbol}: {split_idx} train, {len(symbol_df) - split_idx} val")
-
-    train_df_raw = pd.concat(train_dfs, ignore_index=True)
-    val_df_raw = pd.concat(val_dfs, ignore_index=True)
-
-    min_needed = preprocessor.lookback + preprocessor.forward_bars
-    if len(val_df_raw) < min_needed:
-        raise ValueError(f"Validation split too small for lookback={preprocessor.lookback} "
-                         f"and forward_bars={preprocessor.forward_bars} (need >= {min_needed} rows)")
-
-    print(f"  Total: Train rows: {len(train_df_raw)}, Val rows: {len(val_df_raw)}")
+    print("  Step 3/5: Creating features and labels per symbol...")
     sys.stdout.flush()
 
-    # Build sequences per symbol to avoid mixing windows across symbols
-    def build_sequences(split_df: pd.DataFrame, split_name: str):
-        feature_cols_local = preprocessor.get_feature_columns()
-        preprocessor.feature_columns = feature_cols_local  # ensure set for downstream use
-
-        X_list, y_class_list, y_reg_list = [], [], []
-        for symbol, sym_df_raw in split_df.groupby('symbol'):
-            sym_df = preprocessor.create_features(sym_df_raw)
-            sym_df = preprocessor.create_labels(sym_df)
-            try:
-                X_sym, y_class_sym, y_reg_sym = preprocessor.create_sequences(sym_df, feature_cols_local)
-                X_list.append(X_sym)
-                y_class_list.append(y_class_sym)
-                y_reg_list.append(y_reg_sym)
-            except ValueError:
-                # Not enough data for this symbol; skip
-                print(f"    Skipping {symbol} in {split_name} (not enough rows for lookback/forward)")
-                continue
-
-        if not X_list:
-            raise ValueError(f"No sequences could be created for {split_name}. "
-                             f"Need at least one symbol with >= {preprocessor.lookback + preprocessor.forward_bars} rows.")
-
-        return (
-            np.concatenate(X_list, axis=0),
-            np.concatenate(y_class_list, axis=0),
-            np.concatenate(y_reg_list, axis=0)
-        )
+    if distributed and preprocess_workers is None:
+        # Ranks on one host build features at the same time: split the CPUs between them
+        preprocess_workers = max(1, (os.cpu_count() or 1) // get_local_world_size())
+    features, results = build_all_symbol_windows(df, preprocessor, val_split, workers=preprocess_workers)
+
+    train_parts, val_parts = [], []  # (window_ends, y_class, y_reg) per symbol
+    for symbol, result in results:
+        if result is None:
+            print(f"    Skipping {symbol} (not enough rows for lookback/forward)")
+            continue
+        train_parts.append(result['train'])
+        val_parts.append(result['val'])
+        print(f"    {symbol}: {result['split_idx']} train rows, {result['rows'] - result['split_idx']} val rows "
+              f"({len(result['train'][0])} / {len(result['val'][0])} sequences)")
 
-    print("  Step 3/5: Creating features, labels, and sequences (train)...")
-    sys.stdout.flush()
-    X_train_raw, y_class_train, y_reg_train = build_sequences(train_df_raw, "train")
-    print(f"  ✓ Train sequences created: {len(X_train_raw)}")
-    sys.stdout.flush()
-
-    print("  Step 4/5: Creating features, labels, and sequences (val)...")
+    min_needed = preprocessor.lookback + preprocessor.forward_bars
+    if not train_parts:
+        raise ValueError(f"No sequences could be created. "
+                         f"Need at least one symbol with >= {min_needed} rows.")
+
+    def concat_parts(parts, split_name: str):
+        ends, y_class, y_reg = (np.concatenate(p, axis=0) for p in zip(*parts))
+        if len(ends) == 0:
+            raise ValueError(f"No sequences could be created for {split_name} with "
+                             f"lookback={preprocessor.lookback} and forward_bars={preprocessor.forward_bars}.")
+        return ends, y_class, y_reg
+
+    print("  Step 4/5: Splitting sequences chronologically...")
     sys.stdout.flush()
-    X_val_raw, y_class_val, y_reg_val = build_sequences(val_df_raw, "val")
-    print(f"  ✓ Val sequences created: {len(X_val_raw)}")
+    ends_train, y_class_train, y_reg_train = concat_parts(train_parts, "train")
+    ends_val, y_class_val, y_reg_val = concat_parts(val_parts, "val")
+    if balance_ratio is not None:
+        # Drop whole windows, never rows: the kept windows stay contiguous
+        keep = WindowBalancer(y_class_train).select(balance_ratio)
+        print(f"  Balanced train windows to {tuple(round(r, 3) for r in balance_ratio)}: "
+              f"{len(keep)} of {len(ends_train)} kept")
+        ends_train, y_class_train, y_reg_train = ends_train[keep], y_class_train[keep], y_reg_train[keep]
+    print(f"  ✓ Train sequences: {len(ends_train)}, Val sequences: {len(ends_val)}")
     sys.stdout.flush()
 
     print("  Step 5/5: Scaling features...")
     sys.stdout.flush()
+    # Fit scaler on rows covered by training windows only, weighted by window count
+    # (same statistics as fitting on every window), then scale each row once
+    preprocessor.fit_scaler_rows(features, ends_train)
+    features = preprocessor.transform_rows(features)
 
-    print(f"  ✓ Created sequences (train={len(X_train_raw)}, val={len(X_val_raw)})")
+    print(f"  ✓ Created sequences (train={len(ends_train)}, val={len(ends_val)})")
     print(f"    Train label distribution: DOWN={np.sum(y_class_train==0)}, SIDEWAYS={np.sum(y_class_train==1)}, UP={np.sum(y_class_train==2)}")
     print(f"    Val label distribution:   DOWN={np.sum(y_class_val==0)}, SIDEWAYS={np.sum(y_class_val==1)}, UP={np.sum(y_class_val==2)}")
     sys.stdout.flush()
 
-    # Fit scaler on training data only, then transform both splits
-    preprocessor.fit_scaler(X_train_raw)
-    X_train = preprocessor.transform(X_train_raw)
-    X_val = preprocessor.transform(X_val_raw)
-
-    # Create datasets
-    train_dataset = TradingDataset(X_train, y_class_train, y_reg_train)
-    val_dataset = TradingDataset(X_val, y_class_val, y_reg_val)
+    # Create datasets (both splits are views into one shared per-row feature matrix)
+    train_dataset = TradingDataset(features, ends_train, y_class_train, y_reg_train, preprocessor.lookback)
+    val_dataset = TradingDataset(features, ends_val, y_class_val, y_reg_val, preprocessor.lookback)
 
     # Create dataloaders with GPU optimizations
     train_sampler = None
@@ -615,26 +1045,38 @@ def prepare_dataloaders(
         class_weights = np.power(class_weights, 0.3)  # gentle balancing
         class_weights = np.clip(class_weights, 0.7, 1.3)
         sample_weights = class_weights[y_class_train]
-        train_sampler = WeightedRandomSampler(
-            weights=torch.DoubleTensor(sample_weights),
-            num_samples=len(sample_weights),
-            replacement=True
-        )
+        if distributed:
+            # Same weighted draws on every rank, each keeps its own share
+            train_sampler = DistributedWindowSampler(len(sample_weights), weights=torch.DoubleTensor(sample_weights))
+        else:
+            train_sampler = WeightedRandomSampler(
+                weights=torch.DoubleTensor(sample_weights),
+                num_samples=len(sample_weights),
+                replacement=True
+            )
         print(f"  ✓ Using WeightedRandomSampler (soft) to balance classes during training")
+    elif distributed:
+        train_sampler = DistributedWindowSampler(len(ends_train), shuffle=True)
+    val_sampler = DistributedWindowSampler(len(ends_val), shuffle=False, pad=False) if distributed else None
 
-    train_loader = DataLoader(
+    # Whole batches are gathered at once (one index_select per batch instead of
+    # batch_size __getitem__ calls and a collate), prefetched in the background
+    train_loader = create_batch_loader(
         train_dataset,
         batch_size=batch_size,
-        shuffle=(train_sampler is None),
         sampler=train_sampler,
+        shuffle=(train_sampler is None),
         num_workers=num_workers,
+        prefetch=prefetch_batches,
         pin_memory=True  # Faster GPU transfer
     )
-    val_loader = DataLoader(
+    val_loader = create_batch_loader(
         val_dataset,
         batch_size=batch_size,
+        sampler=val_sampler,
         shuffle=False,
         num_workers=num_workers,
+        prefetch=prefetch_batches,
         pin_memory=True
     )
 
@@ -651,14 +1093,25 @@ if __name__ == '__main__':
     import sys
     sys.stdout.flush()  # Ensure output is written immediately
 
+    # Data-parallel on CPU when launched with torchrun (e.g. torchrun --nproc_per_node 8 train.py);
+    # a plain `python train.py` is a single process
+    RANK, WORLD_SIZE = init_distributed(backend='gloo')
+    DISTRIBUTED = WORLD_SIZE > 1
+    if RANK != 0:
+        sys.stdout = open(os.devnull, 'w')  # rank 0 reports for everyone
+
     print("Training LSTM/Transformer Trading Model")
     print("=" * 50)
     sys.stdout.flush()
 
     # Configuration - Optimized for RTX 5090 + 15 vCPUs
     MODEL_TYPE = 'transformer_lstm'  # Full transformer-LSTM model
-    DATA_PATH = '../data/training_data.csv'  # Path relative to trading_model/
+    DATA_PATH = '../data/candles'  # Candle store, path relative to trading_model/
+    INTERVAL = None  # Only needed if the store holds several intervals
     SAVE_DIR = 'checkpoints'
+    PROFILE_STEPS = 0  # > 0: write a torch.profiler trace of the first N steps to checkpoints/profile
+    CPU_PERF_MODE = False  # On CPU-only boxes: bf16 autocast, torch threads sized to the available cores
+    COMPILE_MODEL = False  # torch.compile the step (measure first: benchmarks/cpu_training.py)
     BATCH_SIZE = 256  # Larger batch for RTX 5090
     GRADIENT_ACCUM_STEPS = 1  # No need with 33GB VRAM
     EPOCHS = 200  # More epochs with early stopping
@@ -666,7 +1119,10 @@ if __name__ == '__main__':
     WARMUP_EPOCHS = 5
     MIN_LR = 1e-4
     LOOKBACK = 50  # Start with 50, can increase later
-    NUM_WORKERS = 8  # Use 8 workers to feed GPU faster
+    NUM_WORKERS = 0  # Batches are gathered whole in a background thread; >0 adds worker processes
+    PREPROCESS_WORKERS = None  # Build symbols on all vCPUs
+    QUALITY_REPORT = None  # e.g. '../data/quality.json' to skip symbols with data errors
+    BALANCE_RATIO = None  # e.g. (1/3, 1/3, 1/3) to undersample train windows per class
     LABEL_SMOOTHING = 0.01
 
     print("\n" + "="*60)
@@ -686,7 +1142,12 @@ if __name__ == '__main__':
             max_rows=None,  # Use all 69K rows
             lookback=LOOKBACK,
             num_workers=NUM_WORKERS,
-            use_weighted_sampler=True
+            use_weighted_sampler=True,
+            preprocess_workers=PREPROCESS_WORKERS,
+            interval=INTERVAL,
+            quality_report=QUALITY_REPORT,
+            balance_ratio=BALANCE_RATIO,
+            distributed=DISTRIBUTED
         )
         print("✓ Data loaded successfully!")
     except Exception as e:
@@ -704,7 +1165,8 @@ if __name__ == '__main__':
     from pathlib import Path
     Path(SAVE_DIR).mkdir(exist_ok=True)
 
-    preprocessor.save(f'{SAVE_DIR}/preprocessor.pkl')
+    if RANK == 0:
+        preprocessor.save(f'{SAVE_DIR}/preprocessor.pkl')
     print(f"✓ Saved to {SAVE_DIR}/preprocessor.pkl")
 
     # Create model - Start with moderate size
@@ -747,9 +1209,16 @@ if __name__ == '__main__':
     print("\n" + "="*60)
     print("INITIALIZING TRAINER...")
     print("="*60)
+    cpu_perf = CPU_PERF_MODE and not torch.cuda.is_available()
+    if cpu_perf or DISTRIBUTED:
+        # Processes on one host split its cores
+        threads = configure_cpu_threads(max(1, (os.cpu_count() or 1) // get_local_world_size()) if DISTRIBUTED else None)
+        print(f"CPU threads: {threads['intra_op_threads']} per process on {threads['cores']} cores, "
+              f"native bf16: {cpu_supports_bf16()}")
     try:
         trainer = TradingModelTrainer(
             model=model,
+            device='cpu' if DISTRIBUTED else ('cuda' if torch.cuda.is_available() else 'cpu'),
             learning_rate=LEARNING_RATE,
             gradient_accumulation_steps=GRADIENT_ACCUM_STEPS,
             use_focal_loss=False,
@@ -758,10 +1227,14 @@ if __name__ == '__main__':
             warmup_epochs=WARMUP_EPOCHS,
             min_learning_rate=MIN_LR,
             scheduler_patience=5,
-            scheduler_factor=0.8
+            scheduler_factor=0.8,
+            profile_steps=PROFILE_STEPS,
+            cpu_bf16=cpu_perf,
+            compile_model=COMPILE_MODEL,
+            distributed=DISTRIBUTED
         )
         print(f"✓ Trainer initialized")
-        print(f"  Effective batch size: {BATCH_SIZE * GRADIENT_ACCUM_STEPS}")
+        print(f"  Effective batch size: {BATCH_SIZE * GRADIENT_ACCUM_STEPS * WORLD_SIZE}")
     except Exception as e:
         print(f"✗ FAILED to initialize trainer: {e}")
         import traceback
@@ -788,3 +1261,5 @@ if __name__ == '__main__':
         import traceback
         traceback.print_exc()
         raise
+    finally:
+        cleanup_distributed()
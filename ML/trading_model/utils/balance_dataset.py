@@ -1,196 +1,168 @@
 """
-Balance trading dataset to equal class distribution
-Undersamples majority classes to achieve 1/3-1/3-1/3 split
+Class balancing on the window index
+Undersamples majority classes by choosing which windows to train on, so the
+candles stay contiguous (no window spans a dropped row) and nothing is rewritten
+
+train.py applies it through prepare_dataloaders(balance_ratio=...); this script
+previews the class distribution and the balanced window counts for a dataset.
 """
 
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from typing import Sequence
 import argparse
+import sys
+import time
 
+sys.path.append(str(Path(__file__).parent.parent))
 
-def balance_dataset(
-    input_csv: str,
-    output_csv: str,
-    target_ratio: tuple = (1/3, 1/3, 1/3),
-    threshold: float = 0.002,
-    forward_bars: int = 5,
-    random_seed: int = 42
-):
-    """
-    Balance dataset by undersampling majority classes
-
-    Args:
-        input_csv: Path to unbalanced CSV with OHLCV data
-        output_csv: Path to save balanced CSV
-        target_ratio: Desired ratio for (DOWN, SIDEWAYS, UP)
-        threshold: Price change threshold for classification
-        forward_bars: Number of bars ahead for prediction
-        random_seed: Random seed for reproducibility
-
-    Returns:
-        DataFrame with balanced classes
-    """
-    np.random.seed(random_seed)
-
-    print("="*60)
-    print("DATASET BALANCING")
-    print("="*60)
-
-    # Load data
-    print(f"\n1. Loading data from {input_csv}")
-    df = pd.read_csv(input_csv)
-    print(f"   Loaded {len(df)} rows")
-
-    # Calculate forward returns
-    print(f"\n2. Calculating forward returns (threshold={threshold*100:.2f}%)")
-    df = df.sort_values(['symbol', 'timestamp'])
-    df['forward_return'] = df.groupby('symbol')['close'].transform(
-        lambda x: (x.shift(-forward_bars) / x) - 1
-    )
+from utils.candle_store import load_candles, resolve_interval
 
-    # Create labels
-    df['label'] = 'SIDEWAYS'
-    df.loc[df['forward_return'] > threshold, 'label'] = 'UP'
-    df.loc[df['forward_return'] < -threshold, 'label'] = 'DOWN'
+CLASS_NAMES = ['DOWN', 'SIDEWAYS', 'UP']
 
-    # Remove rows without forward return (last N bars)
-    df = df.dropna(subset=['forward_return'])
 
-    # Show original distribution
-    print(f"\n3. Original class distribution:")
-    class_counts = df['label'].value_counts()
-    total = len(df)
-    for label in ['DOWN', 'SIDEWAYS', 'UP']:
-        count = class_counts.get(label, 0)
-        pct = (count / total) * 100
-        print(f"   {label:10s}: {count:7,} ({pct:5.2f}%)")
+class WindowBalancer:
+    """
+    Class-balanced subsets of a window index
 
-    # Find minority class size
-    min_class_size = class_counts.min()
+    Window positions are shuffled once and grouped by class (a random
+    permutation followed by a stable radix sort on the label), so a subset for
+    any ratio is a prefix of each class group: rebalancing is a slice plus a
+    boolean mask, no resampling of the data.
 
-    # Calculate target sizes based on desired ratio
-    total_target = min_class_size * 3  # Ensure we can achieve 1/3-1/3-1/3
-    target_down = int(total_target * target_ratio[0])
-    target_sideways = int(total_target * target_ratio[1])
-    target_up = int(total_target * target_ratio[2])
+    Usage:
+        balancer = WindowBalancer(y_class_train)
+        keep = balancer.select((1/3, 1/3, 1/3))
+        ends_train, y_class_train = ends_train[keep], y_class_train[keep]
+    """
 
-    print(f"\n4. Target sizes for balanced dataset:")
-    print(f"   DOWN:     {target_down:7,}")
-    print(f"   SIDEWAYS: {target_sideways:7,}")
-    print(f"   UP:       {target_up:7,}")
-    print(f"   Total:    {total_target:7,}")
+    def __init__(self, y_class: np.ndarray, n_classes: int = 3, random_seed: int = 42):
+        """
+        Args:
+            y_class: Class label per window (0..n_classes-1)
+            n_classes: Number of classes
+            random_seed: Seed of the shuffle that decides which windows are kept
+        """
+        y_class = np.asarray(y_class)
+        self.n_windows = len(y_class)
+        self.counts = np.bincount(y_class, minlength=n_classes)
+        self.bounds = np.r_[0, np.cumsum(self.counts)]
 
-    # Sample from each class - PRESERVE TIME ORDER
-    print(f"\n5. Sampling from each class (preserving time order)...")
+        order = np.random.default_rng(random_seed).permutation(self.n_windows)
+        self.order = order[np.argsort(y_class[order].astype(np.int8), kind='stable')]
 
-    # Get indices for each class
-    down_indices = df[df['label'] == 'DOWN'].index.tolist()
-    sideways_indices = df[df['label'] == 'SIDEWAYS'].index.tolist()
-    up_indices = df[df['label'] == 'UP'].index.tolist()
+    def targets(self, target_ratio: Sequence[float]) -> np.ndarray:
+        """
+        Windows kept per class: the largest subset with the given ratio
 
-    # Randomly sample indices
-    np.random.shuffle(down_indices)
-    np.random.shuffle(sideways_indices)
-    np.random.shuffle(up_indices)
+        Args:
+            target_ratio: Desired share per class, e.g. (DOWN, SIDEWAYS, UP); normalized
 
-    selected_down = down_indices[:min(target_down, len(down_indices))]
-    selected_sideways = sideways_indices[:min(target_sideways, len(sideways_indices))]
-    selected_up = up_indices[:min(target_up, len(up_indices))]
+        Returns:
+            Array of window counts per class
+        """
+        ratio = np.asarray(target_ratio, dtype=np.float64)
+        if len(ratio) != len(self.counts) or np.any(ratio < 0) or ratio.sum() <= 0:
+            raise ValueError(f"target_ratio needs {len(self.counts)} non-negative shares, got {tuple(target_ratio)}")
+        ratio = ratio / ratio.sum()
 
-    # Combine indices and sort to preserve time order
-    all_selected_indices = selected_down + selected_sideways + selected_up
-    all_selected_indices.sort()
+        wanted = ratio > 0
+        total = np.min(self.counts[wanted] / ratio[wanted])
+        return np.minimum(np.floor(ratio * total + 1e-9).astype(np.int64), self.counts)
 
-    # Select rows maintaining time order
-    balanced_df = df.loc[all_selected_indices].reset_index(drop=True)
+    def select(self, target_ratio: Sequence[float] = (1/3, 1/3, 1/3)) -> np.ndarray:
+        """
+        Positions of the windows to keep, in ascending (chronological) order
 
-    print(f"   ✓ Selected {len(balanced_df)} candles in chronological order")
+        Args:
+            target_ratio: Desired share per class
 
-    # Remove the temporary label columns (training script will recalculate)
-    balanced_df = balanced_df.drop(columns=['forward_return', 'label'])
+        Returns:
+            int64 array of indexes into the y_class passed at construction
+        """
+        mask = np.zeros(self.n_windows, dtype=bool)
+        for start, count in zip(self.bounds[:-1], self.targets(target_ratio)):
+            mask[self.order[start:start + count]] = True
+        return np.flatnonzero(mask)
 
-    # Show final distribution
-    print(f"\n6. Saving balanced dataset to {output_csv}")
 
-    # Save
-    output_path = Path(output_csv)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    balanced_df.to_csv(output_csv, index=False)
+def window_labels(
+    df: pd.DataFrame,
+    lookback: int = 50,
+    forward_bars: int = 5,
+    threshold: float = 0.002
+) -> np.ndarray:
+    """
+    Class label of every window train.py builds, computed on close prices only
 
-    print(f"\n   ✓ Saved {len(balanced_df)} rows")
-    print(f"   Symbols: {balanced_df['symbol'].nunique()}")
-    if 'timestamp' in balanced_df.columns:
-        dates = pd.to_datetime(balanced_df['timestamp'], unit='s')
-        print(f"   Date range: {dates.min()} to {dates.max()}")
+    Args:
+        df: Candles with symbol and close, sorted by symbol and timestamp (store order)
+        lookback: Window length
+        forward_bars: Bars ahead of the forward return
+        threshold: Price change threshold for UP / DOWN
 
-    print("\n" + "="*60)
-    print("BALANCING COMPLETE!")
-    print("="*60)
-    print(f"\nNext step: Train with balanced data")
-    print(f"  cd trading_model")
-    print(f"  python train.py")
+    Returns:
+        int64 labels (0 = DOWN, 1 = SIDEWAYS, 2 = UP), one per window end row
+    """
+    codes, _ = pd.factorize(df['symbol'])
+    close = df['close'].to_numpy(np.float64)
+    starts = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+    sizes = np.diff(np.r_[starts, len(codes)])
+    position = np.arange(len(codes)) - np.repeat(starts, sizes)
+    # Same window ends as create_window_index: lookback <= position < rows - forward_bars
+    ends = np.flatnonzero((position >= lookback) & (position < np.repeat(sizes, sizes) - forward_bars))
 
-    return balanced_df
+    forward_return = close[ends + forward_bars] / close[ends] - 1
+    labels = np.ones(len(ends), dtype=np.int64)
+    labels[forward_return > threshold] = 2
+    labels[forward_return < -threshold] = 0
+    return labels
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Balance trading dataset to equal class distribution',
+        description='Preview window-level class balancing of a dataset',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Example:
-  # Balance the dataset to 1/3-1/3-1/3
-  python balance_dataset.py \\
-    --input data/training_data.csv \\
-    --output data/training_data_balanced.csv
-        """
-    )
-
-    parser.add_argument(
-        '--input',
-        type=str,
-        required=True,
-        help='Input CSV path (unbalanced data)'
-    )
+  python balance_dataset.py --input data/candles --interval 30m --ratio 0.3 0.4 0.3
 
-    parser.add_argument(
-        '--output',
-        type=str,
-        required=True,
-        help='Output CSV path (balanced data)'
-    )
-
-    parser.add_argument(
-        '--threshold',
-        type=float,
-        default=0.002,
-        help='Price change threshold (default: 0.002 = 0.2%%)'
-    )
-
-    parser.add_argument(
-        '--forward-bars',
-        type=int,
-        default=5,
-        help='Number of bars ahead for prediction (default: 5)'
-    )
-
-    parser.add_argument(
-        '--seed',
-        type=int,
-        default=42,
-        help='Random seed for reproducibility (default: 42)'
+Balancing is applied at training time: set BALANCE_RATIO in train.py.
+        """
     )
-
+    parser.add_argument('--input', type=str, required=True, help='Candle store directory or .csv path')
+    parser.add_argument('--interval', type=str, default=None,
+                        help='Candle interval (required if the store holds several)')
+    parser.add_argument('--ratio', type=float, nargs=3, default=[1/3, 1/3, 1/3],
+                        metavar=('DOWN', 'SIDEWAYS', 'UP'), help='Target class shares (default: equal)')
+    parser.add_argument('--threshold', type=float, default=0.002,
+                        help='Price change threshold (default: 0.002 = 0.2%%)')
+    parser.add_argument('--forward-bars', type=int, default=5,
+                        help='Number of bars ahead for prediction (default: 5)')
+    parser.add_argument('--lookback', type=int, default=50, help='Window length (default: 50)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducibility (default: 42)')
     args = parser.parse_args()
 
-    balance_dataset(
-        input_csv=args.input,
-        output_csv=args.output,
-        threshold=args.threshold,
-        forward_bars=args.forward_bars,
-        random_seed=args.seed
-    )
+    print(f"Loading {args.input}")
+    interval = resolve_interval(args.input, args.interval)
+    df = load_candles(args.input, interval=interval, columns=['close'])
+    labels = window_labels(df, args.lookback, args.forward_bars, args.threshold)
+    print(f"  {len(df):,} rows, {len(labels):,} windows")
+
+    started = time.perf_counter()
+    balancer = WindowBalancer(labels, random_seed=args.seed)
+    indexed = time.perf_counter()
+    keep = balancer.select(args.ratio)
+    selected = time.perf_counter()
+
+    kept = np.bincount(labels[keep], minlength=3)
+    print(f"\n{'CLASS':<10}{'WINDOWS':>12}{'SHARE':>8}{'KEPT':>12}{'SHARE':>8}")
+    for c, name in enumerate(CLASS_NAMES):
+        print(f"{name:<10}{balancer.counts[c]:>12,}{balancer.counts[c] / max(len(labels), 1):>8.1%}"
+              f"{kept[c]:>12,}{kept[c] / max(len(keep), 1):>8.1%}")
+    print(f"{'Total':<10}{len(labels):>12,}{'':>8}{len(keep):>12,}")
+    print(f"\nIndex built in {(indexed - started) * 1000:.0f} ms, selection in {(selected - indexed) * 1000:.1f} ms")
 
 
 if __name__ == '__main__':
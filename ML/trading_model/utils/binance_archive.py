@@ -0,0 +1,136 @@
+"""
+Reader for Binance bulk kline archives (data.binance.vision)
+Finds monthly / daily kline zip files in a local directory and decodes them
+in a process pool
+
+Files are named like the downloads, in any directory layout:
+    BTCUSDT-1m-2023-01.zip      (monthly)
+    BTCUSDT-1m-2024-02-15.zip   (daily)
+Each holds one CSV: open_time, open, high, low, close, volume, close_time, ...
+(no header in spot files; open_time in microseconds from 2025 on).
+"""
+
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import io
+import os
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+ARCHIVE_PATTERN = re.compile(r'^(?P<symbol>[A-Z0-9]+)-(?P<interval>\d+[smhdwM])-(?P<period>\d{4}-\d{2}(?:-\d{2})?)\.zip$')
+ARCHIVE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+def find_archives(
+    root: str,
+    interval: Optional[str] = None,
+    symbols: Optional[List[str]] = None
+) -> Dict[Tuple[str, str], List[Path]]:
+    """
+    Kline archives below root, grouped by (symbol, interval)
+
+    Args:
+        root: Directory searched recursively
+        interval: Only this interval (None = all)
+        symbols: Only these symbols (None = all)
+
+    Returns:
+        Dict (symbol, interval) -> archive paths sorted by period
+    """
+    found = defaultdict(list)
+    for path in Path(root).rglob('*.zip'):
+        match = ARCHIVE_PATTERN.match(path.name)
+        if match is None:
+            continue
+        if interval is not None and match['interval'] != interval:
+            continue
+        if symbols is not None and match['symbol'] not in symbols:
+            continue
+        found[(match['symbol'], match['interval'])].append((match['period'], path))
+    return {key: [path for _, path in sorted(paths)] for key, paths in sorted(found.items())}
+
+
+def read_archive(path: str) -> np.ndarray:
+    """
+    Decode one kline zip
+
+    Returns:
+        float64 array (rows, 6): open time in seconds, open, high, low, close, volume
+    """
+    with zipfile.ZipFile(path) as archive:
+        name = next(n for n in archive.namelist() if n.lower().endswith('.csv'))
+        data = archive.read(name)
+
+    header = 0 if data[:1].isalpha() else None  # futures files have a header row
+    values = pd.read_csv(io.BytesIO(data), header=header, usecols=range(6),
+                         dtype=np.float64, engine='c').to_numpy()
+
+    # Open times are milliseconds, microseconds in files from 2025 on
+    scale = np.where(values[:, 0] >= 1e14, 1e6, 1e3)
+    values[:, 0] = values[:, 0] / scale
+    return values
+
+
+def merge_archives(parts: List[np.ndarray]) -> np.ndarray:
+    """Concatenate decoded archives, sorted by open time, overlaps removed (later files win)"""
+    values = np.concatenate(parts) if parts else np.empty((0, len(ARCHIVE_COLUMNS)))
+    # Stable sort keeps file order among equal timestamps; keep the last of each run
+    values = values[np.argsort(values[:, 0], kind='stable')]
+    last = np.r_[values[1:, 0] != values[:-1, 0], True] if len(values) else np.empty(0, dtype=bool)
+    return values[last]
+
+
+def iter_archive_symbols(
+    archives: Dict[Tuple[str, str], List[Path]],
+    workers: Optional[int] = None,
+    on_file: Optional[Callable[[Path], None]] = None
+) -> Iterator[Tuple[str, str, pd.DataFrame]]:
+    """
+    Decode archives in a process pool and yield each symbol as soon as all its files are read
+
+    Files are submitted symbol by symbol through a bounded window, so finished
+    symbols are handed over early and only the symbols in flight are held in
+    memory.
+
+    Args:
+        archives: Output of find_archives
+        workers: Worker processes (default: CPU count)
+        on_file: Callback per decoded file (progress)
+
+    Yields:
+        (symbol, interval, DataFrame with symbol + ARCHIVE_COLUMNS, sorted, deduplicated)
+    """
+    workers = workers or os.cpu_count() or 1
+    files = [(key, index, path) for key, paths in archives.items() for index, path in enumerate(paths)]
+    pending = {key: len(paths) for key, paths in archives.items()}
+    parts = defaultdict(dict)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+        next_file = 0
+        while next_file < len(files) or in_flight:
+            # Keep a bounded window of files submitted, in symbol order
+            while next_file < len(files) and len(in_flight) < workers * 4:
+                key, index, path = files[next_file]
+                in_flight[executor.submit(read_archive, str(path))] = (key, index, path)
+                next_file += 1
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, index, path = in_flight.pop(future)
+                parts[key][index] = future.result()
+                if on_file is not None:
+                    on_file(path)
+
+                pending[key] -= 1
+                if pending[key] == 0:
+                    symbol_parts = parts.pop(key)
+                    values = merge_archives([symbol_parts[i] for i in sorted(symbol_parts)])
+                    df = pd.DataFrame(values, columns=ARCHIVE_COLUMNS)
+                    df.insert(0, 'symbol', key[0])
+                    yield key[0], key[1], df
@@ -0,0 +1,287 @@
+"""
+Columnar on-disk candle store
+Symbol/interval partitioned Parquet files shared by the collector, the balancer and the trainer
+
+Layout:
+    <root>/symbol=BTCUSDC/interval=30m/candles.parquet
+
+Candle columns are stored as float32 (timestamps as float64 seconds, float32
+cannot hold epoch seconds exactly). Reads support column projection and
+timestamp-range filters, so only the needed bytes are decoded.
+"""
+
+from pathlib import Path
+from typing import Iterable, List, Optional
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .feature_kernel import RAW_COLUMNS
+
+PARTITION_FILE = 'candles.parquet'
+PARTITIONING = ds.partitioning(pa.schema([('symbol', pa.string()), ('interval', pa.string())]), flavor='hive')
+
+
+class CandleStore:
+    """
+    Parquet candle store partitioned by symbol and interval
+
+    Writes merge into the existing partition (rows are deduplicated on
+    timestamp, newest write wins) and replace the file atomically.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Store directory (created on first write)
+        """
+        self.root = Path(root)
+
+    def partition_path(self, symbol: str, interval: str) -> Path:
+        return self.root / f'symbol={symbol}' / f'interval={interval}' / PARTITION_FILE
+
+    def write(self, df: pd.DataFrame, interval: str, replace: bool = False) -> int:
+        """
+        Merge candles into the store
+
+        Args:
+            df: Candles with a symbol and timestamp column (seconds) plus candle columns
+            interval: Candle interval, e.g. '30m'
+            replace: Overwrite the written symbols' partitions instead of merging
+
+        Returns:
+            Number of rows written (after merging)
+        """
+        written = 0
+        for symbol, symbol_df in df.groupby('symbol', sort=False):
+            path = self.partition_path(symbol, interval)
+            symbol_df = symbol_df.drop(columns=[c for c in ('symbol', 'interval') if c in symbol_df.columns])
+
+            if path.exists() and not replace:
+                existing = pq.ParquetFile(path).read().to_pandas()
+                symbol_df = pd.concat([existing, symbol_df], ignore_index=True)
+
+            symbol_df = (symbol_df.drop_duplicates('timestamp', keep='last')
+                         .sort_values('timestamp')
+                         .reset_index(drop=True))
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            pq.write_table(pa.Table.from_pandas(_to_storage_types(symbol_df), preserve_index=False), tmp_path)
+            os.replace(tmp_path, path)
+            written += len(symbol_df)
+
+        return written
+
+    def write_chunks(self, symbol: str, interval: str, chunks: Iterable[pd.DataFrame]) -> int:
+        """
+        Stream one symbol's candles into its partition chunk by chunk
+
+        Chunks are appended as row groups to a temporary file, so only one chunk
+        is held in memory. If the partition already exists or the timestamps are
+        not strictly increasing across chunks, the file is merged through write()
+        at the end, which loads this symbol's rows once.
+
+        Returns:
+            Number of rows stored for the symbol
+        """
+        path = self.partition_path(symbol, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.stream.tmp')
+
+        writer = None
+        ordered, last = True, -np.inf
+        try:
+            for chunk in chunks:
+                if len(chunk) == 0:
+                    continue
+                timestamps = chunk['timestamp'].to_numpy(np.float64)
+                ordered = ordered and timestamps[0] > last and bool(np.all(np.diff(timestamps) > 0))
+                last = timestamps[-1]
+
+                chunk = chunk.drop(columns=[c for c in ('symbol', 'interval') if c in chunk.columns])
+                table = pa.Table.from_pandas(_to_storage_types(chunk), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        if writer is None:
+            return 0
+        writer.close()
+
+        if ordered and not path.exists():
+            os.replace(tmp_path, path)
+            return pq.ParquetFile(path).metadata.num_rows
+
+        df = pq.ParquetFile(tmp_path).read().to_pandas()
+        df['symbol'] = symbol
+        tmp_path.unlink()
+        return self.write(df, interval)
+
+    def read(
+        self,
+        symbols: Optional[List[str]] = None,
+        interval: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Read candles sorted by symbol and timestamp
+
+        Args:
+            symbols: Symbols to read (None = all)
+            interval: Interval to read (None = all)
+            columns: Columns to decode (None = all); symbol and timestamp are always included
+            start: Inclusive start timestamp in seconds
+            end: Exclusive end timestamp in seconds
+
+        Returns:
+            DataFrame with a symbol column (and interval, when not filtered on one)
+        """
+        parts = self.partitions()
+        if symbols is not None:
+            parts = parts[parts['symbol'].isin(list(symbols))]
+        if interval is not None:
+            parts = parts[parts['interval'] == interval]
+        if parts.empty:
+            return pd.DataFrame(columns=['symbol', 'timestamp'] + (columns or RAW_COLUMNS))
+
+        # Files are listed in (symbol, interval) order and each is sorted by
+        # timestamp, so the scan comes out ordered without a sort
+        paths = [str(self.partition_path(row.symbol, row.interval)) for row in parts.itertuples()]
+        dataset = ds.dataset(paths, format='parquet', partitioning=PARTITIONING, partition_base_dir=str(self.root))
+
+        condition = None
+        if start is not None:
+            condition = ds.field('timestamp') >= start
+        if end is not None:
+            upper = ds.field('timestamp') < end
+            condition = upper if condition is None else condition & upper
+
+        if columns is None:
+            columns = [name for name in dataset.schema.names if name not in ('symbol', 'interval')]
+        projection = ['symbol'] + ([] if interval is not None else ['interval'])
+        projection += ['timestamp'] + [c for c in columns if c not in ('symbol', 'interval', 'timestamp')]
+
+        return dataset.to_table(columns=projection, filter=condition).to_pandas()
+
+    def timestamps(self, symbol: str, interval: str) -> np.ndarray:
+        """Stored timestamps (seconds, sorted) of one partition; empty if none"""
+        path = self.partition_path(symbol, interval)
+        if not path.exists():
+            return np.empty(0, dtype=np.float64)
+        return pq.ParquetFile(path).read(columns=['timestamp']).column('timestamp').to_numpy()
+
+    def partitions(self) -> pd.DataFrame:
+        """Stored (symbol, interval) pairs with their row counts"""
+        rows = []
+        for path in sorted(self.root.glob(f'symbol=*/interval=*/{PARTITION_FILE}')):
+            rows.append({
+                'symbol': path.parent.parent.name.split('=', 1)[1],
+                'interval': path.parent.name.split('=', 1)[1],
+                'rows': pq.ParquetFile(path).metadata.num_rows
+            })
+        return pd.DataFrame(rows, columns=['symbol', 'interval', 'rows'])
+
+    def symbols(self, interval: Optional[str] = None) -> List[str]:
+        parts = self.partitions()
+        if interval is not None:
+            parts = parts[parts['interval'] == interval]
+        return sorted(parts['symbol'].unique())
+
+    def intervals(self) -> List[str]:
+        return sorted(self.partitions()['interval'].unique())
+
+
+def _to_storage_types(df: pd.DataFrame) -> pd.DataFrame:
+    """float64 timestamps, float32 for every other numeric column"""
+    df = df.copy()
+    df['timestamp'] = df['timestamp'].astype(np.float64)
+    for column in df.columns:
+        if column != 'timestamp' and pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = df[column].astype(np.float32)
+    return df
+
+
+def is_csv_path(path: str) -> bool:
+    return str(path).lower().endswith('.csv')
+
+
+def resolve_interval(path: str, interval: Optional[str] = None) -> Optional[str]:
+    """
+    The interval to read from a store: the given one, or the only one stored
+
+    Returns None for CSV files and empty stores; raises ValueError if the store
+    holds several intervals and none was given.
+    """
+    if interval is not None or is_csv_path(path):
+        return interval
+    intervals = CandleStore(path).intervals()
+    if len(intervals) > 1:
+        raise ValueError(f"Store {path} holds several intervals {intervals}; pass interval")
+    return intervals[0] if intervals else None
+
+
+def load_candles(
+    path: str,
+    interval: Optional[str] = None,
+    symbols: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Load candles from a store directory (or a legacy CSV file)
+
+    Args:
+        path: Store directory or .csv file
+        interval: Interval to read; required when the store holds several
+        symbols, columns, start, end: See CandleStore.read
+
+    Returns:
+        DataFrame sorted by symbol and timestamp
+    """
+    if is_csv_path(path):
+        usecols = None if columns is None else (lambda c: c in {'symbol', 'timestamp', *columns})
+        df = pd.read_csv(path, usecols=usecols)
+        if symbols is not None:
+            df = df[df['symbol'].isin(symbols)]
+        if start is not None:
+            df = df[df['timestamp'] >= start]
+        if end is not None:
+            df = df[df['timestamp'] < end]
+        return df.reset_index(drop=True)
+
+    interval = resolve_interval(path, interval)
+    df = CandleStore(path).read(symbols=symbols, interval=interval, columns=columns, start=start, end=end)
+    return df.drop(columns=['interval'], errors='ignore')
+
+
+def save_candles(df: pd.DataFrame, path: str, interval: str, replace: bool = False) -> int:
+    """
+    Save candles to a store directory or a legacy CSV file (always overwritten)
+
+    Args:
+        df: Candles with symbol and timestamp columns
+        path: Store directory or .csv file
+        interval: Candle interval of df
+        replace: Overwrite the symbols' partitions instead of merging
+
+    Returns:
+        Number of rows stored for the written symbols
+    """
+    if is_csv_path(path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path, index=False)
+        return len(df)
+    return CandleStore(path).write(df, interval, replace=replace)
@@ -3,19 +3,37 @@ Data collection script to export candle data from C# application
 This script can be called from C# or run standalone to collect historical data
 """
 
+import numpy as np
 import pandas as pd
-import requests
 from typing import List, Dict, Optional
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 import argparse
+import asyncio
+import itertools
+import sys
 import time
 
+sys.path.append(str(Path(__file__).parent.parent))
 
-def collect_from_json_file(json_path: str, output_path: str = None):
+from utils.binance_archive import find_archives, iter_archive_symbols
+from utils.candle_store import CandleStore, is_csv_path, load_candles, save_candles
+from utils.collect_plan import CollectState, plan_missing_ranges
+from utils.indicators import INDICATOR_COLUMNS, compute_indicators
+from utils.json_export import iter_export_chunks
+from utils.kline_fetcher import BINANCE_API, fetch_klines, interval_to_ms, page_ranges
+from utils.resample import OHLCV_COLUMNS, resample_candles
+from utils.sqlite_candles import SqliteCandleReader
+
+
+def collect_from_json_file(json_path: str, output_path: str = None, interval: str = '30m',
+                           chunk_rows: int = 50_000):
     """
-    Convert JSON candle data exported from C# to CSV for training
+    Convert JSON candle data exported from C# into the candle store for training
+
+    The file is streamed (see utils/json_export.py): candles are parsed into
+    columnar chunks of chunk_rows and written per symbol, so memory use does not
+    grow with the size of the export.
 
     Expected JSON format:
     [
@@ -36,56 +54,41 @@ def collect_from_json_file(json_path: str, output_path: str = None):
 
     Args:
         json_path: Path to JSON file
-        output_path: Output CSV path (default: data/training_data.csv)
+        output_path: Candle store directory or legacy .csv path (default: data/candles)
+        interval: Candle interval of the export (store partition)
+        chunk_rows: Candles parsed and written per chunk
+
+    Returns:
+        DataFrame with symbol and timestamp of the imported symbols' stored candles
     """
     if output_path is None:
-        output_path = "data/training_data.csv"
-
-    # Load JSON
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-
-    all_candles = []
-
-    # Process each symbol
-    for symbol_data in data:
-        symbol = symbol_data.get('symbol', 'UNKNOWN')
-        candles = symbol_data.get('candles', [])
-
-        for candle in candles:
-            # Normalize field names (handle both Python and C# naming conventions)
-            normalized = {
-                'symbol': symbol,
-                'timestamp': candle.get('T', candle.get('t', datetime.now().timestamp())),
-                'open': candle.get('o', candle.get('open', 0)),
-                'high': candle.get('h', candle.get('high', 0)),
-                'low': candle.get('l', candle.get('low', 0)),
-                'close': candle.get('c', candle.get('close', 0)),
-                'volume': candle.get('v', candle.get('volume', 0)),
-                'rsi': candle.get('Rsi', candle.get('rsi', 50)),
-                'macd': candle.get('Macd', candle.get('macd', 0)),
-                'macd_signal': candle.get('MacdSign', candle.get('macd_signal', 0)),
-                'macd_hist': candle.get('MacdHist', candle.get('macd_hist', 0)),
-                'ema50': candle.get('Ema', candle.get('ema50', candle.get('close', 0))),
-                'stoch_k': candle.get('StochSlowK', candle.get('stoch_k', 50)),
-                'stoch_d': candle.get('StochSlowD', candle.get('stoch_d', 50))
-            }
-            all_candles.append(normalized)
-
-    # Convert to DataFrame
-    df = pd.DataFrame(all_candles)
-
-    # Sort by symbol and timestamp
-    df = df.sort_values(['symbol', 'timestamp'])
-
-    # Save to CSV
-    output_dir = Path(output_path).parent
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    df.to_csv(output_path, index=False)
+        output_path = "data/candles"
+
+    # The export is parsed incrementally; chunks of a symbol go straight to storage
+    chunks = iter_export_chunks(json_path, chunk_rows)
+    symbols = []
+
+    if is_csv_path(output_path):
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        header = True
+        for symbol, chunk in chunks:
+            chunk.to_csv(output_path, mode='w' if header else 'a', header=header, index=False)
+            header = False
+            if not symbols or symbols[-1] != symbol:
+                symbols.append(symbol)
+        df = load_candles(output_path, columns=['timestamp'])
+    else:
+        store = CandleStore(output_path)
+        for symbol, symbol_chunks in itertools.groupby(chunks, key=lambda item: item[0]):
+            rows = store.write_chunks(symbol, interval, (chunk for _, chunk in symbol_chunks))
+            symbols.append(symbol)
+            print(f"  ✓ {symbol}: {rows} candles stored")
+        df = store.read(symbols=symbols, interval=interval, columns=['timestamp'])
+
     print(f"Saved {len(df)} candles to {output_path}")
     print(f"Symbols: {df['symbol'].nunique()}")
-    print(f"Date range: {pd.to_datetime(df['timestamp'], unit='s').min()} to {pd.to_datetime(df['timestamp'], unit='s').max()}")
+    if len(df) > 0:
+        print(f"Date range: {pd.to_datetime(df['timestamp'], unit='s').min()} to {pd.to_datetime(df['timestamp'], unit='s').max()}")
 
     return df
 
@@ -95,11 +98,16 @@ def collect_from_binance_api(
     interval: str = '30m',
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    months: Optional[int] = None
+    months: Optional[int] = None,
+    output_path: Optional[str] = None,
+    base_url: str = BINANCE_API,
+    incremental: bool = True
 ):
     """
     Collect historical data directly from Binance API with automatic batching
-    Handles Binance's 1000 candle limit by making multiple requests
+    Handles Binance's 1000 candle limit by fetching pages of all symbols concurrently.
+    When writing to a candle store, only candles missing from the store are fetched
+    (see collect_incremental).
 
     Args:
         symbols: List of trading pairs (e.g., ['BTCUSDT', 'ETHUSDT'])
@@ -107,9 +115,13 @@ def collect_from_binance_api(
         start_date: Start date in YYYY-MM-DD format (optional)
         end_date: End date in YYYY-MM-DD format (optional)
         months: Number of months of data to fetch (alternative to dates)
+        output_path: Candle store to write each symbol to as soon as it is complete (optional)
+        base_url: Binance API root (e.g. a local stub server)
+        incremental: Fetch only what the store at output_path is missing (False = refetch everything)
 
     Returns:
-        DataFrame with OHLCV data and calculated indicators
+        DataFrame with OHLCV data and calculated indicators (symbol and timestamp only
+        for incremental collection)
     """
     # Calculate date range
     if start_date and end_date:
@@ -120,243 +132,342 @@ def collect_from_binance_api(
         start_time = int((datetime.now() - timedelta(days=months * 30)).timestamp() * 1000)
     else:
         # Default: fetch last 1000 candles
-        return collect_from_binance_simple(symbols, interval, 1000)
+        if incremental and output_path and not is_csv_path(output_path):
+            end_time = int(datetime.now().timestamp() * 1000)
+            start_time = end_time - 1000 * interval_to_ms(interval)
+            return collect_incremental(symbols, interval, start_time, end_time, output_path, base_url)
+        return collect_from_binance_simple(symbols, interval, 1000, output_path, base_url)
+
+    if incremental and output_path and not is_csv_path(output_path):
+        return collect_incremental(symbols, interval, start_time, end_time, output_path, base_url)
 
     print(f"Fetching data from {datetime.fromtimestamp(start_time/1000)} to {datetime.fromtimestamp(end_time/1000)}")
     print(f"Interval: {interval}")
 
-    all_data = []
-
-    for symbol in symbols:
-        print(f"\n{'='*60}")
-        print(f"Fetching {symbol}...")
-        print(f"{'='*60}")
-
-        symbol_data = fetch_symbol_with_batching(
-            symbol=symbol,
-            interval=interval,
-            start_time=start_time,
-            end_time=end_time
-        )
+    return _fetch_and_store(symbols, interval, start_time, end_time, output_path, base_url)
 
-        all_data.extend(symbol_data)
 
-    # Convert to DataFrame
-    df = pd.DataFrame(all_data)
-
-    if len(df) == 0:
-        print("No data fetched!")
-        return df
-
-    # Sort by symbol and timestamp
-    df = df.sort_values(['symbol', 'timestamp'])
-
-    # Calculate indicators
-    print("\n" + "="*60)
-    print("Calculating technical indicators...")
-    print("="*60)
-    df = calculate_indicators(df)
-
-    return df
-
-
-def collect_from_binance_simple(symbols: List[str], interval: str = '30m', limit: int = 1000):
+def collect_from_binance_simple(
+    symbols: List[str],
+    interval: str = '30m',
+    limit: int = 1000,
+    output_path: Optional[str] = None,
+    base_url: str = BINANCE_API
+):
     """
     Simple collection without date ranges (backward compatibility)
 
     Args:
         symbols: List of trading pairs
         interval: Candle interval
-        limit: Number of candles to fetch (max 1000)
+        limit: Number of most recent candles to fetch
+        output_path: Candle store to write to (optional)
+        base_url: Binance API root
     """
-    all_data = []
+    end_time = int(datetime.now().timestamp() * 1000)
+    start_time = end_time - limit * interval_to_ms(interval)
+    return _fetch_and_store(symbols, interval, start_time, end_time, output_path, base_url)
 
-    for symbol in symbols:
-        print(f"Fetching {symbol}...")
-
-        try:
-            url = "https://api.binance.com/api/v3/klines"
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'limit': limit
-            }
-
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-
-            klines = response.json()
-
-            for kline in klines:
-                candle = {
-                    'symbol': symbol,
-                    'timestamp': kline[0] / 1000,
-                    'open': float(kline[1]),
-                    'high': float(kline[2]),
-                    'low': float(kline[3]),
-                    'close': float(kline[4]),
-                    'volume': float(kline[5]),
-                    'rsi': 50,
-                    'macd': 0,
-                    'macd_signal': 0,
-                    'macd_hist': 0,
-                    'ema50': float(kline[4]),
-                    'stoch_k': 50,
-                    'stoch_d': 50
-                }
-                all_data.append(candle)
-
-            print(f"  Fetched {len(klines)} candles")
-
-        except Exception as e:
-            print(f"  Error fetching {symbol}: {e}")
-
-    df = pd.DataFrame(all_data)
-    print("\nCalculating indicators...")
-    df = calculate_indicators(df)
 
+def _fetch_and_store(
+    symbols: List[str],
+    interval: str,
+    start_time: int,
+    end_time: int,
+    output_path: Optional[str],
+    base_url: str
+) -> pd.DataFrame:
+    """
+    Fetch all symbols concurrently; indicators and storage run per symbol as it completes
+
+    Only closed candles are fetched (end_time is rounded down to the interval).
+    A legacy CSV output is written once with all symbols, since save_candles
+    overwrites it.
+    """
+    step = interval_to_ms(interval)
+    end_time = end_time // step * step  # the candle open at end_time is not closed yet
+    store_per_symbol = output_path and not is_csv_path(output_path)
+
+    def finish_symbol(symbol: str, symbol_df: pd.DataFrame) -> pd.DataFrame:
+        if len(symbol_df) == 0:
+            print(f"  {symbol}: no data")
+            return symbol_df
+
+        symbol_df = calculate_indicators(symbol_df)
+        if store_per_symbol:
+            save_candles(symbol_df, output_path, interval)
+        print(f"  ✓ {symbol}: {len(symbol_df)} candles")
+        return symbol_df
+
+    started = time.time()
+    results = asyncio.run(fetch_klines(symbols, interval, start_time, end_time,
+                                       on_symbol=finish_symbol, base_url=base_url))
+    print(f"Fetched {len(results)}/{len(symbols)} symbols in {time.time() - started:.1f}s")
+
+    frames = [results[symbol] for symbol in symbols if symbol in results and len(results[symbol]) > 0]
+    if not frames:
+        print("No data fetched!")
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+    if output_path and not store_per_symbol:
+        save_candles(df, output_path, interval)
     return df
 
 
-def fetch_symbol_with_batching(
-    symbol: str,
+def collect_incremental(
+    symbols: List[str],
     interval: str,
     start_time: int,
-    end_time: int
-) -> List[Dict]:
+    end_time: int,
+    output_path: str,
+    base_url: str = BINANCE_API
+) -> pd.DataFrame:
     """
-    Fetch historical data for a symbol with automatic batching
-    Handles Binance's 1000 candle limit per request
+    Bring a candle store up to date, fetching only missing candles
+
+    Per symbol, the stored timestamps are compared with [start_time, end_time):
+    the range before the first candle, internal gaps and the delta after the
+    last candle are fetched (only closed candles). Raw candles are written every
+    few pages and the symbol is marked dirty, so an interrupted run resumes from
+    what is stored; indicators are recomputed over the symbol's full history once
+    it is complete. Ranges that come back empty (before listing, exchange outages)
+    are remembered and not requested again.
 
     Args:
-        symbol: Trading pair (e.g., 'BTCUSDT')
+        symbols: Trading pairs
         interval: Candle interval
         start_time: Start timestamp in milliseconds
         end_time: End timestamp in milliseconds
+        output_path: Candle store directory
+        base_url: Binance API root
 
     Returns:
-        List of candle dictionaries
+        DataFrame with symbol and timestamp of the stored candles
     """
-    url = "https://api.binance.com/api/v3/klines"
-    all_candles = []
-    current_start = start_time
-    batch_num = 1
-
-    while current_start < end_time:
-        try:
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'startTime': current_start,
-                'endTime': end_time,
-                'limit': 1000
-            }
-
-            print(f"  Batch {batch_num}: Fetching from {datetime.fromtimestamp(current_start/1000)}", end='')
-
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-
-            klines = response.json()
-
-            if len(klines) == 0:
-                print(" - No more data")
-                break
-
-            # Convert to candle format
-            for kline in klines:
-                candle = {
-                    'symbol': symbol,
-                    'timestamp': kline[0] / 1000,
-                    'open': float(kline[1]),
-                    'high': float(kline[2]),
-                    'low': float(kline[3]),
-                    'close': float(kline[4]),
-                    'volume': float(kline[5]),
-                    'rsi': 50,
-                    'macd': 0,
-                    'macd_signal': 0,
-                    'macd_hist': 0,
-                    'ema50': float(kline[4]),
-                    'stoch_k': 50,
-                    'stoch_d': 50
-                }
-                all_candles.append(candle)
-
-            print(f" - Got {len(klines)} candles (Total: {len(all_candles)})")
-
-            # Update start time for next batch (use last candle's close time + 1ms)
-            current_start = klines[-1][6] + 1
-
-            batch_num += 1
-
-            # Rate limiting - Binance allows 1200 requests per minute
-            # Sleep for 0.1s between requests to be safe (600 req/min)
-            time.sleep(0.1)
-
-        except Exception as e:
-            print(f"\n  Error fetching batch: {e}")
-            break
-
-    print(f"  ✓ Total fetched: {len(all_candles)} candles for {symbol}")
-    return all_candles
-
+    store = CandleStore(output_path)
+    state = CollectState(output_path)
+    step = interval_to_ms(interval)
+    end_time = end_time // step * step  # the candle open at end_time is not closed yet
 
-def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    ranges = {}
+    for symbol in symbols:
+        stored = np.round(store.timestamps(symbol, interval) * 1000).astype(np.int64)
+        planned = plan_missing_ranges(stored, start_time, end_time, step, state.empty_ranges(symbol, interval))
+        if planned or state.is_dirty(symbol, interval):
+            ranges[symbol] = planned
+
+    n_requests = sum(len(page_ranges(interval, r)) for r in ranges.values())
+    print(f"Updating {output_path} ({interval}): {len(ranges)}/{len(symbols)} symbols need data, "
+          f"{n_requests} requests")
+
+    def store_chunk(symbol: str, chunk_df: pd.DataFrame) -> None:
+        if len(chunk_df) > 0:
+            state.mark_dirty(symbol, interval)
+            store.write(chunk_df, interval)
+
+    def finish_symbol(symbol: str, _) -> None:
+        history = _recompute_indicators(store, symbol, interval)
+
+        # Whatever is still missing inside the fetched ranges does not exist on the
+        # exchange; the open end is left out in case of exchange lag
+        stored = np.round(history['timestamp'].values * 1000).astype(np.int64)
+        empty = [missing
+                 for range_start, range_end in ranges[symbol]
+                 for missing in plan_missing_ranges(stored, range_start, range_end, step)
+                 if missing[1] < end_time]
+        state.mark_done(symbol, interval, empty)
+        print(f"  ✓ {symbol}: {len(history)} candles stored")
+
+    if ranges:
+        started = time.time()
+        asyncio.run(fetch_klines(list(ranges), interval, ranges=ranges, on_chunk=store_chunk,
+                                 on_symbol=finish_symbol, base_url=base_url))
+        print(f"Updated {len(ranges)} symbols in {time.time() - started:.1f}s")
+
+    return store.read(symbols=symbols, interval=interval, columns=['timestamp'])
+
+
+def collect_from_sqlite(
+    db_path: str,
+    interval: str = '30m',
+    output_path: Optional[str] = None,
+    symbols: Optional[List[str]] = None
+) -> pd.DataFrame:
     """
-    Calculate technical indicators for raw OHLCV data
-    Uses pandas-ta or manual calculations
+    Sync closed candles the C# application stored in its SQLite database
+
+    Only candles newer than the last stored candle of each symbol are read
+    (one indexed range query per symbol). The application keeps a short rolling
+    window per symbol, so regular syncs accumulate the full production history
+    in the store. Indicators are not persisted by the application and are
+    recomputed over each updated symbol's history.
 
     Args:
-        df: DataFrame with OHLCV columns
+        db_path: Path to MarginCoinData.db
+        interval: Candle interval to sync
+        output_path: Candle store directory or legacy .csv path (default: data/candles)
+        symbols: Symbols to sync (default: all symbols in the database for the interval)
 
     Returns:
-        DataFrame with indicator columns added
+        DataFrame with symbol and timestamp of the synced symbols' stored candles
     """
-    try:
-        import pandas_ta as ta
+    if output_path is None:
+        output_path = "data/candles"
+
+    with SqliteCandleReader(db_path) as reader:
+        if symbols is None:
+            symbols = reader.symbols(interval)
 
-        # Group by symbol to calculate indicators per symbol
-        result_dfs = []
+        if is_csv_path(output_path):
+            df = calculate_indicators(reader.read(interval, symbols))
+            save_candles(df, output_path, interval)
+            print(f"Saved {len(df)} candles to {output_path}")
+            return df[['symbol', 'timestamp']]
 
-        for symbol in df['symbol'].unique():
-            symbol_df = df[df['symbol'] == symbol].copy()
+        store = CandleStore(output_path)
+        state = CollectState(output_path)
+        for symbol in symbols:
+            stored = store.timestamps(symbol, interval)
+            after_ms = round(stored[-1] * 1000) if len(stored) > 0 else None
+            new = reader.read_arrays(symbol, interval, after_ms=after_ms)
 
-            # RSI
-            symbol_df['rsi'] = ta.rsi(symbol_df['close'], length=14)
+            if len(new['timestamp']) > 0:
+                state.mark_dirty(symbol, interval)
+                store.write(pd.DataFrame({'symbol': symbol, **new}), interval)
+            elif not state.is_dirty(symbol, interval):
+                continue
 
-            # MACD
-            macd = ta.macd(symbol_df['close'], fast=12, slow=26, signal=9)
-            symbol_df['macd'] = macd['MACD_12_26_9']
-            symbol_df['macd_signal'] = macd['MACDs_12_26_9']
-            symbol_df['macd_hist'] = macd['MACDh_12_26_9']
+            history = _recompute_indicators(store, symbol, interval)
+            state.mark_done(symbol, interval, [])
+            print(f"  ✓ {symbol}: {len(new['timestamp'])} new, {len(history)} candles stored")
 
-            # EMA
-            symbol_df['ema50'] = ta.ema(symbol_df['close'], length=50)
+    return store.read(symbols=symbols, interval=interval, columns=['timestamp'])
 
-            # Stochastic
-            stoch = ta.stoch(symbol_df['high'], symbol_df['low'], symbol_df['close'], k=5, d=3)
-            symbol_df['stoch_k'] = stoch[f'STOCHk_5_3_3']
-            symbol_df['stoch_d'] = stoch[f'STOCHd_5_3_3']
 
-            result_dfs.append(symbol_df)
+def collect_from_archives(
+    archive_dir: str,
+    interval: str = '30m',
+    output_path: Optional[str] = None,
+    symbols: Optional[List[str]] = None,
+    workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Import Binance bulk kline archives (monthly / daily zip files) from a local directory
 
-        df = pd.concat(result_dfs, ignore_index=True)
+    Archives are decompressed and parsed in a process pool (see
+    utils/binance_archive.py); each symbol is deduplicated across overlapping
+    files, gets its indicators and is written to the store as soon as all its
+    files are read.
+
+    Args:
+        archive_dir: Directory with *-<interval>-YYYY-MM[-DD].zip files (searched recursively)
+        interval: Interval to import
+        output_path: Candle store directory (default: data/candles)
+        symbols: Symbols to import (default: all found)
+        workers: Decoding processes (default: CPU count)
 
-    except ImportError:
-        print("Warning: pandas_ta not installed. Using simple calculations.")
-        # Simple EMA calculation
-        df['ema50'] = df.groupby('symbol')['close'].transform(lambda x: x.ewm(span=50).mean())
-        # Fill other indicators with defaults
-        df['rsi'] = 50
-        df['macd'] = 0
-        df['macd_signal'] = 0
-        df['macd_hist'] = 0
-        df['stoch_k'] = 50
-        df['stoch_d'] = 50
+    Returns:
+        DataFrame with symbol and timestamp of the imported symbols' stored candles
+    """
+    if output_path is None:
+        output_path = "data/candles"
+    if is_csv_path(output_path):
+        raise ValueError("Archive import writes to a candle store directory, not a CSV file")
+
+    archives = find_archives(archive_dir, interval, symbols)
+    print(f"Importing {sum(len(paths) for paths in archives.values())} archives "
+          f"for {len(archives)} symbols ({interval}) from {archive_dir}")
+
+    store = CandleStore(output_path)
+    imported = []
+    started = time.time()
+    for symbol, _, symbol_df in iter_archive_symbols(archives, workers):
+        if store.partition_path(symbol, interval).exists():
+            # Merge first, indicators need the full history
+            store.write(symbol_df, interval)
+            stored = len(_recompute_indicators(store, symbol, interval))
+        else:
+            stored = store.write(calculate_indicators(symbol_df), interval, replace=True)
+        imported.append(symbol)
+        print(f"  ✓ {symbol}: {len(symbol_df)} candles from archives, {stored} stored")
+    print(f"Imported {len(imported)} symbols in {time.time() - started:.1f}s")
+
+    return store.read(symbols=imported, interval=interval, columns=['timestamp'])
+
+
+def resample_store(
+    output_path: str,
+    source_interval: str,
+    target_intervals: List[str],
+    symbols: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Build higher-interval candles from candles already in the store
 
-    # Fill NaN values
-    df = df.bfill().ffill().fillna(0)
+    Each symbol's source candles (e.g. 1m) are aggregated to every target
+    interval and indicators are recomputed on the result, so experiments on
+    several timeframes need a single backfill. Only complete target candles
+    are kept; target partitions are rewritten.
+
+    Args:
+        output_path: Candle store directory
+        source_interval: Stored interval to aggregate, e.g. '1m'
+        target_intervals: Intervals to build, e.g. ['15m', '30m', '1h']
+        symbols: Symbols to resample (default: all stored for source_interval)
+
+    Returns:
+        DataFrame with symbol and timestamp of the resampled candles (all targets)
+    """
+    store = CandleStore(output_path)
+    if symbols is None:
+        symbols = store.symbols(source_interval)
+
+    print(f"Resampling {len(symbols)} symbols from {source_interval} to {', '.join(target_intervals)}")
+    frames = []
+    for symbol in symbols:
+        source = store.read(symbols=[symbol], interval=source_interval, columns=OHLCV_COLUMNS)
+        counts = []
+        for target_interval in target_intervals:
+            resampled = resample_candles(source, source_interval, target_interval)
+            if len(resampled) > 0:
+                store.write(calculate_indicators(resampled), target_interval, replace=True)
+                frames.append(resampled[['symbol', 'timestamp']])
+            counts.append(f"{target_interval}: {len(resampled)}")
+        print(f"  ✓ {symbol}: {len(source)} {source_interval} candles -> {', '.join(counts)}")
+
+    if not frames:
+        return pd.DataFrame(columns=['symbol', 'timestamp'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _recompute_indicators(store: CandleStore, symbol: str, interval: str) -> pd.DataFrame:
+    """Recalculate indicators over a symbol's full stored history; returns the history"""
+    history = store.read(symbols=[symbol], interval=interval)
+    if len(history) > 0:
+        history = history.astype({c: 'float64' for c in history.columns if c not in ('symbol', 'timestamp')})
+        store.write(calculate_indicators(history), interval, replace=True)
+    return history
+
+
+def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate technical indicators for raw OHLCV data
+    RSI(14), MACD(12,26,9), EMA(50) and Stoch(5,3,3) as in the C# TradeIndicator,
+    for all symbols at once (see utils/indicators.py)
+
+    Args:
+        df: DataFrame with symbol, timestamp and OHLCV columns
+
+    Returns:
+        DataFrame with indicator columns added (warm-up rows back-filled per symbol)
+    """
+    df = df.copy()
+    df[INDICATOR_COLUMNS] = compute_indicators(df)
+
+    # Warm-up rows take the symbol's first computed value; only symbols shorter
+    # than an indicator's lookback end up with zeros
+    df[INDICATOR_COLUMNS] = df.groupby('symbol')[INDICATOR_COLUMNS].bfill().fillna(0)
 
     return df
 
@@ -376,14 +487,71 @@ Examples:
 
   # Fetch from JSON file
   python collect_data.py --source json --json-path data/export.json
+
+  # Daily refresh: only candles missing from the store are fetched
+  python collect_data.py --source binance --months 6 --symbols BTCUSDT ETHUSDT
+
+  # Refetch everything instead of updating incrementally
+  python collect_data.py --source binance --months 6 --full-refresh
+
+  # Import a legacy training_data.csv into the candle store
+  python collect_data.py --source csv --csv-path data/training_data.csv --interval 30m
+
+  # Sync the candles the trading app stored in its database (new candles only)
+  python collect_data.py --source sqlite --db-path ../MarginCoinData.db --interval 30m
+
+  # Import Binance bulk archives (data.binance.vision kline zips) from a directory
+  python collect_data.py --source archive --archive-dir data/binance_archive --interval 1m
+
+  # Backfill 1m once, then build 15m / 30m / 1h locally
+  python collect_data.py --source binance --months 6 --interval 1m
+  python collect_data.py --source resample --from-interval 1m --intervals 15m 30m 1h
         """
     )
 
     parser.add_argument(
         '--source',
-        choices=['json', 'binance'],
+        choices=['json', 'binance', 'csv', 'sqlite', 'archive', 'resample'],
         default='binance',
-        help='Data source (json file or binance API)'
+        help='Data source (json file, binance API, legacy training CSV, the app database, '
+             'Binance bulk archives or another interval in the store)'
+    )
+
+    parser.add_argument(
+        '--archive-dir',
+        type=str,
+        help='Directory with Binance kline zip archives (for archive source)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Processes decoding archives (for archive source, default: CPU count)'
+    )
+
+    parser.add_argument(
+        '--from-interval',
+        type=str,
+        default='1m',
+        help='Stored interval to aggregate (for resample source, default: 1m)'
+    )
+
+    parser.add_argument(
+        '--intervals',
+        nargs='+',
+        help='Target intervals (for resample source, default: --interval)'
+    )
+
+    parser.add_argument(
+        '--db-path',
+        type=str,
+        help='Path to the app database MarginCoinData.db (for sqlite source)'
+    )
+
+    parser.add_argument(
+        '--csv-path',
+        type=str,
+        help='Path to legacy training CSV (for csv source)'
     )
 
     parser.add_argument(
@@ -395,15 +563,15 @@ Examples:
     parser.add_argument(
         '--symbols',
         nargs='+',
-        default=['BTCUSDT', 'ETHUSDT', 'BNBUSDT'],
-        help='Symbols to fetch (for binance source)'
+        help='Symbols to fetch (binance source, default: BTCUSDT ETHUSDT BNBUSDT; '
+             'sqlite source, default: all)'
     )
 
     parser.add_argument(
         '--interval',
         type=str,
         default='30m',
-        help='Candle interval: 1m, 5m, 15m, 30m, 1h, 4h, 1d (for binance source)'
+        help='Candle interval: 1m, 5m, 15m, 30m, 1h, 4h, 1d (store partition for all sources)'
     )
 
     parser.add_argument(
@@ -424,11 +592,24 @@ Examples:
         help='Number of months to fetch (alternative to date range, for binance source)'
     )
 
+    parser.add_argument(
+        '--base-url',
+        type=str,
+        default=BINANCE_API,
+        help='Binance API root, e.g. a local stub server (for binance source)'
+    )
+
+    parser.add_argument(
+        '--full-refresh',
+        action='store_true',
+        help='Refetch the whole range instead of only what the store is missing (for binance source)'
+    )
+
     parser.add_argument(
         '--output',
         type=str,
-        default='data/training_data.csv',
-        help='Output CSV path'
+        default='data/candles',
+        help='Candle store directory (or a .csv path for a legacy CSV file)'
     )
 
     args = parser.parse_args()
@@ -438,24 +619,49 @@ Examples:
             print("Error: --json-path required for json source")
             return
 
-        df = collect_from_json_file(args.json_path, args.output)
+        df = collect_from_json_file(args.json_path, args.output, args.interval)
+
+    elif args.source == 'csv':
+        if not args.csv_path:
+            print("Error: --csv-path required for csv source")
+            return
+
+        df = load_candles(args.csv_path)
+        save_candles(df, args.output, args.interval)
+        print(f"Imported {len(df)} candles into {args.output}")
+
+    elif args.source == 'sqlite':
+        if not args.db_path:
+            print("Error: --db-path required for sqlite source")
+            return
+
+        df = collect_from_sqlite(args.db_path, args.interval, args.output, args.symbols)
+
+    elif args.source == 'archive':
+        if not args.archive_dir:
+            print("Error: --archive-dir required for archive source")
+            return
+
+        df = collect_from_archives(args.archive_dir, args.interval, args.output, args.symbols, args.workers)
+
+    elif args.source == 'resample':
+        df = resample_store(args.output, args.from_interval, args.intervals or [args.interval], args.symbols)
 
     elif args.source == 'binance':
         df = collect_from_binance_api(
-            symbols=args.symbols,
+            symbols=args.symbols or ['BTCUSDT', 'ETHUSDT', 'BNBUSDT'],
             interval=args.interval,
             start_date=args.start_date,
             end_date=args.end_date,
-            months=args.months
+            months=args.months,
+            output_path=args.output,
+            base_url=args.base_url,
+            incremental=not args.full_refresh
         )
 
-        # Save
-        output_dir = Path(args.output).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        df.to_csv(args.output, index=False)
+        # Each symbol was saved as soon as it was complete
         print(f"\n{'='*60}")
-        print(f"Saved {len(df)} candles to {args.output}")
+        print(f"{len(df)} candles in {args.output}")
         print(f"{'='*60}")
 
     print("\nData collection complete!")
@@ -1,9 +1,258 @@
+"""
+Data-quality scanner for collected candles
+Checks every symbol for gaps, duplicate / unordered / misaligned timestamps,
+invalid OHLC values, zero-volume runs and price spikes, and writes a JSON report
+
+Issues that break windowing (duplicates, unordered or misaligned timestamps,
+invalid prices) mark a partition as "error"; gaps, zero-volume runs and spikes
+as "warning".
+
+Usage (from ML/trading_model):
+    python utils/collect_data_validation.py --data ../data/candles
+    python utils/collect_data_validation.py --data ../data/candles --interval 30m --report quality.json --fail-on-error
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.candle_store import CandleStore, is_csv_path, load_candles
+from utils.kline_fetcher import interval_to_ms
+from utils.resample import INTERVAL_OFFSET_MS
+
+SCAN_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+ERROR_CHECKS = ['duplicates', 'non_monotonic', 'misaligned', 'invalid_ohlc']
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+
+def _runs(mask: np.ndarray):
+    """(start, end) index pairs (end exclusive) of True runs"""
+    edges = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def scan_symbol(
+    timestamps: np.ndarray,
+    values: Dict[str, np.ndarray],
+    interval: str,
+    spike_threshold: float = 12.0,
+    min_zero_run: int = 3,
+    max_examples: int = 20
+) -> Dict:
+    """
+    Quality checks for one symbol's candles, all vectorized
+
+    Args:
+        timestamps: Open times in seconds, in stored order
+        values: open/high/low/close/volume arrays aligned with timestamps
+        interval: Expected candle interval
+        spike_threshold: Robust z-score (|log return - median| / (1.4826 * MAD)) above which a move is a spike
+        min_zero_run: Shortest run of zero-volume candles that is reported
+        max_examples: Examples kept per check (largest first)
+
+    Returns:
+        Dict with counts and examples per check plus a status
+    """
+    step_s = interval_to_ms(interval) / 1000
+    ts = timestamps.astype(np.float64)
+    open_ms = np.round(ts * 1000).astype(np.int64)
+    report = {
+        'rows': int(len(ts)),
+        'first': _iso(ts.min()) if len(ts) else None,
+        'last': _iso(ts.max()) if len(ts) else None,
+        'non_monotonic': int(np.sum(np.diff(ts) < 0)),
+        'misaligned': int(np.sum((open_ms - INTERVAL_OFFSET_MS.get(interval, 0)) % interval_to_ms(interval) != 0))
+    }
+
+    # Gaps and duplicates on the sorted series, so unordered input is still measured
+    ordered = np.sort(ts)
+    ordered_diffs = np.diff(ordered)
+    report['duplicates'] = int(np.sum(ordered_diffs == 0))
+    holes = np.flatnonzero(ordered_diffs > step_s)
+    missing = np.round(ordered_diffs[holes] / step_s).astype(np.int64) - 1
+    largest = np.argsort(-missing, kind='stable')[:max_examples]
+    report['gaps'] = {
+        'count': int(len(holes)),
+        'missing_candles': int(missing.sum()),
+        'largest': [{'after': _iso(ordered[holes[i]]), 'missing': int(missing[i])} for i in largest]
+    }
+
+    open_, high, low, close, volume = (values[c].astype(np.float64) for c in SCAN_COLUMNS)
+    with np.errstate(invalid='ignore'):
+        invalid = (~np.isfinite(open_) | ~np.isfinite(high) | ~np.isfinite(low) | ~np.isfinite(close)
+                   | (np.minimum(np.minimum(open_, close), low) <= 0)
+                   | (high < np.maximum(open_, close)) | (low > np.minimum(open_, close))
+                   | ~np.isfinite(volume) | (volume < 0))
+    report['invalid_ohlc'] = {
+        'count': int(invalid.sum()),
+        'examples': [_iso(t) for t in ts[invalid][:max_examples]]
+    }
+
+    starts, ends = _runs(volume == 0)
+    keep = (ends - starts) >= min_zero_run
+    starts, ends = starts[keep], ends[keep]
+    longest = np.argsort(-(ends - starts), kind='stable')[:max_examples]
+    report['zero_volume_runs'] = {
+        'count': int(len(starts)),
+        'candles': int((ends - starts).sum()),
+        'longest': [{'from': _iso(ts[starts[i]]), 'candles': int(ends[i] - starts[i])} for i in longest]
+    }
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(np.log(close))
+    finite = np.isfinite(returns)
+    spikes = np.empty(0, dtype=np.int64)
+    scores = np.empty(0)
+    if finite.sum() > 1:
+        median = np.median(returns[finite])
+        mad = 1.4826 * np.median(np.abs(returns[finite] - median))
+        if mad > 0:
+            scores = np.abs(returns - median) / mad
+            spikes = np.flatnonzero(finite & (scores > spike_threshold))
+    strongest = spikes[np.argsort(-scores[spikes], kind='stable')[:max_examples]]
+    report['spikes'] = {
+        'count': int(len(spikes)),
+        'examples': [{'at': _iso(ts[i + 1]), 'return': float(np.expm1(returns[i])), 'score': float(scores[i])}
+                     for i in strongest]
+    }
+
+    if any(report[c] if isinstance(report[c], int) else report[c]['count'] for c in ERROR_CHECKS):
+        report['status'] = 'error'
+    elif report['gaps']['count'] or report['zero_volume_runs']['count'] or report['spikes']['count']:
+        report['status'] = 'warning'
+    else:
+        report['status'] = 'ok'
+    return report
+
+
+def _symbol_slices(df: pd.DataFrame):
+    """(symbol, row slice) per symbol; rows of a symbol must be contiguous (store order)"""
+    codes, uniques = pd.factorize(df['symbol'])
+    if np.any(np.diff(codes) < 0):
+        # CSV input not grouped by symbol: group stably, keeping each symbol's row order
+        order = np.argsort(codes, kind='stable')
+        df, codes = df.iloc[order].reset_index(drop=True), codes[order]
+    bounds = np.r_[0, np.flatnonzero(np.diff(codes)) + 1, len(codes)]
+    return df, [(uniques[codes[bounds[i]]], slice(bounds[i], bounds[i + 1])) for i in range(len(bounds) - 1)]
+
+
+def _read_partition(store: CandleStore, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+    table = pq.read_table(store.partition_path(symbol, interval), columns=['timestamp'] + SCAN_COLUMNS)
+    return {c: table.column(c).to_numpy() for c in table.column_names}
+
+
+def scan_dataset(
+    data_path: str,
+    interval: Optional[str] = None,
+    symbols: Optional[List[str]] = None,
+    **scan_kwargs
+) -> Dict:
+    """
+    Scan a candle store (every stored interval, or one) or a legacy CSV
+
+    Store partitions are read one at a time, so memory stays bounded by the
+    largest partition. CSV files need interval.
+
+    Returns:
+        Report dict: partitions (one entry per symbol and interval) and a summary
+    """
+    started = time.time()
+    partitions = []
+
+    if is_csv_path(data_path):
+        if interval is None:
+            raise ValueError("interval is required to scan a CSV file")
+        df, slices = _symbol_slices(load_candles(data_path, symbols=symbols, columns=SCAN_COLUMNS))
+        arrays = {c: df[c].to_numpy() for c in ['timestamp'] + SCAN_COLUMNS}
+        candles = ((symbol, interval, {c: v[rows] for c, v in arrays.items()}) for symbol, rows in slices)
+    else:
+        store = CandleStore(data_path)
+        parts = store.partitions()
+        if interval is not None:
+            parts = parts[parts['interval'] == interval]
+        if symbols is not None:
+            parts = parts[parts['symbol'].isin(symbols)]
+        # Partition files are read directly: one file per symbol, no symbol column to decode
+        candles = ((row.symbol, row.interval, _read_partition(store, row.symbol, row.interval))
+                   for row in parts.itertuples())
+
+    for symbol, candle_interval, arrays in candles:
+        report = scan_symbol(arrays['timestamp'], arrays, candle_interval, **scan_kwargs)
+        partitions.append({'symbol': symbol, 'interval': candle_interval, **report})
+
+    statuses = [p['status'] for p in partitions]
+    return {
+        'source': str(data_path),
+        'generated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'summary': {
+            'partitions': len(partitions),
+            'rows': int(sum(p['rows'] for p in partitions)),
+            'ok': statuses.count('ok'),
+            'warning': statuses.count('warning'),
+            'error': statuses.count('error'),
+            'seconds': round(time.time() - started, 2)
+        },
+        'partitions': partitions
+    }
+
+
+def symbols_with_errors(report_path: str, interval: Optional[str] = None) -> List[str]:
+    """Symbols whose partitions (of interval, or any) have status "error" in a saved report"""
+    report = json.loads(Path(report_path).read_text())
+    return sorted({p['symbol'] for p in report['partitions']
+                   if p['status'] == 'error' and (interval is None or p['interval'] == interval)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scan collected candles for data-quality problems')
+    parser.add_argument('--data', type=str, default='data/candles', help='Candle store directory or legacy CSV')
+    parser.add_argument('--interval', type=str, default=None, help='Interval to scan (default: all stored)')
+    parser.add_argument('--symbols', nargs='+', default=None, help='Symbols to scan (default: all)')
+    parser.add_argument('--report', type=str, default=None, help='Write the JSON report to this path')
+    parser.add_argument('--spike-threshold', type=float, default=12.0,
+                        help='Robust z-score of a log return that counts as a spike (default: 12)')
+    parser.add_argument('--min-zero-run', type=int, default=3,
+                        help='Shortest reported run of zero-volume candles (default: 3)')
+    parser.add_argument('--fail-on-error', action='store_true',
+                        help='Exit with status 1 if any partition has errors')
+    args = parser.parse_args()
+
+    report = scan_dataset(args.data, args.interval, args.symbols,
+                          spike_threshold=args.spike_threshold, min_zero_run=args.min_zero_run)
+
+    print(f"{'SYMBOL':<14}{'INT':<6}{'ROWS':>10}{'GAPS':>7}{'MISSING':>9}{'DUPS':>6}"
+          f"{'UNORD':>7}{'BAD':>6}{'ZERO-V':>8}{'SPIKES':>8}  STATUS")
+    for p in report['partitions']:
+        print(f"{p['symbol']:<14}{p['interval']:<6}{p['rows']:>10}{p['gaps']['count']:>7}"
+              f"{p['gaps']['missing_candles']:>9}{p['duplicates']:>6}{p['non_monotonic']:>7}"
+              f"{p['invalid_ohlc']['count']:>6}{p['zero_volume_runs']['count']:>8}{p['spikes']['count']:>8}"
+              f"  {p['status']}")
+
+    summary = report['summary']
+    print(f"\n{summary['partitions']} partitions, {summary['rows']:,} rows in {summary['seconds']}s: "
+          f"{summary['ok']} ok, {summary['warning']} warning, {summary['error']} error")
+
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(json.dumps(report, indent=1))
+        print(f"Report written to {args.report}")
+
+    if args.fail_on_error and summary['error']:
+        sys.exit(1)
+
 
-df = pd.read_csv("ML/data/training_data.csv")  # adjust path
-ada = df[df.symbol=="BTCUSDC"].sort_values("timestamp")
-ts = pd.to_datetime(ada.timestamp, unit='s')
-interval = pd.Timedelta('1h')  # use 30m if that’s what you want
-gaps = ts.diff() > interval
-print(ts[gaps])        # shows gap start times
-print(ts[gaps].shift(-1))  # next bar after the gap
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Incremental collection planning
+Works out which candle ranges a store is missing and keeps the collector's
+resume state next to the store
+"""
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+import json
+import os
+import threading
+
+import numpy as np
+
+STATE_FILE = '_collect_state.json'
+
+Range = Tuple[int, int]  # [start_ms, end_ms) of candle open times
+
+
+def find_gaps(timestamps_ms: np.ndarray, step_ms: int) -> List[Range]:
+    """
+    Missing candle ranges between consecutive stored candles
+
+    Args:
+        timestamps_ms: Sorted candle open times in milliseconds
+        step_ms: Interval length in milliseconds
+
+    Returns:
+        [(first missing open time, next stored open time)] for every hole
+    """
+    if len(timestamps_ms) < 2:
+        return []
+    holes = np.flatnonzero(np.diff(timestamps_ms) > step_ms)
+    return [(int(timestamps_ms[i]) + step_ms, int(timestamps_ms[i + 1])) for i in holes]
+
+
+def plan_missing_ranges(
+    timestamps_ms: np.ndarray,
+    start_ms: int,
+    end_ms: int,
+    step_ms: int,
+    skip: List[Range] = ()
+) -> List[Range]:
+    """
+    Ranges to fetch so that [start_ms, end_ms) is fully covered
+
+    Covers the part before the first stored candle, internal gaps and the delta
+    after the last stored candle. Ranges in `skip` (known to be empty on the
+    exchange, e.g. before listing or during an outage) are not planned again.
+
+    Args:
+        timestamps_ms: Sorted stored open times in milliseconds
+        start_ms: Inclusive start of the wanted range
+        end_ms: Exclusive end of the wanted range
+        step_ms: Interval length in milliseconds
+        skip: Ranges that returned no candles before
+
+    Returns:
+        Sorted, non-empty [start_ms, end_ms) ranges aligned to the interval
+    """
+    start_ms = -(-start_ms // step_ms) * step_ms
+    end_ms = end_ms // step_ms * step_ms
+
+    if len(timestamps_ms) == 0:
+        ranges = [(start_ms, end_ms)]
+    else:
+        first, last = int(timestamps_ms[0]), int(timestamps_ms[-1])
+        ranges = [(start_ms, first)] + find_gaps(timestamps_ms, step_ms) + [(last + step_ms, end_ms)]
+
+    planned = []
+    for range_start, range_end in ranges:
+        range_start, range_end = max(range_start, start_ms), min(range_end, end_ms)
+        if range_start < range_end:
+            planned.extend(subtract_ranges((range_start, range_end), skip))
+    return planned
+
+
+def subtract_ranges(target: Range, ranges: List[Range]) -> List[Range]:
+    """Parts of target not covered by any of ranges"""
+    remaining = [target]
+    for cut_start, cut_end in sorted(ranges):
+        next_remaining = []
+        for start, end in remaining:
+            if cut_end <= start or cut_start >= end:
+                next_remaining.append((start, end))
+                continue
+            if start < cut_start:
+                next_remaining.append((start, cut_start))
+            if cut_end < end:
+                next_remaining.append((cut_end, end))
+        remaining = next_remaining
+    return remaining
+
+
+class CollectState:
+    """
+    Resume state of the incremental collector, stored as JSON in the store root
+
+    Per symbol and interval it records ranges known to be empty on the exchange
+    and whether raw candles were written without their indicators being
+    recomputed (an interrupted run); those symbols are finished on the next run.
+    """
+
+    def __init__(self, root: str):
+        self.path = Path(root) / STATE_FILE
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict] = {}
+        if self.path.exists():
+            self._state = json.loads(self.path.read_text())
+
+    @staticmethod
+    def _key(symbol: str, interval: str) -> str:
+        return f'{symbol}/{interval}'
+
+    def _entry(self, symbol: str, interval: str) -> Dict:
+        return self._state.setdefault(self._key(symbol, interval), {'empty_ranges': [], 'dirty': False})
+
+    def empty_ranges(self, symbol: str, interval: str) -> List[Range]:
+        with self._lock:
+            return [tuple(r) for r in self._entry(symbol, interval)['empty_ranges']]
+
+    def is_dirty(self, symbol: str, interval: str) -> bool:
+        with self._lock:
+            return self._entry(symbol, interval)['dirty']
+
+    def mark_dirty(self, symbol: str, interval: str) -> None:
+        with self._lock:
+            entry = self._entry(symbol, interval)
+            if not entry['dirty']:
+                entry['dirty'] = True
+                self._save()
+
+    def mark_done(self, symbol: str, interval: str, empty_ranges: List[Range]) -> None:
+        """Indicators are up to date; remember ranges that came back empty"""
+        with self._lock:
+            entry = self._entry(symbol, interval)
+            known = {tuple(r) for r in entry['empty_ranges']} | {tuple(r) for r in empty_ranges}
+            entry['empty_ranges'] = sorted(list(r) for r in known)
+            entry['dirty'] = False
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self._state, indent=1))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,54 @@
+"""
+CPU training performance settings
+Thread pool / core affinity configuration and bfloat16 support detection for
+CPU-only training boxes (see TradingModelTrainer(cpu_bf16=..., compile_model=...))
+"""
+
+from typing import Dict, Optional, Sequence
+import os
+
+import torch
+
+
+def cpu_supports_bf16() -> bool:
+    """True if the CPU has native bfloat16 matmul (AVX512-BF16 or AMX); otherwise bf16 is emulated and slow"""
+    checks = ('_is_amx_tile_supported', '_is_avx512_bf16_supported')
+    return any(getattr(torch.cpu, name, lambda: False)() for name in checks)
+
+
+def configure_cpu_threads(
+    num_threads: Optional[int] = None,
+    interop_threads: Optional[int] = None,
+    cores: Optional[Sequence[int]] = None
+) -> Dict:
+    """
+    Pin the process to cores and size torch's thread pools to them
+
+    Call once at startup, before the first parallel torch op (the inter-op
+    pool cannot be resized afterwards).
+
+    Args:
+        num_threads: Intra-op threads (default: one per core the process may run on)
+        interop_threads: Inter-op threads (default: torch's choice)
+        cores: CPU ids to pin the process to, e.g. the physical cores of one
+            socket (Linux only; default: keep the current affinity)
+
+    Returns:
+        Dict with the resulting cores, intra_op_threads and interop_threads
+    """
+    if cores is not None:
+        os.sched_setaffinity(0, cores)
+    available = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+    torch.set_num_threads(num_threads or available)
+    if interop_threads is not None:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:  # parallel work already started
+            print(f"  Could not set inter-op threads: {e}")
+
+    return {
+        'cores': available,
+        'intra_op_threads': torch.get_num_threads(),
+        'interop_threads': torch.get_num_interop_threads()
+    }
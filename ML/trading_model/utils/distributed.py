@@ -0,0 +1,161 @@
+"""
+Data-parallel training across CPU processes (torch.distributed, gloo)
+Process group setup from torchrun's environment, a window sampler that shards
+every epoch across ranks, and reductions of loss / metric counters
+
+Launch (one process per group of cores, on one or more hosts):
+    torchrun --nproc_per_node 8 train.py
+    torchrun --nnodes 2 --node_rank 0 --master_addr 10.0.0.1 --master_port 29500 --nproc_per_node 8 train.py
+Without torchrun everything runs as a single process (rank 0 of 1).
+"""
+
+from datetime import timedelta
+from typing import Dict, Iterator, Optional, Tuple
+import os
+
+import numpy as np
+import torch
+import torch.distributed as dist
+from torch.utils.data import Sampler
+
+
+def init_distributed(backend: str = 'gloo', timeout_minutes: int = 30) -> Tuple[int, int]:
+    """
+    Join the process group described by torchrun's environment (RANK, WORLD_SIZE, MASTER_ADDR, ...)
+
+    Returns:
+        (rank, world_size); (0, 1) when not launched by torchrun
+    """
+    world_size = int(os.environ.get('WORLD_SIZE', 1))
+    if world_size > 1 and not dist.is_initialized():
+        dist.init_process_group(backend=backend, timeout=timedelta(minutes=timeout_minutes))
+    return get_rank(), get_world_size()
+
+
+def get_rank() -> int:
+    return dist.get_rank() if dist.is_initialized() else 0
+
+
+def get_world_size() -> int:
+    return dist.get_world_size() if dist.is_initialized() else 1
+
+
+def get_local_world_size() -> int:
+    """Processes on this host (torchrun's LOCAL_WORLD_SIZE)"""
+    return int(os.environ.get('LOCAL_WORLD_SIZE', 1))
+
+
+def is_main_process() -> bool:
+    return get_rank() == 0
+
+
+def cleanup_distributed() -> None:
+    if dist.is_initialized():
+        dist.destroy_process_group()
+
+
+def all_reduce_sum(values) -> np.ndarray:
+    """Element-wise sum of a numeric array across ranks (float64; returned unchanged in a single process)"""
+    tensor = torch.as_tensor(np.asarray(values, dtype=np.float64))
+    if get_world_size() > 1:
+        dist.all_reduce(tensor, op=dist.ReduceOp.SUM)
+    return tensor.numpy()
+
+
+def all_reduce_max(value: float) -> float:
+    tensor = torch.tensor([value], dtype=torch.float64)
+    if get_world_size() > 1:
+        dist.all_reduce(tensor, op=dist.ReduceOp.MAX)
+    return float(tensor.item())
+
+
+def reduce_stage_stats(stats: Dict) -> Dict:
+    """
+    Global throughput of a StageTimer summary: samples summed over ranks, per
+    the slowest rank's wall time (stage times stay this rank's own)
+    """
+    if get_world_size() == 1:
+        return stats
+    samples, steps = all_reduce_sum([stats['samples'], stats['steps']])
+    seconds = all_reduce_max(stats['seconds'])
+    return {
+        **stats,
+        'world_size': get_world_size(),
+        'rank_samples_per_sec': stats['samples_per_sec'],
+        'samples': int(samples),
+        'steps': int(steps),
+        'samples_per_sec': round(samples / seconds, 1) if seconds > 0 else 0.0
+    }
+
+
+class DistributedWindowSampler(Sampler):
+    """
+    This rank's share of an epoch of window indexes
+
+    Every rank draws the same epoch order from a generator seeded with
+    seed + epoch (a permutation, or weighted draws with replacement like
+    WeightedRandomSampler) and keeps every world_size-th index starting at
+    its rank. With pad=True the order is padded by wrapping around, so all
+    ranks run the same number of steps, which DDP's gradient all-reduce
+    requires; validation uses pad=False so no window is counted twice.
+
+    The epoch advances on every iteration (ranks iterate in lockstep), or
+    can be set explicitly with set_epoch.
+    """
+
+    def __init__(
+        self,
+        num_windows: int,
+        rank: Optional[int] = None,
+        world_size: Optional[int] = None,
+        shuffle: bool = True,
+        weights: Optional[torch.Tensor] = None,
+        num_samples: Optional[int] = None,
+        pad: bool = True,
+        seed: int = 0
+    ):
+        """
+        Args:
+            num_windows: Windows in the dataset
+            rank: This process's rank (default: from the process group)
+            world_size: Number of processes (default: from the process group)
+            shuffle: Random permutation each epoch (ignored with weights)
+            weights: Per-window sampling weights; draws num_samples with replacement
+            num_samples: Draws per epoch over all ranks with weights (default: num_windows)
+            pad: Pad the epoch so every rank gets the same number of windows
+            seed: Base seed, identical on all ranks
+        """
+        self.num_windows = num_windows
+        self.rank = get_rank() if rank is None else rank
+        self.world_size = get_world_size() if world_size is None else world_size
+        self.shuffle = shuffle
+        self.weights = None if weights is None else torch.as_tensor(weights, dtype=torch.double)
+        self.total = (num_samples or num_windows) if weights is not None else num_windows
+        self.pad = pad
+        self.seed = seed
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def __len__(self) -> int:
+        if self.pad:
+            return -(-self.total // self.world_size)
+        return len(range(self.rank, self.total, self.world_size))
+
+    def __iter__(self) -> Iterator[int]:
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + self.epoch)
+        self.epoch += 1
+
+        if self.weights is not None:
+            order = torch.multinomial(self.weights, self.total, replacement=True, generator=generator)
+        elif self.shuffle:
+            order = torch.randperm(self.num_windows, generator=generator)
+        else:
+            order = torch.arange(self.num_windows)
+
+        if self.pad and self.total % self.world_size:
+            extra = self.world_size - self.total % self.world_size
+            order = torch.cat([order, order[:extra].repeat(-(-extra // max(len(order), 1)))[:extra]])
+        return iter(order[self.rank::self.world_size].tolist())
@@ -0,0 +1,182 @@
+"""
+NumPy feature engine for the inference path
+Computes the same features as TradingDataPreprocessor.create_features on a plain
+(T, 12) candle array, without the pandas overhead that dominates small windows
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List
+
+
+# Raw candle columns, in the order expected by compute_features
+RAW_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'rsi', 'macd', 'macd_signal',
+               'macd_hist', 'ema50', 'stoch_k', 'stoch_d']
+
+
+def _shift(x: np.ndarray, n: int) -> np.ndarray:
+    """x shifted forward by n rows, NaN-padded (pandas Series.shift)"""
+    out = np.full_like(x, np.nan)
+    if n < len(x):
+        out[n:] = x[:len(x) - n]
+    return out
+
+
+def _ffill(x: np.ndarray) -> np.ndarray:
+    """Forward-fill NaN along axis 0 (pandas DataFrame.ffill)"""
+    mask = np.isnan(x)
+    if not mask.any():
+        return x
+    idx = np.where(mask, 0, np.arange(len(x)).reshape(-1, *([1] * (x.ndim - 1))))
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = np.take_along_axis(x, idx, axis=0)
+    # Leading NaN stay NaN (nothing to fill from)
+    return filled
+
+
+def _pct_change(x: np.ndarray, n: int = 1) -> np.ndarray:
+    """Percentage change over n rows (pandas pct_change, which pads NaN first)"""
+    x = _ffill(x)
+    return x / _shift(x, n) - 1
+
+
+def _diff(x: np.ndarray) -> np.ndarray:
+    return x - _shift(x, 1)
+
+
+def _nonzero(x: np.ndarray) -> np.ndarray:
+    """Replace 0 with NaN (pandas .replace(0, np.nan)) for safe division"""
+    return np.where(x == 0, np.nan, x)
+
+
+def _rolling(x: np.ndarray, window: int, func) -> np.ndarray:
+    """
+    Apply a window reduction (NaN until `window` rows are available)
+
+    Any NaN in a window yields NaN, matching pandas rolling with min_periods=window.
+    """
+    out = np.full_like(x, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = func(sliding_window_view(x, window), axis=-1)
+    return out
+
+
+def _rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(x, window, lambda w, axis: np.std(w, axis=axis, ddof=1))
+
+
+def rolling_slope(values: np.ndarray, window: int = 3) -> np.ndarray:
+    """
+    Least-squares slope of each trailing window
+
+    Vectorized equivalent of
+    `series.rolling(window).apply(lambda x: np.polyfit(range(window), x, 1)[0])`:
+    with x centered, the slope is a fixed linear combination of the window,
+    so the whole column is one convolution.
+
+    Args:
+        values: 1-D array (e.g. a DataFrame column's values)
+        window: Number of rows in each fit (>= 2)
+
+    Returns:
+        Array of slopes, NaN for the first window-1 rows and windows containing NaN
+    """
+    if window < 2:
+        raise ValueError(f"window must be >= 2, got {window}")
+
+    x = np.asarray(values, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        t = np.arange(window) - (window - 1) / 2
+        weights = t / np.sum(t ** 2)
+        out[window - 1:] = np.convolve(x, weights[::-1], mode='valid')
+    return out
+
+
+def compute_features(raw: np.ndarray, feature_columns: List[str], dtype=np.float32) -> np.ndarray:
+    """
+    Build the model feature matrix from raw candles
+
+    Args:
+        raw: Array of shape (T, len(RAW_COLUMNS)) in RAW_COLUMNS order
+        feature_columns: Output columns, e.g. TradingDataPreprocessor.get_feature_columns()
+        dtype: Output dtype (computation is done in float64)
+
+    Returns:
+        Array of shape (T, len(feature_columns))
+    """
+    raw = np.asarray(raw, dtype=np.float64)
+    if raw.ndim != 2 or raw.shape[1] != len(RAW_COLUMNS):
+        raise ValueError(f"Expected raw candles of shape (T, {len(RAW_COLUMNS)}), got {raw.shape}")
+
+    cols = {name: raw[:, i] for i, name in enumerate(RAW_COLUMNS)}
+    o, h, l, c = cols['open'], cols['high'], cols['low'], cols['close']
+    volume, rsi, ema = cols['volume'], cols['rsi'], cols['ema50']
+    close_nz = _nonzero(c)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Price-based features
+        returns = _pct_change(c)
+        cols['returns'] = returns
+        cols['log_returns'] = np.log(c / _shift(c, 1))
+        cols['hl_ratio'] = (h - l) / c
+        cols['co_ratio'] = (c - o) / _nonzero(o)
+
+        # Volatility
+        cols['volatility_20'] = _rolling_std(returns, 20)
+        cols['volatility_5'] = _rolling_std(returns, 5)
+
+        # Trend strength
+        cols['ema_distance'] = (c - ema) / _nonzero(ema)
+        cols['ema_slope'] = _pct_change(ema, 5)
+
+        # MACD enhancements
+        cols['macd_acceleration'] = _diff(cols['macd_hist'])
+        cols['macd_hist_slope'] = rolling_slope(cols['macd_hist'], 3)
+
+        # RSI momentum
+        cols['rsi_momentum'] = _diff(rsi)
+        cols['rsi_ma'] = _rolling(rsi, 10, np.mean)
+        cols['rsi_distance_50'] = rsi - 50
+
+        # Volume features (if volume is not zero)
+        if np.nansum(volume) > 0:
+            volume_ma = _rolling(volume, 20, np.mean)
+            cols['volume_ma'] = volume_ma
+            cols['volume_ratio'] = volume / _nonzero(volume_ma)
+            cols['volume_volatility'] = _rolling_std(volume, 10)
+        else:
+            cols['volume_ma'] = np.zeros_like(c)
+            cols['volume_ratio'] = np.ones_like(c)
+            cols['volume_volatility'] = np.zeros_like(c)
+
+        # Stochastic
+        cols['stoch_position'] = (cols['stoch_k'] + cols['stoch_d']) / 2
+        cols['stoch_divergence'] = cols['stoch_k'] - cols['stoch_d']
+
+        # Pattern features - candle body and shadows
+        cols['body_size'] = np.abs(c - o) / close_nz
+        cols['upper_shadow'] = (h - np.fmax(c, o)) / close_nz
+        cols['lower_shadow'] = (np.fmin(c, o) - l) / close_nz
+
+        # Rolling statistics - price position in range
+        low_20 = _rolling(c, 20, np.min)
+        high_20 = _rolling(c, 20, np.max)
+        cols['price_position'] = (c - low_20) / _nonzero(high_20 - low_20)
+
+        # Momentum features
+        cols['momentum_5'] = _pct_change(c, 5)
+        cols['momentum_10'] = _pct_change(c, 10)
+
+    missing = [name for name in feature_columns if name not in cols]
+    if missing:
+        raise ValueError(f"Unknown feature columns: {missing}")
+
+    features = np.column_stack([cols[name] for name in feature_columns])
+
+    # Replace inf values with NaN, then fill
+    features[np.isinf(features)] = np.nan
+    features = _ffill(features)
+    features[np.isnan(features)] = 0
+
+    return features.astype(dtype, copy=False)
@@ -0,0 +1,193 @@
+"""
+Native technical indicator engine
+RSI(14), MACD(12,26,9), EMA(50) and Stoch(5,3,3) with the TA-Lib definitions used by
+the C# side (Misc/TradeIndicator.cs), computed for all symbols in one vectorized pass
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+INDICATOR_COLUMNS = ['rsi', 'macd', 'macd_signal', 'macd_hist', 'ema50', 'stoch_k', 'stoch_d']
+
+# TA-Lib treats |x| < 1e-14 as zero
+_EPSILON = 1e-14
+
+# All functions below work on (symbols, time) matrices; series shorter than the
+# matrix are NaN-padded at the end, so the causal recursions never mix symbols.
+
+
+def _smooth(x: np.ndarray, alpha: float, first: int, seed: np.ndarray) -> np.ndarray:
+    """
+    y[first] = seed, y[t] = y[t-1] + alpha * (x[t] - y[t-1]) for t > first
+
+    Returns a (symbols, time) array, NaN before `first`.
+    """
+    out = np.full(x.shape, np.nan)
+    if first >= x.shape[1]:
+        return out
+    out[:, first] = seed
+    if first + 1 < x.shape[1]:
+        zi = ((1 - alpha) * seed)[:, None]
+        out[:, first + 1:], _ = lfilter([alpha], [1, -(1 - alpha)], x[:, first + 1:], axis=1, zi=zi)
+    return out
+
+
+def _rolling(x: np.ndarray, period: int, reduce: np.ufunc) -> np.ndarray:
+    """reduce over the trailing `period` values (short windows: one pass per lag)"""
+    n = x.shape[1] - period + 1
+    out = x[:, period - 1:].copy()
+    for lag in range(1, period):
+        reduce(out, x[:, period - 1 - lag:period - 1 - lag + n], out=out)
+    return out
+
+
+def _sma(x: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average along time, NaN for the first period-1 values"""
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] >= period:
+        out[:, period - 1:] = _rolling(x, period, np.add) / period
+    return out
+
+
+def ema(x: np.ndarray, period: int, first: int = None) -> np.ndarray:
+    """
+    TA-Lib EMA: seeded with the simple average of the `period` values ending at `first`
+
+    Args:
+        x: (symbols, time) values
+        period: EMA period (k = 2 / (period + 1))
+        first: Index of the first output (default period - 1, TA-Lib lookback)
+    """
+    first = period - 1 if first is None else first
+    if first >= x.shape[1]:
+        return np.full(x.shape, np.nan)
+    seed = x[:, first - period + 1:first + 1].mean(axis=1)
+    return _smooth(x, 2.0 / (period + 1), first, seed)
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """TA-Lib RSI (Wilder smoothing seeded with the average of the first `period` changes)"""
+    out = np.full(close.shape, np.nan)
+    if close.shape[1] <= period:
+        return out
+
+    change = np.diff(close, axis=1, prepend=np.nan)
+    gain = np.where(change > 0, change, 0.0)
+    loss = np.where(change < 0, -change, 0.0)
+    gain[np.isnan(change)] = np.nan
+    loss[np.isnan(change)] = np.nan
+
+    avg_gain = _smooth(gain, 1.0 / period, period, gain[:, 1:period + 1].mean(axis=1))
+    avg_loss = _smooth(loss, 1.0 / period, period, loss[:, 1:period + 1].mean(axis=1))
+
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.where(np.abs(total) < _EPSILON, 0.0, 100 * avg_gain / total)
+    out[np.isnan(total)] = np.nan
+    return out
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    TA-Lib MACD: both EMAs start at the slow lookback, the signal EMA runs on the MACD line
+
+    Returns:
+        (macd, signal, hist), NaN before index slow + signal - 2
+    """
+    start = slow - 1
+    line = ema(close, fast, first=start) - ema(close, slow, first=start)
+
+    signal_line = np.full(close.shape, np.nan)
+    if close.shape[1] > start:
+        signal_line[:, start:] = ema(line[:, start:], signal)
+
+    line[:, :start + signal - 1] = np.nan
+    return line, signal_line, line - signal_line
+
+
+def stoch(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+          k_period: int = 5, slow_k: int = 3, slow_d: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    TA-Lib Stoch with SMA smoothing (fast %K over k_period, slow %K = SMA(slow_k), %D = SMA(slow_d))
+
+    Returns:
+        (slow %K, slow %D), NaN before index k_period + slow_k + slow_d - 3
+    """
+    fast_k = np.full(close.shape, np.nan)
+    if close.shape[1] >= k_period:
+        highest = _rolling(high, k_period, np.maximum)
+        lowest = _rolling(low, k_period, np.minimum)
+        span = (highest - lowest) / 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = np.where(np.abs(span) < _EPSILON, 0.0, (close[:, k_period - 1:] - lowest) / span)
+        value[np.isnan(span)] = np.nan
+        fast_k[:, k_period - 1:] = value
+
+    k = _sma(fast_k, slow_k)
+    d = _sma(k, slow_d)
+    # TA-Lib starts both outputs where %D becomes available
+    k[:, :k_period + slow_k + slow_d - 3] = np.nan
+    return k, d
+
+
+def _to_matrix(codes: np.ndarray, values: np.ndarray, n_groups: int):
+    """Scatter grouped rows (already sorted by group, then time) into a NaN-padded matrix"""
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    cols = np.arange(len(codes)) - starts[codes]
+    matrix = np.full((n_groups, max(counts.max(initial=0), 1)), np.nan)
+    matrix[codes, cols] = values
+    return matrix, cols
+
+
+def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Indicator columns for every row of a multi-symbol candle frame
+
+    Rows are grouped by symbol and ordered by timestamp internally (one sort,
+    no per-symbol filtering); the result is aligned with df's index. Values
+    before each indicator's lookback are NaN, like the unset fields in C#.
+
+    Note: the C# side additionally rescales MACD/EMA to 0-100 over its candle
+    window for display; training uses the raw TA-Lib values.
+
+    Args:
+        df: Candles with symbol, timestamp, high, low and close columns
+
+    Returns:
+        DataFrame with INDICATOR_COLUMNS
+    """
+    if len(df) == 0:
+        return pd.DataFrame(columns=INDICATOR_COLUMNS, index=df.index, dtype=np.float64)
+
+    codes, uniques = pd.factorize(df['symbol'])
+    timestamps = df['timestamp'].to_numpy()
+    if np.all((np.diff(codes) > 0) | ((np.diff(codes) == 0) & (np.diff(timestamps) > 0))):
+        order = slice(None)  # store order: already grouped and sorted
+    else:
+        order = np.lexsort((timestamps, codes))
+    sorted_codes = codes[order]
+
+    high, cols = _to_matrix(sorted_codes, df['high'].to_numpy(np.float64)[order], len(uniques))
+    low, _ = _to_matrix(sorted_codes, df['low'].to_numpy(np.float64)[order], len(uniques))
+    close, _ = _to_matrix(sorted_codes, df['close'].to_numpy(np.float64)[order], len(uniques))
+
+    macd_line, macd_signal, macd_hist = macd(close)
+    stoch_k, stoch_d = stoch(high, low, close)
+    results = {
+        'rsi': rsi(close),
+        'macd': macd_line,
+        'macd_signal': macd_signal,
+        'macd_hist': macd_hist,
+        'ema50': ema(close, 50),
+        'stoch_k': stoch_k,
+        'stoch_d': stoch_d
+    }
+
+    out = np.empty((len(df), len(INDICATOR_COLUMNS)))
+    for j, name in enumerate(INDICATOR_COLUMNS):
+        out[order, j] = results[name][sorted_codes, cols]
+    return pd.DataFrame(out, columns=INDICATOR_COLUMNS, index=df.index)
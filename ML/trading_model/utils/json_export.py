@@ -0,0 +1,212 @@
+"""
+Streaming reader for C# JSON candle exports
+Parses the export incrementally and yields per-symbol columnar chunks, so
+exports of any size are imported without holding the document in memory
+"""
+
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+CANDLE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume',
+                  'rsi', 'macd', 'macd_signal', 'macd_hist', 'ema50', 'stoch_k', 'stoch_d']
+
+# C# property names take precedence over the Python names
+_CSHARP_KEYS = {'T': 'timestamp', 'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume',
+                'Rsi': 'rsi', 'Macd': 'macd', 'MacdSign': 'macd_signal', 'MacdHist': 'macd_hist',
+                'Ema': 'ema50', 'StochSlowK': 'stoch_k', 'StochSlowD': 'stoch_d'}
+_PYTHON_KEYS = {'t': 'timestamp', **{column: column for column in CANDLE_COLUMNS}}
+
+# Values for fields missing from a candle (ema50 falls back to close)
+_DEFAULTS = {'open': 0, 'high': 0, 'low': 0, 'close': 0, 'volume': 0, 'rsi': 50, 'macd': 0,
+             'macd_signal': 0, 'macd_hist': 0, 'stoch_k': 50, 'stoch_d': 50}
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def _layout(keys: Tuple[str, ...]) -> Tuple[List[int], List[int]]:
+    """(positions in the candle, target columns) for a candle with these keys"""
+    take, columns = [], []
+    for j, column in enumerate(CANDLE_COLUMNS):
+        for names in (_CSHARP_KEYS, _PYTHON_KEYS):
+            position = next((i for i, key in enumerate(keys) if names.get(key) == column), None)
+            if position is not None:
+                take.append(position)
+                columns.append(j)
+                break
+    return take, columns
+
+
+class _ChunkBuffer:
+    """Collects candle objects and hands them out as columnar chunks"""
+
+    def __init__(self, chunk_rows: int):
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        # Exports repeat the same keys in the same order, so the key -> column
+        # mapping is resolved once per distinct key sequence; rows are grouped by it
+        self._layouts: Dict[Tuple[str, ...], Tuple[List[int], List[int]]] = {}
+        self._groups: Dict[Tuple[str, ...], Tuple[List[int], List[list]]] = {}
+
+    @property
+    def full(self) -> bool:
+        return self.rows == self.chunk_rows
+
+    def add(self, candle: dict) -> None:
+        keys = tuple(candle)
+        group = self._groups.get(keys)
+        if group is None:
+            if keys not in self._layouts:
+                self._layouts[keys] = _layout(keys)
+            group = self._groups[keys] = ([], [])
+        take = self._layouts[keys][0]
+        values = list(candle.values())
+        group[0].append(self.rows)
+        group[1].append([values[i] for i in take])
+        self.rows += 1
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """Hand out the buffered rows as a DataFrame and start a new chunk"""
+        values = np.full((self.rows, len(CANDLE_COLUMNS)), np.nan)
+        for keys, (positions, rows) in self._groups.items():
+            columns = self._layouts[keys][1]
+            values[np.ix_(positions, columns)] = np.array(rows, dtype=np.float64)
+
+        df = pd.DataFrame(values, columns=CANDLE_COLUMNS)
+        df['timestamp'] = df['timestamp'].fillna(datetime.now().timestamp())
+        df = df.fillna(_DEFAULTS)
+        df['ema50'] = df['ema50'].fillna(df['close'])
+        df.insert(0, 'symbol', symbol)
+
+        self._groups = {}
+        self.rows = 0
+        return df
+
+
+class _StreamDecoder:
+    """
+    Incremental walker over the export using json.JSONDecoder.raw_decode
+
+    events() yields ('symbol', name), ('candle', dict) and ('end', None) per
+    symbol object. Only the structure around candles is walked by hand; every value (one
+    candle object, a symbol name) is decoded by the C scanner from a buffer
+    that always extends at least `lookahead` characters past it.
+    """
+
+    def __init__(self, f, block_size: int = 1 << 22, lookahead: int = 1 << 20):
+        self.f = f
+        self.block_size = block_size
+        self.lookahead = lookahead
+        self.decoder = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> None:
+        while not self.eof and len(self.buf) - self.pos < self.lookahead:
+            block = self.f.read(self.block_size)
+            self.eof = not block
+            self.buf = self.buf[self.pos:] + block
+            self.pos = 0
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at the end of the file)"""
+        while True:
+            if len(self.buf) - self.pos < self.lookahead:
+                self._fill()
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+
+    def next(self, expected: str) -> str:
+        char = self.peek()
+        if char not in expected:
+            raise ValueError(f"Expected one of {expected!r} at offset {self.pos}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, self.pos = self.decoder.raw_decode(self.buf, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.lookahead *= 2  # value larger than the lookahead
+                self._fill()
+
+    def events(self) -> Iterator[Tuple[str, object]]:
+        self.next('[')
+        if self.peek() == ']':
+            return
+        while True:
+            self.next('{')
+            if self.peek() != '}':
+                while True:
+                    key = self.value()
+                    self.next(':')
+                    if key == 'candles' and self.peek() == '[':
+                        self.next('[')
+                        if self.peek() != ']':
+                            while True:
+                                yield 'candle', self.value()
+                                if self.next(',]') == ']':
+                                    break
+                        else:
+                            self.next(']')
+                    else:
+                        value = self.value()
+                        if key == 'symbol':
+                            yield 'symbol', value
+                    if self.next(',}') == '}':
+                        break
+            else:
+                self.next('}')
+            yield 'end', None
+            if self.next(',]') == ']':
+                return
+
+
+def iter_export_chunks(json_path: str, chunk_rows: int = 50_000) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Stream a C# JSON export as (symbol, candle chunk) pairs
+
+    Chunks of one symbol are yielded consecutively, in file order, each with
+    at most chunk_rows rows and the columns of the candle store. Memory is
+    bounded by one chunk, except for candles that precede their object's
+    "symbol" key (the C# export writes the symbol first).
+
+    Args:
+        json_path: Path to the export (format: see collect_from_json_file)
+        chunk_rows: Rows per chunk
+
+    Yields:
+        (symbol, DataFrame with symbol + CANDLE_COLUMNS)
+    """
+    buffer = _ChunkBuffer(chunk_rows)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        symbol, pending = None, []
+        for event, value in _StreamDecoder(f).events():
+            if event == 'candle':
+                buffer.add(value)
+                if buffer.full:
+                    if symbol is None:
+                        pending.append(buffer.frame('UNKNOWN'))
+                    else:
+                        yield symbol, buffer.frame(symbol)
+            elif event == 'symbol':
+                symbol = value
+            else:
+                symbol = symbol if symbol is not None else 'UNKNOWN'
+                for chunk in pending:
+                    chunk['symbol'] = symbol
+                    yield symbol, chunk
+                if buffer.rows:
+                    yield symbol, buffer.frame(symbol)
+                symbol, pending = None, []
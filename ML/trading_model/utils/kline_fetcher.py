@@ -0,0 +1,318 @@
+"""
+Async Binance kline fetcher
+Fetches many symbols and time ranges concurrently over one pooled HTTP client,
+paced by Binance's request-weight headers
+"""
+
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import random
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+BINANCE_API = "https://api.binance.com"
+KLINES_PATH = "/api/v3/klines"
+KLINES_LIMIT = 1000  # max candles per request
+KLINES_WEIGHT = 2    # request weight of /api/v3/klines
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000,
+    '1w': 604_800_000
+}
+
+
+def interval_to_ms(interval: str) -> int:
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Unsupported interval {interval!r}, expected one of {list(INTERVAL_MS)}")
+    return INTERVAL_MS[interval]
+
+
+def klines_to_frame(symbol: str, klines: List[list]) -> pd.DataFrame:
+    """
+    Convert raw kline arrays to candle rows
+
+    Indicator columns get neutral placeholders; the collector overwrites them
+    with calculate_indicators once the symbol's history is complete.
+    """
+    columns = ['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume',
+               'rsi', 'macd', 'macd_signal', 'macd_hist', 'ema50', 'stoch_k', 'stoch_d']
+    if not klines:
+        return pd.DataFrame(columns=columns)
+
+    values = np.array([k[:6] for k in klines], dtype=np.float64)
+    close = values[:, 4]
+    return pd.DataFrame({
+        'symbol': symbol,
+        'timestamp': values[:, 0] / 1000,
+        'open': values[:, 1],
+        'high': values[:, 2],
+        'low': values[:, 3],
+        'close': close,
+        'volume': values[:, 5],
+        'rsi': 50.0,
+        'macd': 0.0,
+        'macd_signal': 0.0,
+        'macd_hist': 0.0,
+        'ema50': close,
+        'stoch_k': 50.0,
+        'stoch_d': 50.0
+    }, columns=columns)
+
+
+class WeightLimiter:
+    """
+    Token bucket over Binance request weight
+
+    Refills continuously up to a fraction of the per-minute limit. The bucket is
+    corrected from the used-weight header of every response (the server's count
+    also includes other clients on the same IP), and a 429/418 Retry-After
+    pauses all requests.
+    """
+
+    def __init__(self, weight_per_minute: int = 6000, headroom: float = 0.8):
+        """
+        Args:
+            weight_per_minute: Binance IP weight limit
+            headroom: Fraction of the limit this client may use
+        """
+        self.capacity = weight_per_minute * headroom
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, weight: int) -> None:
+        """Wait until `weight` can be spent (waiters are served in order)"""
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0:
+                    if self.tokens >= weight:
+                        self.tokens -= weight
+                        return
+                    wait = (weight - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def observe(self, used_weight: int) -> None:
+        """Sync with the server-reported weight used in the current minute"""
+        self._refill()
+        self.tokens = min(self.tokens, self.capacity - used_weight)
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class KlineFetcher:
+    """
+    Concurrent kline downloader sharing one connection pool and weight limiter
+
+    Usage:
+        async with KlineFetcher() as fetcher:
+            df = await fetcher.fetch_range('BTCUSDT', '30m', start_ms, end_ms)
+    """
+
+    def __init__(
+        self,
+        base_url: str = BINANCE_API,
+        max_connections: int = 16,
+        weight_per_minute: int = 6000,
+        max_retries: int = 5,
+        backoff_seconds: float = 0.5,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            base_url: API root (point at a local stub server for testing)
+            max_connections: Pooled connections, also the number of requests in flight
+            weight_per_minute: Request-weight budget, see WeightLimiter
+            max_retries: Retries per request on network errors, 429/418 and 5xx
+            backoff_seconds: Base of the exponential backoff (with jitter)
+            timeout: Per-request timeout in seconds
+            transport: Optional httpx transport (e.g. httpx.MockTransport)
+        """
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.transport = transport
+        self.limiter = WeightLimiter(weight_per_minute)
+        self.client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Counters
+        self.requests = 0
+        self.retries = 0
+
+    async def __aenter__(self) -> 'KlineFetcher':
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=self.timeout,
+            transport=self.transport
+        )
+        self._slots = asyncio.Semaphore(self.max_connections)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.client.aclose()
+        self.client = None
+
+    async def fetch_page(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[list]:
+        """One /klines request (at most KLINES_LIMIT candles opening in [start_ms, end_ms])"""
+        params = {'symbol': symbol, 'interval': interval, 'startTime': start_ms,
+                  'endTime': end_ms, 'limit': KLINES_LIMIT}
+
+        async with self._slots:
+            for attempt in range(self.max_retries + 1):
+                await self.limiter.acquire(KLINES_WEIGHT)
+                self.requests += 1
+                try:
+                    response = await self.client.get(KLINES_PATH, params=params)
+                except httpx.TransportError:
+                    if attempt == self.max_retries:
+                        raise
+                    await self._backoff(attempt)
+                    continue
+
+                used_weight = response.headers.get(USED_WEIGHT_HEADER)
+                if used_weight is not None:
+                    self.limiter.observe(int(used_weight))
+
+                if response.status_code in (418, 429):
+                    # Rate limited (418 = IP banned): honour Retry-After for everyone
+                    self.limiter.pause(float(response.headers.get('Retry-After', 60)))
+                elif response.status_code >= 500:
+                    pass
+                else:
+                    response.raise_for_status()
+                    return response.json()
+
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+                await self._backoff(attempt)
+
+    async def _backoff(self, attempt: int) -> None:
+        self.retries += 1
+        delay = self.backoff_seconds * (2 ** attempt)
+        await asyncio.sleep(delay * (0.5 + random.random()))
+
+    async def fetch_range(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> pd.DataFrame:
+        """
+        All candles of a symbol opening in [start_ms, end_ms), pages fetched concurrently
+
+        Returns:
+            DataFrame in collector format, sorted by timestamp
+        """
+        return await self.fetch_pages(symbol, interval, page_ranges(interval, [(start_ms, end_ms)]))
+
+    async def fetch_pages(self, symbol: str, interval: str, pages: List[Tuple[int, int]]) -> pd.DataFrame:
+        """Fetch (start_ms, end_ms inclusive) pages concurrently into one sorted frame"""
+        results = await asyncio.gather(*(
+            self.fetch_page(symbol, interval, page_start, page_end) for page_start, page_end in pages
+        ))
+        klines = [kline for page in results for kline in page]
+        df = klines_to_frame(symbol, klines)
+        return df.drop_duplicates('timestamp').sort_values('timestamp').reset_index(drop=True)
+
+
+def page_ranges(interval: str, ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Split [start_ms, end_ms) ranges into request pages of at most KLINES_LIMIT candles"""
+    step = KLINES_LIMIT * interval_to_ms(interval)
+    return [(page_start, min(page_start + step, end_ms) - 1)
+            for start_ms, end_ms in ranges
+            for page_start in range(start_ms, end_ms, step)]
+
+
+async def _call(callback: Callable, *args):
+    """Await an async callback, or run a sync one in a worker thread"""
+    if asyncio.iscoroutinefunction(callback):
+        return await callback(*args)
+    return await asyncio.to_thread(callback, *args)
+
+
+async def fetch_klines(
+    symbols: List[str],
+    interval: str,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+    on_symbol: Optional[Callable[[str, pd.DataFrame], Union[None, pd.DataFrame, Awaitable]]] = None,
+    symbol_concurrency: int = 8,
+    ranges: Optional[Dict[str, List[Tuple[int, int]]]] = None,
+    on_chunk: Optional[Callable[[str, pd.DataFrame], Union[None, pd.DataFrame, Awaitable]]] = None,
+    chunk_pages: int = 50,
+    **fetcher_kwargs
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch a time range for many symbols concurrently
+
+    Each symbol is handed to on_symbol as soon as all of its pages arrived, so
+    results can be written to storage while other symbols are still downloading.
+    With on_chunk, long ranges are additionally handed over every chunk_pages
+    pages and only what on_chunk returns is kept in memory. Synchronous
+    callbacks run in a worker thread; a non-None return value of on_symbol
+    replaces the symbol's result.
+
+    Args:
+        symbols: Trading pairs
+        interval: Candle interval
+        start_ms: Inclusive start (open time, milliseconds)
+        end_ms: Exclusive end (open time, milliseconds)
+        on_symbol: Callback(symbol, df) per completed symbol
+        symbol_concurrency: Symbols downloaded at the same time (bounds memory)
+        ranges: Per-symbol [(start_ms, end_ms)] to fetch instead of start_ms/end_ms
+        on_chunk: Callback(symbol, df) per chunk of pages
+        chunk_pages: Pages per on_chunk call
+        **fetcher_kwargs: Passed to KlineFetcher
+
+    Returns:
+        Dict symbol -> DataFrame (symbols that failed after retries are missing)
+    """
+    results = {}
+    symbol_slots = asyncio.Semaphore(symbol_concurrency)
+
+    async with KlineFetcher(**fetcher_kwargs) as fetcher:
+        async def run(symbol: str) -> None:
+            symbol_ranges = ranges.get(symbol, []) if ranges is not None else [(start_ms, end_ms)]
+            pages = page_ranges(interval, symbol_ranges)
+            chunk_size = chunk_pages if on_chunk is not None else max(len(pages), 1)
+
+            async with symbol_slots:
+                frames = []
+                try:
+                    for i in range(0, max(len(pages), 1), chunk_size):
+                        df = await fetcher.fetch_pages(symbol, interval, pages[i:i + chunk_size])
+                        if on_chunk is not None:
+                            df = await _call(on_chunk, symbol, df)
+                        if df is not None:
+                            frames.append(df)
+                except (httpx.HTTPError, ValueError) as e:
+                    print(f"  Error fetching {symbol}: {e}")
+                    return
+
+                df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else (
+                    frames[0] if frames else klines_to_frame(symbol, []))
+                if on_symbol is not None:
+                    processed = await _call(on_symbol, symbol, df)
+                    if processed is not None:
+                        df = processed
+                results[symbol] = df
+
+        await asyncio.gather(*(run(symbol) for symbol in symbols))
+
+    return results
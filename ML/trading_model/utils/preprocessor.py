@@ -9,6 +9,8 @@ from sklearn.preprocessing import StandardScaler
 from typing import List, Tuple, Dict
 import joblib
 
+from .feature_kernel import compute_features, rolling_slope
+
 
 class TradingDataPreprocessor:
     """
@@ -62,10 +64,7 @@ class TradingDataPreprocessor:
 
         # MACD enhancements
         df['macd_acceleration'] = df['macd_hist'].diff()
-        df['macd_hist_slope'] = df['macd_hist'].rolling(3).apply(
-            lambda x: np.polyfit(range(len(x)), x, 1)[0] if len(x) == 3 else 0,
-            raw=False
-        )
+        df['macd_hist_slope'] = rolling_slope(df['macd_hist'].values, 3)
 
         # RSI momentum
         df['rsi_momentum'] = df['rsi'].diff()
@@ -111,6 +110,18 @@ class TradingDataPreprocessor:
 
         return df
 
+    def create_feature_matrix(self, raw: np.ndarray) -> np.ndarray:
+        """
+        NumPy equivalent of create_features for the inference path
+
+        Args:
+            raw: Array of shape (T, 12) with columns in RAW_COLUMNS order
+
+        Returns:
+            Array of shape (T, n_features) with the feature_columns (or get_feature_columns()) matrix
+        """
+        return compute_features(raw, self.feature_columns or self.get_feature_columns())
+
     def create_labels(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Create labels based on future returns
@@ -172,17 +183,20 @@ class TradingDataPreprocessor:
 
         return base_features + indicator_features + engineered_features
 
-    def create_sequences(self, df: pd.DataFrame, feature_columns: List[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    def create_window_index(self, df: pd.DataFrame, feature_columns: List[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
-        Create sliding window sequences for LSTM/Transformer
-        Memory-optimized version using preallocated arrays
+        Index sliding windows without materializing them
+
+        Each row is stored once; window k covers rows [window_ends[k] - lookback, window_ends[k])
+        and is labelled with row window_ends[k].
 
         Args:
             df: DataFrame with features and labels
             feature_columns: List of columns to use as features (None = auto-detect)
 
         Returns:
-            X: shape (samples, lookback, features) - input sequences
+            features: shape (rows, features) - per-row feature matrix
+            window_ends: shape (samples,) - exclusive end row of each window
             y_class: shape (samples,) - classification labels
             y_reg: shape (samples,) - regression targets (forward returns)
         """
@@ -196,29 +210,36 @@ class TradingDataPreprocessor:
         if missing_cols:
             raise ValueError(f"Missing columns in DataFrame: {missing_cols}")
 
-        # Preallocate arrays for memory efficiency
         n_samples = len(df) - self.lookback - self.forward_bars
-        n_features = len(feature_columns)
 
         if n_samples <= 0:
             raise ValueError(f"Not enough data. Need at least {self.lookback + self.forward_bars} rows")
 
         # Convert DataFrame to numpy once (much faster)
-        feature_data = df[feature_columns].values.astype(np.float32)
-        label_data = df['label_encoded'].values.astype(np.int64)
-        return_data = df['forward_return'].values.astype(np.float32)
-
-        # Preallocate output arrays
-        X = np.zeros((n_samples, self.lookback, n_features), dtype=np.float32)
-        y_class = np.zeros(n_samples, dtype=np.int64)
-        y_reg = np.zeros(n_samples, dtype=np.float32)
-
-        # Fill arrays efficiently using numpy slicing
-        for idx in range(n_samples):
-            i = idx + self.lookback
-            X[idx] = feature_data[i - self.lookback:i]
-            y_class[idx] = label_data[i]
-            y_reg[idx] = return_data[i]
+        features = np.ascontiguousarray(df[feature_columns].values, dtype=np.float32)
+        window_ends = np.arange(self.lookback, self.lookback + n_samples, dtype=np.int64)
+        y_class = df['label_encoded'].values[window_ends].astype(np.int64)
+        y_reg = df['forward_return'].values[window_ends].astype(np.float32)
+
+        return features, window_ends, y_class, y_reg
+
+    def create_sequences(self, df: pd.DataFrame, feature_columns: List[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Create sliding window sequences for LSTM/Transformer
+        Materializes every window; prefer create_window_index for large datasets
+
+        Args:
+            df: DataFrame with features and labels
+            feature_columns: List of columns to use as features (None = auto-detect)
+
+        Returns:
+            X: shape (samples, lookback, features) - input sequences
+            y_class: shape (samples,) - classification labels
+            y_reg: shape (samples,) - regression targets (forward returns)
+        """
+        features, window_ends, y_class, y_reg = self.create_window_index(df, feature_columns)
+
+        X = features[window_ends[:, None] + np.arange(-self.lookback, 0)]
 
         return X, y_class, y_reg
 
@@ -235,6 +256,62 @@ class TradingDataPreprocessor:
 
         self.scaler.fit(X_reshaped)
 
+    @staticmethod
+    def window_row_weights(window_ends: np.ndarray, n_rows: int, lookback: int) -> np.ndarray:
+        """
+        Number of windows each row appears in
+
+        Weighting rows by this count gives exactly the statistics of fitting on
+        all windows stacked (samples * lookback rows), without building them.
+
+        Args:
+            window_ends: Exclusive end row of each window
+            n_rows: Number of rows in the feature matrix
+            lookback: Window length
+
+        Returns:
+            Array of shape (n_rows,) with the count per row
+        """
+        counts = np.zeros(n_rows + 1, dtype=np.int64)
+        np.add.at(counts, window_ends - lookback, 1)
+        np.add.at(counts, window_ends, -1)
+        return np.cumsum(counts[:-1])
+
+    def fit_scaler_rows(self, features: np.ndarray, window_ends: np.ndarray = None,
+                        chunk_size: int = 1_000_000) -> None:
+        """
+        Fit the scaler once per unique row instead of once per window copy
+
+        Args:
+            features: Per-row feature matrix of shape (rows, features)
+            window_ends: Window end rows from create_window_index; rows are weighted
+                by how many windows contain them (None = every row counts once)
+            chunk_size: Rows per partial_fit call
+        """
+        weights = None
+        if window_ends is not None:
+            weights = self.window_row_weights(window_ends, len(features), self.lookback)
+
+        self.scaler = StandardScaler()
+        for start in range(0, len(features), chunk_size):
+            chunk_weights = None if weights is None else weights[start:start + chunk_size]
+            self.partial_fit_scaler(features[start:start + chunk_size], chunk_weights)
+
+    def partial_fit_scaler(self, rows: np.ndarray, sample_weight: np.ndarray = None) -> None:
+        """
+        Update the scaler statistics with a chunk of rows (streaming fit)
+
+        Args:
+            rows: Feature rows of shape (n, features)
+            sample_weight: Optional weight per row (e.g. window_row_weights)
+        """
+        if sample_weight is not None:
+            keep = sample_weight > 0
+            rows, sample_weight = rows[keep], sample_weight[keep]
+        if len(rows) == 0:
+            return
+        self.scaler.partial_fit(rows, sample_weight=sample_weight)
+
     def transform(self, X: np.ndarray) -> np.ndarray:
         """
         Scale the features using fitted scaler
@@ -252,6 +329,22 @@ class TradingDataPreprocessor:
 
         return X_scaled.reshape(n_samples, n_timesteps, n_features)
 
+    def transform_rows(self, features: np.ndarray, chunk_size: int = 1_000_000) -> np.ndarray:
+        """
+        Scale a per-row feature matrix in place, chunk by chunk
+
+        Args:
+            features: float32 array of shape (rows, features)
+            chunk_size: Rows scaled per call
+
+        Returns:
+            The same array, scaled
+        """
+        for start in range(0, len(features), chunk_size):
+            chunk = features[start:start + chunk_size]
+            chunk[:] = self.scaler.transform(chunk)
+        return features
+
     def save(self, path: str) -> None:
         """Save preprocessor state"""
         joblib.dump({
@@ -0,0 +1,74 @@
+"""
+Resampling of stored candles to higher intervals
+Aggregates e.g. 1m OHLCV into 15m / 30m / 1h candles with grouped NumPy
+reductions, so one fine-grained backfill feeds every timeframe
+"""
+
+import numpy as np
+import pandas as pd
+
+from .kline_fetcher import interval_to_ms
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Binance opens weekly candles on Monday 00:00 UTC (epoch day 0 is a Thursday);
+# all other intervals are aligned to the epoch
+INTERVAL_OFFSET_MS = {'1w': 4 * 86_400_000}
+
+
+def resample_candles(
+    df: pd.DataFrame,
+    source_interval: str,
+    target_interval: str,
+    complete_only: bool = True
+) -> pd.DataFrame:
+    """
+    Aggregate candles of several symbols into a higher interval
+
+    open = first, high = max, low = min, close = last, volume = sum over the
+    source candles opening in each target candle.
+
+    Args:
+        df: Candles with symbol, timestamp (seconds) and OHLCV columns, sorted
+            by symbol and timestamp (store order)
+        source_interval: Interval of df, e.g. '1m'
+        target_interval: Interval to build, a multiple of source_interval
+        complete_only: Drop target candles with missing source candles (gaps
+            and the still-open last candle)
+
+    Returns:
+        DataFrame with symbol, timestamp and OHLCV columns in store order
+    """
+    source_ms, target_ms = interval_to_ms(source_interval), interval_to_ms(target_interval)
+    if target_ms <= source_ms or target_ms % source_ms:
+        raise ValueError(f"Cannot resample {source_interval} to {target_interval}: "
+                         f"target must be a multiple of the source interval")
+    if len(df) == 0:
+        return pd.DataFrame(columns=['symbol', 'timestamp'] + OHLCV_COLUMNS)
+
+    codes, uniques = pd.factorize(df['symbol'])
+    offset = INTERVAL_OFFSET_MS.get(target_interval, 0)
+    open_ms = np.round(df['timestamp'].to_numpy(np.float64) * 1000).astype(np.int64)
+    bucket = (open_ms - offset) // target_ms
+
+    if np.any(np.diff(codes) < 0) or np.any((np.diff(codes) == 0) & (np.diff(open_ms) <= 0)):
+        raise ValueError("Candles must be sorted by symbol and timestamp without duplicates")
+
+    # One group per (symbol, target candle); rows of a group are contiguous
+    starts = np.flatnonzero(np.r_[True, (np.diff(codes) != 0) | (np.diff(bucket) != 0)])
+    ends = np.r_[starts[1:], len(df)]
+
+    values = {column: df[column].to_numpy(np.float64) for column in OHLCV_COLUMNS}
+    result = pd.DataFrame({
+        'symbol': uniques[codes[starts]],
+        'timestamp': (bucket[starts] * target_ms + offset) / 1000,
+        'open': values['open'][starts],
+        'high': np.maximum.reduceat(values['high'], starts),
+        'low': np.minimum.reduceat(values['low'], starts),
+        'close': values['close'][ends - 1],
+        'volume': np.add.reduceat(values['volume'], starts)
+    })
+
+    if complete_only:
+        result = result[(ends - starts) == target_ms // source_ms].reset_index(drop=True)
+    return result
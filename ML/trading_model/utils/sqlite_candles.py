@@ -0,0 +1,151 @@
+"""
+Candle reader for the C# application's SQLite database (MarginCoinData.db)
+Reads the CandleHistory table written by CandleDataService straight into
+NumPy arrays, so training data can be synced without an export step
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+CANDLE_TABLE = 'CandleHistory'
+
+# CandleHistory column -> collector column
+SQLITE_COLUMNS = {
+    'OpenTime': 'timestamp',
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume',
+    'RSI': 'rsi',
+    'MACD': 'macd',
+    'MACDSignal': 'macd_signal',
+    'MACDHist': 'macd_hist',
+    'EMA': 'ema50',
+    'StochSlowK': 'stoch_k',
+    'StochSlowD': 'stoch_d'
+}
+
+
+def is_sqlite_path(path: str) -> bool:
+    return str(path).lower().endswith(('.db', '.sqlite', '.sqlite3'))
+
+
+class SqliteCandleReader:
+    """
+    Read-only access to CandleHistory
+
+    The database is opened read-only, so the running application keeps
+    writing while training data is pulled. Every query is a range seek on
+    the (Symbol, Interval, IsClosed, OpenTime) index and rows are fetched in
+    batches into float64 arrays (NULL indicators become NaN).
+
+    Usage:
+        with SqliteCandleReader('MarginCoinData.db') as reader:
+            arrays = reader.read_arrays('BTCUSDC', '30m', after_ms=last_ms)
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 50_000):
+        """
+        Args:
+            db_path: Path to MarginCoinData.db
+            batch_size: Rows fetched from SQLite per round trip
+        """
+        if not Path(db_path).exists():
+            raise FileNotFoundError(f"Database not found: {db_path}")
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(f'file:{Path(db_path).resolve()}?mode=ro', uri=True)
+
+    def __enter__(self) -> 'SqliteCandleReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def intervals(self) -> List[str]:
+        rows = self.connection.execute(f'SELECT DISTINCT Interval FROM {CANDLE_TABLE} ORDER BY Interval')
+        return [interval for interval, in rows]
+
+    def symbols(self, interval: str) -> List[str]:
+        rows = self.connection.execute(
+            f'SELECT DISTINCT Symbol FROM {CANDLE_TABLE} WHERE Interval = ? ORDER BY Symbol', (interval,))
+        return [symbol for symbol, in rows]
+
+    def read_arrays(
+        self,
+        symbol: str,
+        interval: str,
+        after_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Closed candles of one symbol, sorted by open time
+
+        Args:
+            symbol: Trading pair
+            interval: Candle interval
+            after_ms: Only candles opening after this time (incremental sync)
+            end_ms: Only candles opening before this time
+
+        Returns:
+            Dict collector column -> float64 array (timestamp in seconds)
+        """
+        query = (f'SELECT {", ".join(SQLITE_COLUMNS)} FROM {CANDLE_TABLE} '
+                 'WHERE Symbol = ? AND Interval = ? AND IsClosed = 1 AND OpenTime > ? AND OpenTime < ? '
+                 'ORDER BY OpenTime')
+        params = (symbol, interval,
+                  -1 if after_ms is None else int(after_ms),
+                  2 ** 63 - 1 if end_ms is None else int(end_ms))
+
+        batches = []
+        cursor = self.connection.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            batches.append(np.array(rows, dtype=np.float64))
+
+        values = np.concatenate(batches) if batches else np.empty((0, len(SQLITE_COLUMNS)))
+        arrays = {column: values[:, j] for j, column in enumerate(SQLITE_COLUMNS.values())}
+        arrays['timestamp'] = arrays['timestamp'] / 1000
+        return arrays
+
+    def read(
+        self,
+        interval: str,
+        symbols: Optional[List[str]] = None,
+        after: Optional[Dict[str, float]] = None
+    ) -> pd.DataFrame:
+        """
+        Closed candles of several symbols in collector format
+
+        Args:
+            interval: Candle interval
+            symbols: Symbols to read (None = all in the database for this interval)
+            after: Per-symbol timestamp in seconds; only newer candles are read
+
+        Returns:
+            DataFrame sorted by symbol and timestamp
+        """
+        after = after or {}
+        frames = []
+        for symbol in (symbols if symbols is not None else self.symbols(interval)):
+            after_s = after.get(symbol)
+            arrays = self.read_arrays(symbol, interval,
+                                      after_ms=None if after_s is None else round(after_s * 1000))
+            if len(arrays['timestamp']) > 0:
+                frame = pd.DataFrame(arrays, columns=list(SQLITE_COLUMNS.values()))
+                frame.insert(0, 'symbol', symbol)
+                frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=['symbol'] + list(SQLITE_COLUMNS.values()))
+        return pd.concat(frames, ignore_index=True)
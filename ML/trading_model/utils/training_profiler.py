@@ -0,0 +1,135 @@
+"""
+Per-stage timing and profiler export for the training loop
+Splits every step into data / forward / backward / optimizer time, tracks
+throughput and peak memory per epoch, and optionally records a
+torch.profiler trace of the first steps
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+import resource
+import sys
+import time
+
+import torch
+
+
+def reset_peak_memory(device: str) -> None:
+    """Start a new CUDA peak memory window (process peak RSS cannot be reset on CPU)"""
+    if str(device).startswith('cuda'):
+        torch.cuda.reset_peak_memory_stats()
+
+
+def peak_memory_mb(device: str) -> float:
+    """Peak allocated CUDA memory since the last reset, or the process's peak RSS on CPU"""
+    if str(device).startswith('cuda'):
+        return torch.cuda.max_memory_allocated() / 2 ** 20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10  # bytes on macOS, KiB on Linux
+
+
+class StageTimer:
+    """
+    Wall-clock time per training stage over one epoch
+
+    CUDA kernels run asynchronously, so on a GPU the device is synchronized at
+    each stage boundary; otherwise a stage's work would be billed to whichever
+    later stage waits for it. Stages are also labelled with record_function,
+    so they show up by name in profiler traces.
+
+    Usage:
+        timer = StageTimer('cuda')
+        for X, y_class, y_reg in timer.batches(loader, 'cuda'):
+            with timer.stage('forward'):
+                logits = model(X)
+            timer.add_samples(len(X))
+        stats = timer.summary()
+    """
+
+    def __init__(self, device: str):
+        self.synchronize = str(device).startswith('cuda')
+        self.seconds: Dict[str, float] = {}
+        self.samples = 0
+        self.steps = 0
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.synchronize:
+            torch.cuda.synchronize()
+        start = time.perf_counter()
+        with torch.profiler.record_function(name):
+            yield
+        if self.synchronize:
+            torch.cuda.synchronize()
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+    def batches(self, loader, device: str):
+        """Iterate loader, timing the wait for each batch and its copy to device as 'data'"""
+        batches = iter(loader)
+        while True:
+            with self.stage('data'):
+                batch = next(batches, None)
+                if batch is not None:
+                    batch = tuple(t.to(device, non_blocking=True) for t in batch)
+            if batch is None:
+                return
+            yield batch
+
+    def add_samples(self, count: int) -> None:
+        self.samples += count
+        self.steps += 1
+
+    def summary(self) -> Dict:
+        """Seconds per stage (plus 'other' for untimed work), share of the total and samples/sec"""
+        total = time.perf_counter() - self.started
+        stages = dict(self.seconds)
+        stages['other'] = max(total - sum(self.seconds.values()), 0.0)
+        return {
+            'seconds': round(total, 4),
+            'steps': self.steps,
+            'samples': self.samples,
+            'samples_per_sec': round(self.samples / total, 1) if total > 0 else 0.0,
+            'stages': {name: round(seconds, 4) for name, seconds in stages.items()},
+            'stage_share': {name: round(seconds / total, 4) if total > 0 else 0.0
+                            for name, seconds in stages.items()}
+        }
+
+
+def create_profiler(trace_dir: Optional[str], steps: int, device: str, warmup: int = 1):
+    """
+    torch.profiler over the first training steps, exporting a Chrome trace
+
+    The trace (open in chrome://tracing or https://ui.perfetto.dev) covers
+    `steps` steps after `warmup` skipped ones; call .step() after each step.
+
+    Args:
+        trace_dir: Directory for trace_<steps>.json (None / steps <= 0 disables profiling)
+        steps: Steps to record
+        device: Training device; CUDA activity is recorded on GPUs
+        warmup: Steps run under the profiler but not recorded
+
+    Returns:
+        torch.profiler.profile to enter around the steps, or None when disabled
+    """
+    if not trace_dir or steps <= 0:
+        return None
+
+    activities = [torch.profiler.ProfilerActivity.CPU]
+    if str(device).startswith('cuda'):
+        activities.append(torch.profiler.ProfilerActivity.CUDA)
+    Path(trace_dir).mkdir(parents=True, exist_ok=True)
+
+    def export(profiler):
+        path = Path(trace_dir) / f'trace_{profiler.step_num}.json'
+        profiler.export_chrome_trace(str(path))
+        print(f"  Profiler trace written to {path}")
+
+    return torch.profiler.profile(
+        activities=activities,
+        schedule=torch.profiler.schedule(wait=0, warmup=warmup, active=steps, repeat=1),
+        on_trace_ready=export,
+        record_shapes=True,
+        profile_memory=True
+    )
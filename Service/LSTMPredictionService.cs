@@ -128,29 +128,8 @@ namespace MarginCoin.Service
                     return CreateFallbackPrediction(symbol);
                 }
 
-                // Take last 50 candles for prediction
-                var recentCandles = candles.TakeLast(50).ToList();
-
-                // Prepare request
-                var request = new PredictionRequest
-                {
-                    Symbol = symbol,
-                    Candles = recentCandles.Select(c => new CandleDto
-                    {
-                        Open = c.o,
-                        High = c.h,
-                        Low = c.l,
-                        Close = c.c,
-                        Volume = c.v,
-                        Rsi = c.Rsi,
-                        Macd = c.Macd,
-                        MacdSign = c.MacdSign,
-                        MacdHist = c.MacdHist,
-                        Ema = c.Ema,
-                        StochSlowK = c.StochSlowK,
-                        StochSlowD = c.StochSlowD
-                    }).ToList()
-                };
+                // Prepare request from the last 50 candles
+                var request = CreatePredictionRequest(symbol, candles);
 
                 // Make API call
                 var response = await _httpClient.PostAsJsonAsync($"{_apiBaseUrl}/predict", request);
@@ -175,25 +154,7 @@ namespace MarginCoin.Service
                     return CreateFallbackPrediction(symbol);
                 }
 
-                // Convert to MLPrediction format
-                var parsedDirection = MyEnum.PredictionDirection.Sideway;
-                PredictionDirectionExtensions.TryParse(result.Prediction, out parsedDirection);
-
-                var prediction = new MLPrediction
-                {
-                    Symbol = symbol,
-                    PredictedLabel = parsedDirection.ToLabel(),
-                    Score = new[]
-                    {
-                        (float)result.Probabilities.Down,
-                        (float)result.Probabilities.Sideways,
-                        (float)result.Probabilities.Up
-                    },
-                    Confidence = result.Confidence,
-                    ExpectedReturn = result.ExpectedReturn,
-                    TrendScore = result.TrendScore,
-                    Timestamp = DateTime.Now
-                };
+                var prediction = ToMLPrediction(symbol, result);
 
                 // Update cache
                 _predictionCache[symbol] = (prediction, DateTime.Now);
@@ -231,12 +192,173 @@ namespace MarginCoin.Service
         }
 
         /// <summary>
-        /// Update predictions for multiple symbols in parallel
+        /// Update predictions for multiple symbols with a single /predict/batch call
+        /// (the API runs one forward pass for all symbols). Like PredictAsync, fresh
+        /// cached predictions are not requested again, and symbols that are skipped
+        /// or fail get a fallback prediction.
         /// </summary>
         public async Task UpdatePredictionsAsync(List<(string symbol, List<Candle> candles)> symbolData)
         {
-            var tasks = symbolData.Select(data => PredictAsync(data.symbol, data.candles));
-            await Task.WhenAll(tasks);
+            if (!_enableMlPredictions)
+            {
+                _logger.LogDebug("ML batch prediction skipped: EnableMLPredictions=false");
+                ApplyFallbackPredictions(symbolData.Select(data => data.symbol));
+                return;
+            }
+
+            var requests = new List<PredictionRequest>();
+            var skipped = new List<string>();
+            var seen = new HashSet<string>();
+            foreach (var (symbol, candles) in symbolData)
+            {
+                // The API accepts each symbol once per batch
+                if (!seen.Add(symbol))
+                {
+                    continue;
+                }
+
+                if (_predictionCache.TryGetValue(symbol, out var cached) && DateTime.Now - cached.timestamp < _cacheExpiry)
+                {
+                    _logger.LogDebug($"Using cached prediction for {symbol}");
+                    continue;
+                }
+
+                if (candles == null || candles.Count < 50)
+                {
+                    _logger.LogWarning($"Insufficient candles for {symbol}: {candles?.Count ?? 0} (need 50+)");
+                    skipped.Add(symbol);
+                    continue;
+                }
+
+                requests.Add(CreatePredictionRequest(symbol, candles));
+            }
+
+            // Requested symbols without a prediction in the response get a fallback
+            var unresolved = new HashSet<string>(requests.Select(r => r.Symbol));
+            try
+            {
+                if (requests.Count == 0)
+                {
+                    return;
+                }
+
+                var response = await _httpClient.PostAsJsonAsync(
+                    $"{_apiBaseUrl}/predict/batch",
+                    new BatchPredictionRequest { Requests = requests });
+
+                if (!response.IsSuccessStatusCode)
+                {
+                    var error = await response.Content.ReadAsStringAsync();
+                    _logger.LogWarning("ML API batch error: {Status} - {Error}", response.StatusCode, error);
+                    return;
+                }
+
+                var result = await response.Content.ReadFromJsonAsync<BatchPredictionResponse>();
+                if (result?.Predictions == null)
+                {
+                    _logger.LogError("Failed to deserialize batch prediction response");
+                    return;
+                }
+
+                foreach (var item in result.Predictions)
+                {
+                    var prediction = ToMLPrediction(item.Symbol, item);
+                    _predictionCache[item.Symbol] = (prediction, DateTime.Now);
+                    UpdatePredictionList(prediction);
+                    unresolved.Remove(item.Symbol);
+                }
+
+                if (result.Errors != null)
+                {
+                    foreach (var error in result.Errors)
+                    {
+                        _logger.LogWarning("ML API skipped {Symbol}: {Error}", error.Key, error.Value);
+                    }
+                }
+
+                _logger.LogInformation($"Batch prediction updated {result.Predictions.Count}/{requests.Count} symbols");
+            }
+            catch (TaskCanceledException)
+            {
+                _logger.LogWarning("ML API timeout for batch prediction ({Count} symbols)", requests.Count);
+            }
+            catch (Exception ex)
+            {
+                if (_mlOptional)
+                {
+                    _logger.LogWarning(ex, "ML API unavailable for batch prediction. ML_OPTIONAL=true so returning fallback.");
+                    return;
+                }
+                _logger.LogError(ex, "Error getting batch predictions");
+            }
+            finally
+            {
+                ApplyFallbackPredictions(skipped.Concat(unresolved));
+            }
+        }
+
+        /// <summary>
+        /// Replace the current prediction of symbols without a usable ML result with a neutral fallback
+        /// </summary>
+        private void ApplyFallbackPredictions(IEnumerable<string> symbols)
+        {
+            foreach (var symbol in symbols)
+            {
+                UpdatePredictionList(CreateFallbackPrediction(symbol));
+            }
+        }
+
+        /// <summary>
+        /// Build the API request from the last 50 candles of a symbol
+        /// </summary>
+        private static PredictionRequest CreatePredictionRequest(string symbol, List<Candle> candles)
+        {
+            var recentCandles = candles.TakeLast(50).ToList();
+
+            return new PredictionRequest
+            {
+                Symbol = symbol,
+                Candles = recentCandles.Select(c => new CandleDto
+                {
+                    Open = c.o,
+                    High = c.h,
+                    Low = c.l,
+                    Close = c.c,
+                    Volume = c.v,
+                    Rsi = c.Rsi,
+                    Macd = c.Macd,
+                    MacdSign = c.MacdSign,
+                    MacdHist = c.MacdHist,
+                    Ema = c.Ema,
+                    StochSlowK = c.StochSlowK,
+                    StochSlowD = c.StochSlowD
+                }).ToList()
+            };
+        }
+
+        /// <summary>
+        /// Convert an API prediction response to MLPrediction format
+        /// </summary>
+        private static MLPrediction ToMLPrediction(string symbol, PredictionResponse result)
+        {
+            var parsedDirection = MyEnum.PredictionDirection.Sideway;
+            PredictionDirectionExtensions.TryParse(result.Prediction, out parsedDirection);
+
+            return new MLPrediction
+            {
+                Symbol = symbol,
+                PredictedLabel = parsedDirection.ToLabel(),
+                Score = new[]
+                {
+                    (float)result.Probabilities.Down,
+                    (float)result.Probabilities.Sideways,
+                    (float)result.Probabilities.Up
+                },
+                Confidence = result.Confidence,
+                ExpectedReturn = result.ExpectedReturn,
+                TrendScore = result.TrendScore,
+                Timestamp = DateTime.Now
+            };
         }
 
         /// <summary>
@@ -332,6 +454,21 @@ namespace MarginCoin.Service
         public List<CandleDto> Candles { get; set; }
     }
 
+    public class BatchPredictionRequest
+    {
+        [JsonPropertyName("requests")]
+        public List<PredictionRequest> Requests { get; set; }
+    }
+
+    public class BatchPredictionResponse
+    {
+        [JsonPropertyName("predictions")]
+        public List<PredictionResponse> Predictions { get; set; }
+
+        [JsonPropertyName("errors")]
+        public Dictionary<string, string> Errors { get; set; }
+    }
+
     public class CandleDto
     {
         [JsonPropertyName("open")]